@@ -0,0 +1,104 @@
+
+"""
+로그인 부하 벤치마크 (user_app/login.py)
+
+동시에 로그인 요청을 보내면서 로그인 응답 시간(p50/p95/p99)과
+같은 시간 동안 가벼운 GET 요청의 응답 시간을 함께 측정합니다.
+(해시 계산이 이벤트 루프/워커를 막으면 GET 응답 시간이 로그인만큼 늘어남)
+
+사용법 (서버 실행 후, 예: daphne config.asgi:application):
+    python bench_login.py --username tester --password pass1234 -c 32 -n 400
+"""
+import argparse
+import json
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+
+def percentile(values, p):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    index = min(len(values) - 1, max(0, round(p / 100 * len(values)) - 1))
+    return values[index]
+
+
+def timed_request(request):
+    """
+    return: (걸린 시간 ms, HTTP 상태 코드)
+    """
+    started = time.perf_counter()
+    try:
+        with urllib.request.urlopen(request, timeout=60) as response:
+            response.read()
+            code = response.status
+    except urllib.error.HTTPError as e:
+        code = e.code
+    except (urllib.error.URLError, OSError):
+        code = 0
+    return (time.perf_counter() - started) * 1000, code
+
+
+def login_request(url, username, password):
+    body = json.dumps({'username': username, 'password': password}).encode()
+    return urllib.request.Request(url, data=body, headers={'Content-Type': 'application/json'}, method='POST')
+
+
+def report(name, results):
+    times = [ms for ms, _ in results]
+    codes = {}
+    for _, code in results:
+        codes[code] = codes.get(code, 0) + 1
+    print(
+        f"{name:<6} n={len(results):<5} "
+        f"p50={percentile(times, 50):8.1f}ms p95={percentile(times, 95):8.1f}ms "
+        f"p99={percentile(times, 99):8.1f}ms max={max(times, default=0):8.1f}ms codes={codes}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--base-url', default='http://127.0.0.1:8000')
+    parser.add_argument('--login-path', default='/api/v1/users/login/')
+    parser.add_argument('--probe-path', default='/api/v1/boards/',
+                        help='로그인 중 응답 시간을 함께 측정할 가벼운 GET')
+    parser.add_argument('--username', required=True)
+    parser.add_argument('--password', required=True)
+    parser.add_argument('-c', '--concurrency', type=int, default=32)
+    parser.add_argument('-n', '--requests', type=int, default=400)
+    args = parser.parse_args()
+
+    login_url = args.base_url.rstrip('/') + args.login_path
+    probe_url = args.base_url.rstrip('/') + args.probe_path
+
+    done = threading.Event()
+    probes = []
+
+    def probe():
+        while not done.is_set():
+            probes.append(timed_request(urllib.request.Request(probe_url)))
+            time.sleep(0.02)
+
+    probe_thread = threading.Thread(target=probe, daemon=True)
+    started = time.perf_counter()
+    probe_thread.start()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        logins = list(pool.map(
+            lambda _: timed_request(login_request(login_url, args.username, args.password)),
+            range(args.requests)
+        ))
+    done.set()
+    probe_thread.join()
+    elapsed = time.perf_counter() - started
+
+    print(f"concurrency={args.concurrency} requests={args.requests} "
+          f"elapsed={elapsed:.2f}s throughput={len(logins) / elapsed:.1f} req/s")
+    report('login', logins)
+    report('probe', probes)
+
+
+if __name__ == '__main__':
+    main()
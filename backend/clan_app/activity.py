@@ -0,0 +1,113 @@
+# clan_app/activity.py
+"""
+클랜 멤버 활동 현황
+
+멤버마다 세션/예약을 따로 조회하지 않고, 클랜 전체 세션 1번 + 예약 1번을
+조회한 뒤 메모리에서 멤버별로 묶습니다.
+결과는 클랜별 버전 키로 캐시하며, 클랜 방/세션/예약이나 멤버 구성이
+바뀌면 (커밋 후) 버전을 올려 무효화합니다.
+"""
+from collections import defaultdict
+
+from django.core.cache import cache
+from django.db import transaction
+
+from config.cache_versions import bump_version, get_version
+from room_app.models import Room, Session, SessionReservation
+from user_app.serializers import UserBaseSerializer
+
+# 닉네임/프로필 이미지 변경은 버전으로 추적하지 않으므로 유지 시간을 둠
+REPORT_TIMEOUT = 60 * 10
+
+
+def _version_name(clan_id):
+    return f"clan_activity:{clan_id}"
+
+
+def invalidate(*clan_ids):
+    """
+    클랜 활동 현황 캐시 무효화 (커밋 후 적용)
+    """
+    clan_ids = {clan_id for clan_id in clan_ids if clan_id is not None}
+
+    def bump():
+        for clan_id in clan_ids:
+            bump_version(_version_name(clan_id))
+
+    if clan_ids:
+        transaction.on_commit(bump)
+
+
+def invalidate_rooms(room_ids):
+    """
+    방이 바뀌었을 때 - 클랜 방이면 해당 클랜 캐시 무효화
+    """
+    clan_ids = Room.objects.filter(
+        pk__in=room_ids, clan__isnull=False
+    ).values_list('clan_id', flat=True).distinct()
+    invalidate(*clan_ids)
+
+
+def _room_status(room):
+    if room.ended:
+        return "종료"
+    if room.confirmed:
+        return "확정"
+    return "참여"
+
+
+def _participation(session, status):
+    room = session.room
+    return {
+        "id": room.id,
+        "title": room.title,
+        "song": room.song,
+        "artist": room.artist,
+        "session_name": session.session_name,
+        "status": status,
+        "_created_at": room.created_at,
+    }
+
+
+def build_activity_report(clan, context=None):
+    """
+    return: [{"member": {...}, "participating_rooms": [...]}, ...] (닉네임 순)
+    """
+    members = list(clan.members.all().order_by('nickname'))
+    nicknames = {member.nickname for member in members}
+
+    by_nickname = defaultdict(list)
+    sessions = Session.objects.filter(
+        room__clan=clan, participant_nickname__in=nicknames
+    ).select_related('room').order_by('id')
+    for session in sessions:
+        by_nickname[session.participant_nickname].append(
+            _participation(session, _room_status(session.room))
+        )
+
+    by_user = defaultdict(list)
+    reservations = SessionReservation.objects.filter(
+        session__room__clan=clan, user__in=members
+    ).select_related('session__room').order_by('id')
+    for reservation in reservations:
+        by_user[reservation.user_id].append(_participation(reservation.session, "예약"))
+
+    member_data = UserBaseSerializer(members, many=True, context=context).data
+    report = []
+    for member, data in zip(members, member_data):
+        rooms = by_nickname[member.nickname] + by_user[member.id]
+        # 최신순 정렬 (방 생성 시간 기준)
+        rooms.sort(key=lambda item: item["_created_at"], reverse=True)
+        for item in rooms:
+            del item["_created_at"]
+        report.append({"member": dict(data), "participating_rooms": rooms})
+    return report
+
+
+def get_activity_report(clan, context=None):
+    key = f"clan_activity:{clan.id}:{get_version(_version_name(clan.id))}"
+    report = cache.get(key)
+    if report is None:
+        report = build_activity_report(clan, context)
+        cache.set(key, report, REPORT_TIMEOUT)
+    return report
@@ -0,0 +1,240 @@
+# clan_app/calendar_feed.py
+"""
+클랜 캘린더 (기간 조회 / 유저별 통합 캘린더 / iCalendar 피드)
+
+- 일정은 (clan, date, time) 인덱스를 타도록 date__year/date__month 대신
+  date 범위(start <= date <= end)로 조회합니다.
+- 유저 캘린더 = 내가 속한 모든 클랜의 일정 + 내가 참여한 확정 합주방
+  (방에는 별도 합주 일시가 없으므로 확정 시각(confirmed_at) 기준)
+- iCal 피드는 캘린더 앱이 JWT를 보낼 수 없으므로 서명된 토큰(?token=)으로 인증하고,
+  ETag는 집계 쿼리(개수 / 최대 id, 최대 version)만으로 계산해
+  바뀐 것이 없으면 본문을 만들지 않고 304로 응답합니다.
+"""
+import hashlib
+from datetime import date, datetime, timedelta, timezone as dt_timezone
+
+from django.core import signing
+from django.db.models import Count, Max, Q
+from django.utils import timezone
+
+from room_app.models import Room, Session
+from .models import Clan, ClanEvent
+
+# 한 번에 조회할 수 있는 최대 기간
+MAX_RANGE_DAYS = 366
+# 기간을 주지 않았을 때: 이번 달 1일부터
+DEFAULT_RANGE_DAYS = 92
+# iCal 피드 기간 (오늘 기준)
+FEED_PAST_DAYS = 30
+FEED_FUTURE_DAYS = 365
+
+FEED_TOKEN_SALT = 'clan_app.calendar_feed'
+
+
+def parse_date_range(query_params):
+    """
+    ?start=2025-11-01&end=2025-11-30 (둘 다 포함)
+    ?year=2025&month=11 (기존 월별 조회, 해당 월 전체)
+    -> (start, end) (잘못된 값이면 ValueError)
+    """
+    year = query_params.get('year')
+    month = query_params.get('month')
+    start = query_params.get('start')
+    end = query_params.get('end')
+
+    if year and month and not (start or end):
+        try:
+            start = date(int(year), int(month), 1)
+        except (TypeError, ValueError):
+            raise ValueError("year, month 값이 올바르지 않습니다.")
+        next_month = (start.replace(day=28) + timedelta(days=4)).replace(day=1)
+        return start, next_month - timedelta(days=1)
+
+    try:
+        start = date.fromisoformat(start) if start else timezone.localdate().replace(day=1)
+        end = date.fromisoformat(end) if end else start + timedelta(days=DEFAULT_RANGE_DAYS - 1)
+    except ValueError:
+        raise ValueError("start, end는 YYYY-MM-DD 형식이어야 합니다.")
+
+    if end < start:
+        raise ValueError("end는 start보다 빠를 수 없습니다.")
+    if (end - start).days >= MAX_RANGE_DAYS:
+        raise ValueError(f"조회 기간은 최대 {MAX_RANGE_DAYS}일입니다.")
+    return start, end
+
+
+def clan_events(clan_ids, start, end):
+    return ClanEvent.objects.filter(
+        clan_id__in=clan_ids, date__gte=start, date__lte=end
+    ).order_by('date', 'time', 'id')
+
+
+def user_clans(user):
+    """
+    유저가 멤버/운영진/클랜장인 클랜 {id: 이름}
+    """
+    return dict(Clan.objects.filter(
+        Q(members=user) | Q(admins=user) | Q(owner=user)
+    ).values_list('id', 'name').distinct().order_by('id'))
+
+
+def confirmed_rooms(user, start, end):
+    """
+    내가 세션에 참여한 확정 합주방 (확정 시각이 기간 안에 있는 방)
+    """
+    start_at = timezone.make_aware(datetime.combine(start, datetime.min.time()))
+    end_at = timezone.make_aware(datetime.combine(end + timedelta(days=1), datetime.min.time()))
+    return Room.objects.filter(
+        id__in=Session.objects.filter(participant_nickname=user.nickname).values('room_id'),
+        confirmed=True,
+        confirmed_at__gte=start_at,
+        confirmed_at__lt=end_at,
+    ).order_by('confirmed_at', 'id')
+
+
+def _event_entry(event, clan_names):
+    return {
+        "type": "event",
+        "id": event.id,
+        "clan_id": event.clan_id,
+        "clan_name": clan_names.get(event.clan_id),
+        "title": event.title,
+        "description": event.description,
+        "date": event.date.isoformat(),
+        "time": event.time.isoformat() if event.time else None,
+    }
+
+
+def _room_entry(room):
+    confirmed_at = timezone.localtime(room.confirmed_at)
+    return {
+        "type": "room",
+        "id": room.id,
+        "clan_id": room.clan_id,
+        "clan_name": None,
+        "title": room.title,
+        "description": f"{room.song} - {room.artist}",
+        "date": confirmed_at.date().isoformat(),
+        "time": confirmed_at.time().replace(microsecond=0).isoformat(),
+    }
+
+
+def user_calendar(user, start, end):
+    """
+    return: 날짜/시간 순 캘린더 항목 목록 (클랜 일정 + 확정 합주방)
+    """
+    clan_names = user_clans(user)
+    entries = [_event_entry(event, clan_names) for event in clan_events(list(clan_names), start, end)]
+    entries += [_room_entry(room) for room in confirmed_rooms(user, start, end)]
+    entries.sort(key=lambda entry: (entry["date"], entry["time"] or "", entry["type"], entry["id"]))
+    return entries
+
+
+# iCalendar 피드
+# -----------------------------------------------------------------
+
+def make_feed_token(user):
+    return signing.dumps({"u": user.id}, salt=FEED_TOKEN_SALT, compress=True)
+
+
+def read_feed_token(token):
+    """
+    return: user_id (잘못된 토큰이면 None)
+    """
+    try:
+        return signing.loads(token, salt=FEED_TOKEN_SALT)["u"]
+    except (signing.BadSignature, KeyError, TypeError):
+        return None
+
+
+def feed_range():
+    today = timezone.localdate()
+    return today - timedelta(days=FEED_PAST_DAYS), today + timedelta(days=FEED_FUTURE_DAYS)
+
+
+def feed_etag(user, start, end):
+    """
+    본문을 만들지 않고 집계 쿼리만으로 계산하는 ETag
+    (일정은 생성/삭제만 가능하므로 개수 + 최대 id, 방은 개수 + 최대 version)
+    """
+    clan_names = user_clans(user)
+    events = clan_events(list(clan_names), start, end).order_by().aggregate(n=Count('id'), last=Max('id'))
+    rooms = confirmed_rooms(user, start, end).order_by().aggregate(n=Count('id'), last=Max('version'))
+    state = repr((user.id, user.nickname, clan_names, start, end, events, rooms))
+    return f'W/"cal-{hashlib.md5(state.encode()).hexdigest()[:16]}"'
+
+
+def _escape(text):
+    return (
+        (text or "").replace("\\", "\\\\").replace(";", "\\;")
+        .replace(",", "\\,").replace("\r\n", "\\n").replace("\n", "\\n")
+    )
+
+
+def _fold(line):
+    """
+    RFC 5545: 한 줄은 75옥텟 이하, 이어지는 줄은 공백으로 시작
+    """
+    encoded = line.encode('utf-8')
+    if len(encoded) <= 75:
+        return line + "\r\n"
+    parts = []
+    limit = 75
+    while encoded:
+        cut = min(limit, len(encoded))
+        # UTF-8 문자 중간에서 자르지 않도록
+        while cut < len(encoded) and (encoded[cut] & 0xC0) == 0x80:
+            cut -= 1
+        parts.append(encoded[:cut].decode('utf-8'))
+        encoded = encoded[cut:]
+        limit = 74
+    return "\r\n ".join(parts) + "\r\n"
+
+
+def _vevent(uid, stamp, summary, description, start_value):
+    lines = [
+        "BEGIN:VEVENT",
+        f"UID:{uid}",
+        f"DTSTAMP:{stamp}",
+        start_value,
+        f"SUMMARY:{_escape(summary)}",
+    ]
+    if description:
+        lines.append(f"DESCRIPTION:{_escape(description)}")
+    lines.append("END:VEVENT")
+    return "".join(_fold(line) for line in lines)
+
+
+def iter_ical(user, start, end):
+    """
+    iCalendar 본문을 일정 단위로 생성 (StreamingHttpResponse용)
+    """
+    stamp = timezone.now().astimezone(dt_timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    yield "".join(_fold(line) for line in [
+        "BEGIN:VCALENDAR",
+        "VERSION:2.0",
+        "PRODID:-//Bandicon//Clan Calendar//KO",
+        "CALSCALE:GREGORIAN",
+        "X-WR-CALNAME:Bandicon",
+    ])
+
+    clan_names = user_clans(user)
+    for event in clan_events(list(clan_names), start, end).iterator(chunk_size=500):
+        if event.time:
+            # 시간대 정보 없이 입력된 시각 -> floating time (캘린더 앱의 현지 시각)
+            start_value = f"DTSTART:{datetime.combine(event.date, event.time).strftime('%Y%m%dT%H%M%S')}"
+        else:
+            start_value = f"DTSTART;VALUE=DATE:{event.date.strftime('%Y%m%d')}"
+        yield _vevent(
+            f"clan-event-{event.id}@bandicon", stamp,
+            f"[{clan_names.get(event.clan_id, '')}] {event.title}", event.description, start_value,
+        )
+
+    for room in confirmed_rooms(user, start, end).iterator(chunk_size=500):
+        confirmed_at = room.confirmed_at.astimezone(dt_timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+        yield _vevent(
+            f"room-{room.id}@bandicon", stamp,
+            f"[합주] {room.title}", f"{room.song} - {room.artist}", f"DTSTART:{confirmed_at}",
+        )
+
+    yield _fold("END:VCALENDAR")
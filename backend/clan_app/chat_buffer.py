@@ -0,0 +1,88 @@
+# clan_app/chat_buffer.py
+"""
+클랜 채팅 저장 버퍼 (write-behind)
+
+메시지마다 INSERT 하지 않고 클랜별로 모았다가
+FLUSH_INTERVAL 초가 지나거나 FLUSH_SIZE 개가 쌓이면 bulk_create로 한 번에 저장합니다.
+(브로드캐스트는 즉시, DB 저장은 최대 FLUSH_INTERVAL 만큼 늦음)
+최근 메시지 링 버퍼(clan_chat_history)에는 bulk_create가 성공한 배치만 추가합니다.
+
+워커 프로세스의 이벤트 루프 안에서만 사용합니다.
+
+clan_chat_history: 클랜 채팅 최근 메시지 링 버퍼 (config.chat_history)
+"""
+import asyncio
+
+from channels.db import database_sync_to_async
+
+from config.chat_history import RecentChatHistory
+from . import stats
+from .models import ClanChat
+
+FLUSH_INTERVAL = 0.05  # 초
+FLUSH_SIZE = 50
+
+
+class ClanChatBuffer:
+    def __init__(self, flush_interval=FLUSH_INTERVAL, flush_size=FLUSH_SIZE):
+        self.flush_interval = flush_interval
+        self.flush_size = flush_size
+        self._pending = {}  # clan_id -> [ClanChat, ...]
+        self._timers = {}   # clan_id -> asyncio.Task
+
+    async def add(self, chat):
+        """
+        chat: 저장 전 ClanChat 인스턴스 (flush 후 pk가 채워짐)
+        """
+        clan_id = chat.clan_id
+        pending = self._pending.setdefault(clan_id, [])
+        pending.append(chat)
+
+        if len(pending) >= self.flush_size:
+            await self.flush(clan_id)
+        elif clan_id not in self._timers:
+            self._timers[clan_id] = asyncio.ensure_future(self._flush_later(clan_id))
+
+    async def _flush_later(self, clan_id):
+        await asyncio.sleep(self.flush_interval)
+        self._timers.pop(clan_id, None)
+        await self.flush(clan_id)
+
+    async def flush(self, clan_id):
+        timer = self._timers.pop(clan_id, None)
+        if timer is not None and timer is not asyncio.current_task():
+            timer.cancel()
+
+        batch = self._pending.pop(clan_id, None)
+        if not batch:
+            return
+        try:
+            await database_sync_to_async(ClanChat.objects.bulk_create)(batch)
+        except Exception as e:
+            print(f"클랜 채팅 저장 실패 (clan {clan_id}, {len(batch)}건): {e}")
+            return
+        try:
+            # 저장된 뒤에 링 버퍼에 추가 (다른 워커가 새 버전을 보고 DB에서 다시 읽어도 빠지지 않음)
+            await database_sync_to_async(clan_chat_history.append_many)(clan_id, batch)
+            await database_sync_to_async(stats.record_many)(
+                clan_id, [chat.timestamp for chat in batch], 'chat_messages'
+            )
+        except Exception as e:
+            print(f"클랜 채팅 후처리 실패 (clan {clan_id}, {len(batch)}건): {e}")
+
+    async def flush_all(self):
+        for clan_id in list(self._pending):
+            await self.flush(clan_id)
+
+
+chat_buffer = ClanChatBuffer()
+
+
+def _load_clan_chats(clan_id, before, limit):
+    queryset = ClanChat.objects.filter(clan_id=clan_id).select_related('sender')
+    if before is not None:
+        queryset = queryset.filter(timestamp__lt=before)
+    return list(queryset.order_by('-timestamp', '-id')[:limit])
+
+
+clan_chat_history = RecentChatHistory('clan', _load_clan_chats)
@@ -4,14 +4,32 @@ from channels.db import database_sync_to_async
 from django.utils import timezone
 from django.contrib.auth import get_user_model
 
+from .chat_buffer import chat_buffer, clan_chat_history
+from .models import ClanChat
+
 # Django의 User 모델 가져오기
 User = get_user_model()
 
+# 접속 시 보내는 최근 메시지 수
+HISTORY_LIMIT = 50
+
 class ClanChatConsumer(AsyncWebsocketConsumer):
     async def connect(self):
-        self.clan_id = self.scope['url_route']['kwargs']['clan_id']
+        self.clan_id = int(self.scope['url_route']['kwargs']['clan_id'])
         self.room_group_name = f'clan_{self.clan_id}'
 
+        # [수정] 보낸 사람 / 클랜은 접속 시 한 번만 확인
+        # (?token= JWT로 인증된 scope['user']만 허용, 메시지의 sender 값은 쓰지 않음)
+        user = self.scope.get('user')
+        if user is None or not user.is_authenticated:
+            await self.close(code=4001)
+            return
+        allowed = await self.resolve_membership(user)
+        if not allowed:
+            await self.close(code=4003)
+            return
+        self.sender = user
+
         # 그룹에 참여
         await self.channel_layer.group_add(
             self.room_group_name,
@@ -19,22 +37,29 @@ class ClanChatConsumer(AsyncWebsocketConsumer):
         )
         await self.accept()
 
+        # [추가] 최근 대화를 링 버퍼에서 바로 전송 (과거 -> 최신 순)
+        history = await self.recent_history()
+        await self.send(text_data=json.dumps({'type': 'history', 'messages': history}))
+
     async def disconnect(self, close_code):
         # 그룹에서 탈퇴
         await self.channel_layer.group_discard(
             self.room_group_name,
             self.channel_name
         )
+        # 남은 메시지 저장
+        await chat_buffer.flush(self.clan_id)
 
     # 웹소켓으로 메시지 받기 (프론트 -> 백엔드)
     async def receive(self, text_data):
         data = json.loads(text_data)
         message = data['message']
-        sender_nickname = data['sender'] # 프론트에서 보낸 건 '닉네임 문자열'
 
-        # DB 저장 (비동기 처리)
-        # 여기서 닉네임을 넘기면 save_message 안에서 User 객체로 변환합니다.
-        await self.save_message(self.clan_id, sender_nickname, message)
+        sender = self.sender
+
+        # DB 저장은 버퍼에 넣고 모아서 처리 (clan_app/chat_buffer.py)
+        chat = ClanChat(clan_id=self.clan_id, sender=sender, message=message, timestamp=timezone.now())
+        await chat_buffer.add(chat)  # 저장 후 최근 메시지 링 버퍼에도 추가됨
 
         # 그룹 전체에 메시지 전송 (여기선 닉네임 그대로 보냄)
         await self.channel_layer.group_send(
@@ -42,8 +67,8 @@ class ClanChatConsumer(AsyncWebsocketConsumer):
             {
                 'type': 'chat_message',
                 'message': message,
-                'sender': sender_nickname,
-                'timestamp': str(timezone.now())
+                'sender': sender.nickname,
+                'timestamp': str(chat.timestamp)
             }
         )
 
@@ -56,18 +81,17 @@ class ClanChatConsumer(AsyncWebsocketConsumer):
         }))
 
     @database_sync_to_async
-    def save_message(self, clan_id, sender_nickname, message):
-        from .models import Clan, ClanChat
-        
-        # 1. 닉네임 문자열로 실제 User 객체를 찾습니다.
-        try:
-            user = User.objects.get(nickname=sender_nickname)
-        except User.DoesNotExist:
-            # 유저가 없으면 저장하지 않고 리턴 (또는 에러 로그)
-            print(f"User with nickname {sender_nickname} not found.")
-            return
+    def resolve_membership(self, user):
+        """
+        클랜 멤버(소유자/운영진 포함)만 허용 (클랜이 없으면 거부)
+        """
+        from .roles import load_clan_role
+
+        return load_clan_role(user, self.clan_id).has_access
+
+    @database_sync_to_async
+    def recent_history(self):
+        from .serializers import ClanChatSerializer
 
-        clan = Clan.objects.get(id=clan_id)
-        
-        # 2. sender 필드에 닉네임(String) 대신 유저 객체(User Instance)를 넣습니다.
-        ClanChat.objects.create(clan=clan, sender=user, message=message)
\ No newline at end of file
+        messages = clan_chat_history.recent(self.clan_id, HISTORY_LIMIT)
+        return ClanChatSerializer(messages[::-1], many=True).data
@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from clan_app.stats import backfill
+
+
+class Command(BaseCommand):
+    help = "방 / 채팅 / 게시글 / 가입 신청 / 멤버 기록으로부터 클랜 통계 롤업(ClanStatRollup)을 다시 만듭니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--clan', type=int, action='append', dest='clans',
+                            help="특정 클랜만 다시 계산 (여러 번 지정 가능)")
+
+    def handle(self, *args, **options):
+        count = backfill(options['clans'])
+        self.stdout.write(self.style.SUCCESS(f"클랜 통계 {count}행을 다시 만들었습니다."))
@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from clan_app.models import Clan
+from clan_app.timeline import rebuild_timeline
+
+
+class Command(BaseCommand):
+    help = "공지 / 일정 / 게시글 / 클랜 방 / 가입 승인 기록으로부터 클랜 타임라인(ClanTimelineEntry)을 다시 만듭니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--clan', type=int, action='append', dest='clans',
+                            help="특정 클랜만 다시 만들기 (여러 번 지정 가능)")
+
+    def handle(self, *args, **options):
+        clan_ids = options['clans'] or Clan.objects.values_list('id', flat=True)
+        count = rebuild_timeline(clan_ids)
+        self.stdout.write(self.style.SUCCESS(f"타임라인 {count}행을 다시 만들었습니다."))
@@ -0,0 +1,152 @@
+# clan_app/membership.py
+"""
+클랜 멤버십 일괄 변경 (가입 승인/거절, 강퇴, 운영진 임명/해제)
+
+요청마다 유저를 하나씩 처리하지 않고, 한 트랜잭션 안에서
+- 가입 신청 상태: UPDATE 1번씩 (승인 / 거절)
+- members, admins 중간 테이블: bulk INSERT / DELETE 1번씩
+- 알림: bulk_create 1번
+으로 적용합니다. 활동 현황 / 프로필 캐시 무효화와 통계 반영도 한 번만 합니다.
+(bulk 변경은 m2m_changed 시그널이 없으므로 프로필 캐시는 직접 무효화)
+"""
+from django.db import transaction
+
+from user_app.models import Alert, User
+from user_app.profiles import invalidate_profiles
+from . import activity, stats, timeline
+from .models import ClanJoinRequest
+
+ACTIONS = ('approve', 'reject', 'kick', 'promote', 'demote')
+# 한 번에 처리할 수 있는 최대 유저 수 (액션 합계)
+MAX_USERS = 1000
+
+
+def parse_membership_actions(data):
+    """
+    {"approve": [user_id, ...] | "all", "reject": [...], "kick": [...], "promote": [...], "demote": [...]}
+    -> {action: set(user_id)} (잘못된 값이면 ValueError)
+    """
+    actions = {}
+    for action in ACTIONS:
+        value = data.get(action)
+        if value in (None, ''):
+            continue
+        if action == 'approve' and value == 'all':
+            actions[action] = 'all'
+            continue
+        if not isinstance(value, (list, tuple)):
+            raise ValueError(f"{action}는 유저 id 목록이어야 합니다.")
+        try:
+            actions[action] = {int(user_id) for user_id in value}
+        except (TypeError, ValueError):
+            raise ValueError(f"{action}에 잘못된 유저 id가 있습니다.")
+
+    if not actions:
+        raise ValueError(f"{', '.join(ACTIONS)} 중 하나 이상이 필요합니다.")
+
+    seen = set()
+    total = 0
+    for action, user_ids in actions.items():
+        if user_ids == 'all':
+            continue
+        if seen & user_ids:
+            raise ValueError("한 유저에게 여러 작업을 동시에 적용할 수 없습니다.")
+        seen |= user_ids
+        total += len(user_ids)
+    if total > MAX_USERS:
+        raise ValueError(f"한 번에 최대 {MAX_USERS}명까지 처리할 수 있습니다.")
+    return actions
+
+
+def _alerts(clan, user_ids, message, url=None):
+    return [
+        Alert(user_id=user_id, message=message, related_id=clan.id, related_url=url)
+        for user_id in user_ids
+    ]
+
+
+@transaction.atomic
+def apply_membership_actions(clan, actions):
+    """
+    return: {action: [적용된 유저 id]}, {action: [건너뛴 유저 id]}
+    - approve / reject: 대기 중인 가입 신청이 있는 유저만
+    - kick: 클랜장 제외, 멤버인 유저만 (운영진 권한도 함께 해제)
+    - promote: 운영진이 아닌 멤버만 / demote: 운영진만
+    """
+    Membership = clan.members.through
+    AdminRole = clan.admins.through
+    clan_url = f"/clans/{clan.id}/"
+
+    requested = {action: user_ids for action, user_ids in actions.items() if user_ids != 'all'}
+    requested_ids = set().union(*requested.values()) if requested else set()
+
+    # 현재 상태는 액션 대상 유저에 대해서만 한 번씩 조회
+    pending = ClanJoinRequest.objects.filter(clan=clan, status='pending')
+    if actions.get('approve') != 'all':
+        pending = pending.filter(user_id__in=requested_ids)
+    pending_ids = set(pending.values_list('user_id', flat=True))
+    member_ids = set(Membership.objects.filter(
+        clan_id=clan.id, user_id__in=requested_ids
+    ).values_list('user_id', flat=True))
+    admin_ids = set(AdminRole.objects.filter(
+        clan_id=clan.id, user_id__in=requested_ids
+    ).values_list('user_id', flat=True))
+
+    if actions.get('approve') == 'all':
+        actions = {**actions, 'approve': pending_ids - requested_ids}
+
+    targets = {
+        'approve': actions.get('approve', set()) & pending_ids,
+        'reject': actions.get('reject', set()) & pending_ids,
+        'kick': (actions.get('kick', set()) & member_ids) - {clan.owner_id},
+        'promote': (actions.get('promote', set()) & member_ids) - admin_ids,
+        'demote': actions.get('demote', set()) & admin_ids,
+    }
+    alerts = []
+
+    if targets['approve']:
+        ClanJoinRequest.objects.filter(
+            clan=clan, status='pending', user_id__in=targets['approve']
+        ).update(status='approved')
+        Membership.objects.bulk_create(
+            [Membership(clan_id=clan.id, user_id=user_id) for user_id in targets['approve']],
+            ignore_conflicts=True
+        )
+        alerts += _alerts(clan, targets['approve'], f"'{clan.name}' 클랜 가입이 승인되었습니다!", clan_url)
+        timeline.add_members(clan.id, User.objects.filter(id__in=targets['approve']).only('id', 'nickname'))
+
+    if targets['reject']:
+        ClanJoinRequest.objects.filter(
+            clan=clan, status='pending', user_id__in=targets['reject']
+        ).update(status='rejected')
+        alerts += _alerts(clan, targets['reject'], f"'{clan.name}' 클랜 가입이 거절되었습니다.")
+
+    if targets['kick']:
+        Membership.objects.filter(clan_id=clan.id, user_id__in=targets['kick']).delete()
+        AdminRole.objects.filter(clan_id=clan.id, user_id__in=targets['kick']).delete()
+        alerts += _alerts(clan, targets['kick'], f"'{clan.name}' 클랜에서 강퇴되었습니다.")
+
+    if targets['promote']:
+        AdminRole.objects.bulk_create(
+            [AdminRole(clan_id=clan.id, user_id=user_id) for user_id in targets['promote']],
+            ignore_conflicts=True
+        )
+        alerts += _alerts(clan, targets['promote'], f"'{clan.name}' 클랜의 운영진으로 임명되었습니다.", clan_url)
+
+    if targets['demote']:
+        AdminRole.objects.filter(clan_id=clan.id, user_id__in=targets['demote']).delete()
+        alerts += _alerts(clan, targets['demote'], f"'{clan.name}' 클랜의 운영진 권한이 해제되었습니다.", clan_url)
+
+    if alerts:
+        Alert.objects.bulk_create(alerts)
+    if targets['approve'] or targets['kick']:
+        activity.invalidate(clan.id)
+        invalidate_profiles(targets['approve'] | targets['kick'])
+        stats.record_members(clan.id, joined=len(targets['approve']), left=len(targets['kick']))
+
+    applied = {action: sorted(user_ids) for action, user_ids in targets.items() if action in actions}
+    skipped = {
+        action: sorted(actions[action] - targets[action])
+        for action in actions if actions[action] - targets[action]
+    }
+    return applied, skipped
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.7 on 2026-10-19 13:44
+
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('clan_app', '0004_clan_status'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='clanchat',
+            name='timestamp',
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+        migrations.AddIndex(
+            model_name='clanchat',
+            index=models.Index(fields=['clan', 'timestamp'], name='clanchat_clan_ts_idx'),
+        ),
+    ]
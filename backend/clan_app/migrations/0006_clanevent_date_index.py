@@ -0,0 +1,19 @@
+# Generated by Django 5.2.7 on 2026-10-19 13:48
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('clan_app', '0005_clanchat_timestamp_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='clanevent',
+            index=models.Index(fields=['clan', 'date', 'time'], name='clanevent_clan_date_idx'),
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 5.2.7 on 2026-10-19 13:50
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('clan_app', '0006_clanevent_date_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ClanStatRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('period', models.CharField(choices=[('hour', '시간별'), ('day', '일별')], max_length=4)),
+                ('bucket', models.DateTimeField()),
+                ('members_joined', models.IntegerField(default=0)),
+                ('members_left', models.IntegerField(default=0)),
+                ('member_count', models.IntegerField(blank=True, null=True)),
+                ('rooms_created', models.IntegerField(default=0)),
+                ('rooms_confirmed', models.IntegerField(default=0)),
+                ('rooms_ended', models.IntegerField(default=0)),
+                ('chat_messages', models.IntegerField(default=0)),
+                ('board_posts', models.IntegerField(default=0)),
+                ('join_requests', models.IntegerField(default=0)),
+                ('clan', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='stat_rollups', to='clan_app.clan')),
+            ],
+            options={
+                'unique_together': {('clan', 'period', 'bucket')},
+            },
+        ),
+    ]
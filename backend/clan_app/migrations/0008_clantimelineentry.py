@@ -0,0 +1,34 @@
+# Generated by Django 5.2.7 on 2026-10-19 13:53
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('clan_app', '0007_clanstatrollup'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ClanTimelineEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('announcement', '공지사항'), ('event', '일정'), ('board', '게시글'), ('room', '합주방'), ('member', '새 멤버')], max_length=20)),
+                ('object_id', models.PositiveIntegerField()),
+                ('actor_nickname', models.CharField(blank=True, default='', max_length=150)),
+                ('title', models.CharField(blank=True, default='', max_length=255)),
+                ('url', models.CharField(blank=True, default='', max_length=255)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('actor', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to=settings.AUTH_USER_MODEL)),
+                ('clan', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='timeline', to='clan_app.clan')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['clan', '-id'], name='clantimeline_clan_id_idx')],
+            },
+        ),
+    ]
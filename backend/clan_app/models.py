@@ -39,10 +39,15 @@ class ClanChat(models.Model):
     clan = models.ForeignKey(Clan, related_name='chats', on_delete=models.CASCADE)
     sender = models.ForeignKey(User, related_name='clan_chats', on_delete=models.CASCADE)
     message = models.TextField(default="")
-    timestamp = models.DateTimeField(auto_now_add=True)
+    # [수정] 저장 버퍼(chat_buffer)가 브로드캐스트 시각을 그대로 저장하도록 default 사용
+    timestamp = models.DateTimeField(default=timezone.now)
 
     class Meta:
         ordering = ['timestamp']
+        indexes = [
+            # 클랜별 최근 메시지 / before 스크롤 조회
+            models.Index(fields=['clan', 'timestamp'], name='clanchat_clan_ts_idx'),
+        ]
 
 # --- (이하 3순위 기능) ---
 
@@ -62,6 +67,12 @@ class ClanEvent(models.Model):
     date = models.DateField(default=timezone.now)
     time = models.TimeField(null=True, blank=True)
 
+    class Meta:
+        indexes = [
+            # 클랜별 기간 조회 (date 범위 + 시간순 정렬)
+            models.Index(fields=['clan', 'date', 'time'], name='clanevent_clan_date_idx'),
+        ]
+
 class ClanBoard(models.Model):
     CATEGORY_CHOICES = [
         ('free', '자유'),
@@ -74,4 +85,66 @@ class ClanBoard(models.Model):
     # --- 👇 [오류 수정] TextField에도 null=True, blank=True 추가 ---
     content = models.TextField(null=True, blank=True)
     created_at = models.DateTimeField(default = timezone.now)
-    category = models.CharField(max_length=10, choices=CATEGORY_CHOICES, default='free')
\ No newline at end of file
+    category = models.CharField(max_length=10, choices=CATEGORY_CHOICES, default='free')
+
+class ClanStatRollup(models.Model):
+    """
+    클랜 통계 시간별/일별 집계 (clan_app.stats가 이벤트마다 증분 반영)
+    전체 재계산은 `python manage.py backfill_clan_stats`
+    """
+    PERIOD_CHOICES = [
+        ('hour', '시간별'),
+        ('day', '일별'),
+    ]
+    clan = models.ForeignKey(Clan, related_name='stat_rollups', on_delete=models.CASCADE)
+    period = models.CharField(max_length=4, choices=PERIOD_CHOICES)
+    bucket = models.DateTimeField()  # 구간 시작 시각
+
+    members_joined = models.IntegerField(default=0)
+    members_left = models.IntegerField(default=0)
+    # 구간 마지막 변경 시점의 멤버 수 (변경이 없던 구간은 null -> 이전 값 유지)
+    member_count = models.IntegerField(null=True, blank=True)
+    rooms_created = models.IntegerField(default=0)
+    rooms_confirmed = models.IntegerField(default=0)
+    rooms_ended = models.IntegerField(default=0)
+    chat_messages = models.IntegerField(default=0)
+    board_posts = models.IntegerField(default=0)
+    join_requests = models.IntegerField(default=0)
+
+    class Meta:
+        unique_together = ('clan', 'period', 'bucket')
+
+    def __str__(self):
+        return f"[{self.clan_id}] {self.period} {self.bucket:%Y-%m-%d %H:%M}"
+
+
+class ClanTimelineEntry(models.Model):
+    """
+    클랜 새 소식 타임라인 (추가만 하는 테이블, clan_app.timeline이 기록)
+    공지 / 일정 / 게시글 / 클랜 방 / 가입 승인이 생길 때 한 행씩 쌓이고,
+    클랜 홈은 (clan, -id) 인덱스로 이 테이블만 읽습니다.
+    """
+    KIND_CHOICES = [
+        ('announcement', '공지사항'),
+        ('event', '일정'),
+        ('board', '게시글'),
+        ('room', '합주방'),
+        ('member', '새 멤버'),
+    ]
+    clan = models.ForeignKey(Clan, related_name='timeline', on_delete=models.CASCADE)
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES)
+    object_id = models.PositiveIntegerField()
+    actor = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True)
+    # 작성 시점의 값 (조회 시 JOIN 없이 그대로 보여줌)
+    actor_nickname = models.CharField(max_length=150, blank=True, default="")
+    title = models.CharField(max_length=255, blank=True, default="")
+    url = models.CharField(max_length=255, blank=True, default="")
+    created_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['clan', '-id'], name='clantimeline_clan_id_idx'),
+        ]
+
+    def __str__(self):
+        return f"[{self.clan_id}] {self.kind} {self.title}"
@@ -2,6 +2,7 @@
 
 from rest_framework import permissions
 from .models import Clan
+from .roles import get_clan_role
 class IsClanOwner(permissions.BasePermission):
     def has_object_permission(self, request, view, obj):
         # Read permissions are allowed to any request,
@@ -10,7 +11,20 @@ class IsClanOwner(permissions.BasePermission):
             return True
 
         # Write permissions are only allowed to the owner of the clan.
-        return obj.owner == request.user
+        return get_clan_role(request, obj).is_owner
+
+
+
+def _object_clan_id(view, obj):
+    """
+    객체(Clan 또는 clan FK를 가진 모델)의 클랜 id
+    (알 수 없으면 URL의 clan_id / pk 사용)
+    """
+    if isinstance(obj, Clan):
+        return obj.pk
+    if hasattr(obj, 'clan_id'):
+        return obj.clan_id
+    return view.kwargs.get('clan_id') or view.kwargs.get('pk')
 
 # --- 👇 [오류 수정] 누락된 클래스 추가 ---
 
@@ -30,15 +44,15 @@ class IsClanOwnerOrReadOnly(permissions.BasePermission):
         # Write permissions are only allowed to the owner of the snippet.
         # (obj가 Clan 모델일 경우)
         if isinstance(obj, Clan):
-            return obj.owner == request.user
+            return get_clan_role(request, obj).is_owner
         
         # (obj가 다른 모델이고 owner 속성이 있을 경우)
-        if hasattr(obj, 'owner'):
-             return obj.owner == request.user
+        if hasattr(obj, 'owner_id'):
+             return obj.owner_id == request.user.id
 
         # (obj가 author 속성을 가질 경우, 예: Post, Comment)
-        if hasattr(obj, 'author'):
-             return obj.author == request.user
+        if hasattr(obj, 'author_id'):
+             return obj.author_id == request.user.id
 
         return False
 # --- [여기까지] ---
@@ -60,36 +74,17 @@ class IsClanOwnerOrAdmin(permissions.BasePermission):
                 return request.user.is_authenticated
             return False # clan_id를 찾을 수 없으면 권한 없음
 
-        try:
-            clan = Clan.objects.get(id=clan_id)
-            return request.user == clan.owner or request.user in clan.admins.all()
-        except Clan.DoesNotExist:
-            return False
+        return get_clan_role(request, clan_id).is_owner_or_admin
 
     def has_object_permission(self, request, view, obj):
         # has_permission에서 clan_id 기반으로 이미 체크했지만,
         # 객체 레벨(예: ClanJoinRequest)에서 한 번 더 확인
         
-        clan = None
-        if isinstance(obj, Clan):
-            clan = obj
-        elif hasattr(obj, 'clan'):
-            clan = obj.clan
-        else:
-            # clan_id를 URL에서 다시 가져와서 확인
-            clan_id = view.kwargs.get('clan_id') or view.kwargs.get('pk')
-            if clan_id:
-                try:
-                    clan = Clan.objects.get(id=clan_id)
-                except Clan.DoesNotExist:
-                    return False
-            else:
-                return False # 클랜 정보를 알 수 없으면 권한 없음
-
-        if not clan:
-            return False
+        clan_id = _object_clan_id(view, obj)
+        if not clan_id:
+            return False # 클랜 정보를 알 수 없으면 권한 없음
 
-        return request.user == clan.owner or request.user in clan.admins.all()
+        return get_clan_role(request, clan_id).is_owner_or_admin
 
 # --- [신규 추가] ---
 # (views.py에서 import하려던 IsClanMember 추가)
@@ -106,48 +101,15 @@ class IsClanMember(permissions.BasePermission):
         if not clan_id:
             return False # clan_id를 찾을 수 없으면 권한 없음
 
-        try:
-            clan = Clan.objects.get(id=clan_id)
-            # 클랜 멤버이거나, 소유자이거나, 관리자여야 함
-            # (Clan 모델 정의에 따라 members가 소유자/관리자를 포함하는지 확인 필요)
-            # -> Clan 모델에서 members = ManyToManyField(..., related_name='clans')
-            # -> Clan 생성 시 owner가 members에 자동 추가/ 관리자 임명 시 members에 자동 추가
-            #    (이 로직이 없다면, 3가지를 모두 체크해야 함)
-            
-            # 현재 로직: members는 가입 승인 시 추가됨. owner/admins는 별도 필드.
-            # 따라서 3가지 모두 확인
-            is_member = request.user in clan.members.all()
-            is_owner = request.user == clan.owner
-            is_admin = request.user in clan.admins.all()
-            
-            return is_member or is_owner or is_admin
-
-        except Clan.DoesNotExist:
-            return False
+        # 클랜 멤버이거나, 소유자이거나, 관리자여야 함
+        # (members는 가입 승인 시 추가됨. owner/admins는 별도 필드이므로 3가지 모두 확인)
+        return get_clan_role(request, clan_id).has_access
 
     def has_object_permission(self, request, view, obj):
         # has_permission에서 이미 체크했지만, 객체 레벨에서도 확인
-        clan = None
-        if isinstance(obj, Clan):
-            clan = obj
-        elif hasattr(obj, 'clan'):
-            clan = obj.clan
-        else:
-            clan_id = view.kwargs.get('clan_id') or view.kwargs.get('pk')
-            if clan_id:
-                try:
-                    clan = Clan.objects.get(id=clan_id)
-                except Clan.DoesNotExist:
-                    return False
-            else:
-                return False
-
-        if not clan:
+        clan_id = _object_clan_id(view, obj)
+        if not clan_id:
             return False
 
-        is_member = request.user in clan.members.all()
-        is_owner = request.user == clan.owner
-        is_admin = request.user in clan.admins.all()
-        
-        return is_member or is_owner or is_admin
+        return get_clan_role(request, clan_id).has_access
 # --- [여기까지] ---
\ No newline at end of file
@@ -0,0 +1,135 @@
+# clan_app/roles.py
+"""
+클랜 역할(클랜장 / 운영진 / 멤버) 조회
+
+members.all(), admins.all()을 파이썬으로 불러와 `in` 검사하지 않고,
+EXISTS 서브쿼리 1번으로 역할을 계산합니다.
+같은 요청 안에서 권한 클래스(has_permission, has_object_permission)와
+view, serializer가 여러 번 물어봐도 쿼리는 1번만 실행됩니다. (request에 메모)
+"""
+from django.db.models import Count, Exists, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+from .models import Clan
+
+
+class ClanRole:
+    """
+    한 유저의 특정 클랜 내 역할
+    """
+    __slots__ = ('clan_id', 'exists', 'is_owner', 'is_admin', 'is_member')
+
+    def __init__(self, clan_id, exists=False, is_owner=False, is_admin=False, is_member=False):
+        self.clan_id = clan_id
+        self.exists = exists
+        self.is_owner = is_owner
+        self.is_admin = is_admin
+        self.is_member = is_member
+
+    @property
+    def is_owner_or_admin(self):
+        return self.is_owner or self.is_admin
+
+    @property
+    def has_access(self):
+        # 멤버이거나, 소유자이거나, 관리자 (members에 owner/admin이 빠져 있어도 허용)
+        return self.is_member or self.is_owner or self.is_admin
+
+    @property
+    def name(self):
+        if self.is_owner:
+            return 'owner'
+        if self.is_admin:
+            return 'admin'
+        if self.is_member:
+            return 'member'
+        return None
+
+
+def _clan_id(clan):
+    return clan.pk if isinstance(clan, Clan) else int(clan)
+
+
+def load_clan_role(user, clan):
+    """
+    메모 없이 DB에서 바로 조회 (쿼리 1번)
+    """
+    clan_id = _clan_id(clan)
+    if not user or not user.is_authenticated:
+        return ClanRole(clan_id, exists=Clan.objects.filter(pk=clan_id).exists())
+
+    row = Clan.objects.filter(pk=clan_id).annotate(
+        user_is_member=Exists(
+            Clan.members.through.objects.filter(clan_id=OuterRef('pk'), user_id=user.id)
+        ),
+        user_is_admin=Exists(
+            Clan.admins.through.objects.filter(clan_id=OuterRef('pk'), user_id=user.id)
+        ),
+    ).values_list('owner_id', 'user_is_member', 'user_is_admin').first()
+
+    if row is None:
+        return ClanRole(clan_id)
+    owner_id, is_member, is_admin = row
+    return ClanRole(
+        clan_id, exists=True,
+        is_owner=owner_id == user.id, is_admin=is_admin, is_member=is_member,
+    )
+
+
+def get_clan_role(request, clan, user=None):
+    """
+    요청 단위로 메모된 역할 조회
+    - user를 주지 않으면 request.user 기준
+    """
+    user = user or request.user
+    key = (_clan_id(clan), getattr(user, 'id', None))
+
+    roles = getattr(request, '_clan_roles', None)
+    if roles is None:
+        roles = request._clan_roles = {}
+    if key not in roles:
+        roles[key] = load_clan_role(user, clan)
+    return roles[key]
+
+
+def forget_clan_role(request, clan, user=None):
+    """
+    역할을 바꾼 뒤 같은 요청에서 다시 조회해야 할 때
+    """
+    user = user or request.user
+    roles = getattr(request, '_clan_roles', None)
+    if roles:
+        roles.pop((_clan_id(clan), getattr(user, 'id', None)), None)
+
+
+def clan_admin_ids(clan):
+    """
+    클랜 운영진 id 집합 (clan 인스턴스에 메모, prefetch 되어 있으면 재사용)
+    """
+    admin_ids = getattr(clan, '_admin_ids', None)
+    if admin_ids is None:
+        prefetched = getattr(clan, '_prefetched_objects_cache', {})
+        if 'admins' in prefetched:
+            admin_ids = {user.id for user in prefetched['admins']}
+        else:
+            admin_ids = set(clan.admins.values_list('id', flat=True))
+        clan._admin_ids = admin_ids
+    return admin_ids
+
+
+def annotate_clan_list(queryset, user):
+    """
+    클랜 목록용: 멤버 수 / 조회자의 멤버 여부를 서브쿼리로 함께 조회
+    (클랜마다 COUNT, 멤버 ID 전체 조회를 하지 않음)
+    """
+    through = Clan.members.through
+    member_count = through.objects.filter(
+        clan_id=OuterRef('pk')
+    ).order_by().values('clan_id').annotate(c=Count('*')).values('c')
+    queryset = queryset.annotate(annotated_member_count=Coalesce(Subquery(member_count), 0))
+
+    if user and user.is_authenticated:
+        viewer_is_member = Exists(through.objects.filter(clan_id=OuterRef('pk'), user_id=user.id))
+    else:
+        viewer_is_member = Value(False)
+    return queryset.annotate(viewer_is_member=viewer_is_member)
@@ -2,12 +2,13 @@
 from rest_framework import serializers
 from .models import (
     Clan, ClanJoinRequest, ClanChat, 
-    ClanBoard, ClanAnnouncement, ClanEvent
+    ClanBoard, ClanAnnouncement, ClanEvent, ClanTimelineEntry
 )
 from django.contrib.auth import get_user_model
 from user_app.models import User
 from room_app.models import Room, Session, SessionReservation
 from user_app.serializers import UserBaseSerializer
+from .roles import clan_admin_ids, get_clan_role
 from room_app.serializers import RoomInfoForActivitySerializer # 수정: room_app에서 가져옴
 
 from rest_framework import serializers
@@ -37,13 +38,14 @@ class ClanMemberSerializer(serializers.ModelSerializer):
     def get_is_owner(self, obj):
         clan = self.get_clan()
         if clan:
-            return obj == clan.owner
+            return obj.id == clan.owner_id
         return False
 
     def get_is_admin(self, obj):
         clan = self.get_clan()
         if clan:
-            return obj in clan.admins.all()
+            # [수정] 멤버마다 admins 전체를 불러오지 않고 id 집합을 한 번만 조회
+            return obj.id in clan_admin_ids(clan)
         return False
 
 
@@ -58,20 +60,32 @@ class ClanSerializer(serializers.ModelSerializer):
     # 1. 'member_count' 필드 정의
     member_count = serializers.SerializerMethodField()
     
-    # 2. 'members' (ID 목록) 필드 정의
-    members = serializers.PrimaryKeyRelatedField(many=True, read_only=True)
+    # 2. [수정] 전체 멤버 ID 목록 대신 '내가 멤버인지' 여부만 전달
+    is_member = serializers.SerializerMethodField()
 
     class Meta:
         model = Clan
         
-        # ▼▼▼ [핵심] 3. 'fields' 목록에 'member_count'와 'members'가 모두 있는지 확인! ▼▼▼
         fields = ('id', 'name', 'description', 'owner', 'created_at', 'image', 
-                  'member_count', 'members', 'status') 
-        # ▲▲▲ [핵심] ▲▲▲
+                  'member_count', 'is_member', 'status') 
         
         read_only_fields = ('created_at',) # 'owner'는 여기서 제거되어야 함
+
+    # (목록 view에서는 annotate_clan_list()로 미리 계산된 값을 사용)
     def get_member_count(self, obj):
-        return obj.members.count()
+        count = getattr(obj, 'annotated_member_count', None)
+        if count is None:
+            count = obj.members.count()
+        return count
+
+    def get_is_member(self, obj):
+        is_member = getattr(obj, 'viewer_is_member', None)
+        if is_member is None:
+            request = self.context.get('request')
+            if not request or not request.user.is_authenticated:
+                return False
+            is_member = get_clan_role(request, obj).is_member
+        return is_member
 
 
 class ClanDetailSerializer(serializers.ModelSerializer):
@@ -87,8 +101,16 @@ class ClanDetailSerializer(serializers.ModelSerializer):
     boards = serializers.SerializerMethodField()
     join_requests = serializers.SerializerMethodField()
 
+    # 따로 조회가 필요한 섹션 (?fields= / ?expand= 로 선택)
+    SECTIONS = ('owner', 'admins', 'members', 'announcements', 'events', 'boards', 'join_requests')
+
     def __init__(self, *args, **kwargs):
+        # [추가] fields=[...]를 주면 해당 필드만 직렬화 (나머지 섹션은 조회하지 않음)
+        only_fields = kwargs.pop('fields', None)
         super().__init__(*args, **kwargs)
+        if only_fields is not None:
+            for name in set(self.fields) - set(only_fields):
+                self.fields.pop(name)
         instance = kwargs.get('instance') or args[0] if args else None
         if instance and isinstance(instance, Clan):
             if 'context' not in kwargs:
@@ -105,20 +127,29 @@ class ClanDetailSerializer(serializers.ModelSerializer):
         fields = ('id', 'name', 'description', 'created_at', 'owner', 'admins', 'members', 
                   'image', 'announcements', 'events', 'boards', 'join_requests', 'status')
 
+    # (view에서 Prefetch(to_attr=...)로 미리 불러온 목록이 있으면 그대로 사용)
     def get_announcements(self, obj):
-        announcements = obj.announcements.order_by('-created_at')[:5]
+        announcements = getattr(obj, 'latest_announcements', None)
+        if announcements is None:
+            announcements = obj.announcements.order_by('-created_at')[:5]
         return ClanAnnouncementSerializer(announcements, many=True, context=self.context).data
 
     def get_events(self, obj):
-        events = obj.events.order_by('date')[:5] 
+        events = getattr(obj, 'upcoming_events', None)
+        if events is None:
+            events = obj.events.order_by('date')[:5] 
         return ClanEventSerializer(events, many=True, context=self.context).data
     
     def get_boards(self, obj):
-        boards = obj.boards.all()
+        boards = getattr(obj, 'all_boards', None)
+        if boards is None:
+            boards = obj.boards.all()
         return ClanBoardSerializer(boards, many=True, context=self.context).data
     
     def get_join_requests(self, obj):
-        requests = obj.join_requests.filter(status='pending')
+        requests = getattr(obj, 'pending_join_requests', None)
+        if requests is None:
+            requests = obj.join_requests.filter(status='pending')
         return ClanJoinRequestSerializer(requests, many=True).data
 
 
@@ -159,6 +190,12 @@ class ClanEventSerializer(serializers.ModelSerializer):
         }
 
 
+class ClanTimelineEntrySerializer(serializers.ModelSerializer):
+    class Meta:
+        model = ClanTimelineEntry
+        fields = ['id', 'kind', 'object_id', 'actor_nickname', 'title', 'url', 'created_at']
+
+
 class ClanBoardSerializer(serializers.ModelSerializer):
     author_nickname = serializers.ReadOnlyField(source='author.nickname')
 
@@ -0,0 +1,235 @@
+# clan_app/stats.py
+"""
+클랜 통계 롤업 (ClanStatRollup)
+
+멤버 가입/탈퇴, 방 생성/확정/종료, 채팅, 게시글, 가입 신청이 생길 때마다
+해당 시각의 시간별/일별 행에 F() 업데이트로 더합니다.
+통계 API는 Room, ClanChat 등을 집계하지 않고 롤업 행만 읽습니다.
+
+전체 재계산(backfill)은 `python manage.py backfill_clan_stats`
+(가입 시각이 따로 저장되지 않으므로 backfill의 멤버 가입 시각은
+ 승인된 가입 신청 시각, 없으면 클랜 생성 시각으로 추정합니다.)
+"""
+from collections import Counter, defaultdict
+from datetime import datetime, timedelta
+
+from django.db import transaction
+from django.db.models import Count, F
+from django.db.models.functions import TruncDay, TruncHour
+from django.utils import timezone
+
+from room_app.models import Room
+from .models import Clan, ClanBoard, ClanChat, ClanJoinRequest, ClanStatRollup
+
+PERIODS = ('hour', 'day')
+COUNTERS = (
+    'members_joined', 'members_left',
+    'rooms_created', 'rooms_confirmed', 'rooms_ended',
+    'chat_messages', 'board_posts', 'join_requests',
+)
+# 조회 기간 제한 (구간 수 제한)
+MAX_DAYS = {'hour': 31, 'day': 366}
+DEFAULT_DAYS = 30
+
+
+def bucket_start(at, period):
+    at = timezone.localtime(at)
+    if period == 'hour':
+        return at.replace(minute=0, second=0, microsecond=0)
+    return at.replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def _apply(clan_id, deltas):
+    """
+    deltas: {(period, bucket): Counter(counter_name=n)}
+    """
+    deltas = {key: counts for key, counts in deltas.items() if any(counts.values())}
+    if clan_id is None or not deltas:
+        return
+    with transaction.atomic():
+        ClanStatRollup.objects.bulk_create(
+            [ClanStatRollup(clan_id=clan_id, period=period, bucket=bucket) for period, bucket in deltas],
+            ignore_conflicts=True
+        )
+        for (period, bucket), counts in deltas.items():
+            ClanStatRollup.objects.filter(clan_id=clan_id, period=period, bucket=bucket).update(
+                **{name: F(name) + n for name, n in counts.items() if n}
+            )
+
+
+def record_many(clan_id, times, counter):
+    """
+    times의 각 시각마다 counter를 1씩 더함 (채팅 배치 저장 등)
+    """
+    deltas = defaultdict(Counter)
+    for at in times:
+        for period in PERIODS:
+            deltas[(period, bucket_start(at, period))][counter] += 1
+    _apply(clan_id, deltas)
+
+
+def record(clan_id, at=None, **counts):
+    """
+    record(clan.id, rooms_created=1)
+    """
+    at = at or timezone.now()
+    _apply(clan_id, {(period, bucket_start(at, period)): Counter(counts) for period in PERIODS})
+
+
+def record_members(clan_id, joined=0, left=0):
+    """
+    멤버 가입/탈퇴 반영 + 현재 구간의 멤버 수 갱신
+    """
+    if not (joined or left):
+        return
+    now = timezone.now()
+    with transaction.atomic():
+        record(clan_id, at=now, members_joined=joined, members_left=left)
+        member_count = Clan.members.through.objects.filter(clan_id=clan_id).count()
+        ClanStatRollup.objects.filter(
+            clan_id=clan_id,
+            bucket__in=[bucket_start(now, period) for period in PERIODS],
+        ).update(member_count=member_count)
+
+
+def record_room(room, **counts):
+    """
+    클랜 방일 때만 반영 (일반 방은 무시)
+    """
+    if room.clan_id is not None:
+        record(room.clan_id, **counts)
+
+
+# 조회
+# -----------------------------------------------------------------
+
+def parse_stats_params(query_params):
+    """
+    ?period=day&start=2025-11-01&end=2025-11-30 (둘 다 포함)
+    -> (period, start, end) (잘못된 값이면 ValueError)
+    """
+    period = query_params.get('period', 'day')
+    if period not in PERIODS:
+        raise ValueError("period는 hour 또는 day여야 합니다.")
+
+    today = timezone.localdate()
+    try:
+        end = datetime.strptime(query_params['end'], '%Y-%m-%d').date() if query_params.get('end') else today
+        start = (
+            datetime.strptime(query_params['start'], '%Y-%m-%d').date() if query_params.get('start')
+            else end - timedelta(days=min(DEFAULT_DAYS, MAX_DAYS[period]) - 1)
+        )
+    except ValueError:
+        raise ValueError("start, end는 YYYY-MM-DD 형식이어야 합니다.")
+
+    if end < start:
+        raise ValueError("end는 start보다 빠를 수 없습니다.")
+    if (end - start).days >= MAX_DAYS[period]:
+        raise ValueError(f"{period} 통계의 조회 기간은 최대 {MAX_DAYS[period]}일입니다.")
+    return period, start, end
+
+
+def stats_series(clan_id, period, start, end):
+    """
+    return: {"period", "series": [구간별 값], "totals": {...}}
+    롤업 행이 없는 구간은 0으로 채우고, 멤버 수는 이전 구간 값을 이어 씁니다.
+    """
+    start_at = timezone.make_aware(datetime.combine(start, datetime.min.time()))
+    end_at = timezone.make_aware(datetime.combine(end + timedelta(days=1), datetime.min.time()))
+    rows = {
+        row['bucket']: row for row in ClanStatRollup.objects.filter(
+            clan_id=clan_id, period=period, bucket__gte=start_at, bucket__lt=end_at
+        ).values('bucket', 'member_count', *COUNTERS)
+    }
+    member_count = ClanStatRollup.objects.filter(
+        clan_id=clan_id, period=period, bucket__lt=start_at, member_count__isnull=False
+    ).order_by('-bucket').values_list('member_count', flat=True).first() or 0
+
+    step = timedelta(hours=1) if period == 'hour' else timedelta(days=1)
+    series = []
+    totals = Counter()
+    bucket = start_at
+    while bucket < end_at:
+        row = rows.get(bucket) or {}
+        if row.get('member_count') is not None:
+            member_count = row['member_count']
+        point = {name: row.get(name, 0) for name in COUNTERS}
+        totals.update(point)
+        series.append({"bucket": bucket, "member_count": member_count, **point})
+        bucket += step
+
+    return {
+        "period": period,
+        "start": start,
+        "end": end,
+        "series": series,
+        "totals": {name: totals[name] for name in COUNTERS},
+    }
+
+
+# 전체 재계산
+# -----------------------------------------------------------------
+
+def _count_by_bucket(queryset, field, trunc):
+    return queryset.annotate(b=trunc(field)).values_list('clan_id', 'b').annotate(n=Count('id')).order_by()
+
+
+def _member_join_times(clan_ids):
+    """
+    clan_id -> [현재 멤버의 (추정) 가입 시각]
+    """
+    approved = {
+        (clan_id, user_id): at for clan_id, user_id, at in ClanJoinRequest.objects.filter(
+            clan_id__in=clan_ids, status='approved'
+        ).values_list('clan_id', 'user_id', 'requested_at')
+    }
+    created = dict(Clan.objects.filter(id__in=clan_ids).values_list('id', 'created_at'))
+
+    joins = defaultdict(list)
+    memberships = Clan.members.through.objects.filter(clan_id__in=clan_ids).values_list('clan_id', 'user_id')
+    for clan_id, user_id in memberships:
+        joins[clan_id].append(approved.get((clan_id, user_id), created[clan_id]))
+    return joins
+
+
+@transaction.atomic
+def backfill(clan_ids=None):
+    """
+    원본 테이블로부터 ClanStatRollup을 다시 만듭니다.
+    return: 생성한 행 수
+    """
+    if clan_ids is None:
+        clan_ids = list(Clan.objects.values_list('id', flat=True))
+    clan_ids = list(clan_ids)
+    ClanStatRollup.objects.filter(clan_id__in=clan_ids).delete()
+
+    sources = [
+        ('rooms_created', Room.objects.filter(clan_id__in=clan_ids), 'created_at'),
+        ('rooms_confirmed', Room.objects.filter(clan_id__in=clan_ids, confirmed_at__isnull=False), 'confirmed_at'),
+        ('rooms_ended', Room.objects.filter(clan_id__in=clan_ids, ended_at__isnull=False), 'ended_at'),
+        ('chat_messages', ClanChat.objects.filter(clan_id__in=clan_ids), 'timestamp'),
+        ('board_posts', ClanBoard.objects.filter(clan_id__in=clan_ids), 'created_at'),
+        ('join_requests', ClanJoinRequest.objects.filter(clan_id__in=clan_ids), 'requested_at'),
+    ]
+    join_times = _member_join_times(clan_ids)
+
+    rollups = []
+    for period, trunc in (('hour', TruncHour), ('day', TruncDay)):
+        rows = defaultdict(Counter)  # (clan_id, bucket) -> counts
+        for name, queryset, field in sources:
+            for clan_id, bucket, n in _count_by_bucket(queryset, field, trunc):
+                rows[(clan_id, bucket)][name] += n
+        for clan_id, times in join_times.items():
+            for at in times:
+                rows[(clan_id, bucket_start(at, period))]['members_joined'] += 1
+
+        member_counts = Counter()
+        for (clan_id, bucket), counts in sorted(rows.items()):
+            rollup = ClanStatRollup(clan_id=clan_id, period=period, bucket=bucket, **counts)
+            if counts['members_joined']:
+                member_counts[clan_id] += counts['members_joined']
+                rollup.member_count = member_counts[clan_id]
+            rollups.append(rollup)
+
+    ClanStatRollup.objects.bulk_create(rollups, batch_size=1000)
+    return len(rollups)
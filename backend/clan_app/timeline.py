@@ -0,0 +1,123 @@
+# clan_app/timeline.py
+"""
+클랜 새 소식 타임라인 (ClanTimelineEntry)
+
+공지/일정/게시글/클랜 방/가입 승인이 생성될 때 (쓰기 시점에) 타임라인 행을 추가하고,
+클랜 홈은 공지, 일정, 게시판, 방, 채팅을 각각 조회하지 않고 타임라인만 읽습니다.
+
+조회는 id 기준 keyset 페이지네이션: ?before=<마지막으로 받은 id>
+(OFFSET 없이 (clan, -id) 인덱스 범위만 읽음)
+전체 재생성은 `python manage.py rebuild_clan_timeline`
+"""
+from datetime import datetime
+
+from django.db import transaction
+from django.utils import timezone
+
+from room_app.models import Room
+from .models import ClanAnnouncement, ClanBoard, ClanEvent, ClanJoinRequest, ClanTimelineEntry
+
+DEFAULT_LIMIT = 20
+MAX_LIMIT = 100
+
+
+def _clan_url(clan_id, kind):
+    if kind == 'room':
+        return f"/clans/{clan_id}/rooms"
+    return f"/clans/{clan_id}"
+
+
+def _entry(clan_id, kind, object_id, actor=None, title="", created_at=None):
+    entry = ClanTimelineEntry(
+        clan_id=clan_id,
+        kind=kind,
+        object_id=object_id,
+        actor=actor,
+        actor_nickname=getattr(actor, 'nickname', '') or '',
+        title=(title or '')[:255],
+        url=_clan_url(clan_id, kind),
+    )
+    if created_at is not None:
+        entry.created_at = created_at
+    return entry
+
+
+def add(clan_id, kind, object_id, actor=None, title=""):
+    if clan_id is None:
+        return
+    _entry(clan_id, kind, object_id, actor, title).save()
+
+
+def add_members(clan_id, users):
+    """
+    가입 승인된 유저들 (bulk)
+    """
+    ClanTimelineEntry.objects.bulk_create([
+        _entry(clan_id, 'member', user.id, user, f"{user.nickname}님이 가입했습니다.") for user in users
+    ])
+
+
+def remove(clan_id, kind, object_id):
+    """
+    원본이 삭제된 경우 (깨진 링크가 남지 않도록)
+    """
+    ClanTimelineEntry.objects.filter(clan_id=clan_id, kind=kind, object_id=object_id).delete()
+
+
+def parse_feed_params(query_params):
+    """
+    ?before=<id>&limit=20 -> (before, limit) (잘못된 값이면 ValueError)
+    """
+    try:
+        before = int(query_params['before']) if query_params.get('before') else None
+        limit = int(query_params.get('limit', DEFAULT_LIMIT))
+    except ValueError:
+        raise ValueError("before, limit은 정수여야 합니다.")
+    return before, max(1, min(limit, MAX_LIMIT))
+
+
+def feed_page(clan_id, before=None, limit=DEFAULT_LIMIT):
+    """
+    return: (entries, next_before) - 쿼리 1번 (limit + 1개를 읽어 다음 페이지 여부 확인)
+    """
+    queryset = ClanTimelineEntry.objects.filter(clan_id=clan_id)
+    if before is not None:
+        queryset = queryset.filter(id__lt=before)
+    entries = list(queryset.order_by('-id')[:limit + 1])
+    if len(entries) > limit:
+        entries = entries[:limit]
+        return entries, entries[-1].id
+    return entries, None
+
+
+@transaction.atomic
+def rebuild_timeline(clan_ids):
+    """
+    원본 테이블로부터 타임라인을 다시 만듭니다. (생성 시각 순으로 id 부여)
+    return: 생성한 행 수
+    """
+    clan_ids = list(clan_ids)
+    ClanTimelineEntry.objects.filter(clan_id__in=clan_ids).delete()
+
+    entries = []
+    for item in ClanAnnouncement.objects.filter(clan_id__in=clan_ids).select_related('author'):
+        entries.append(_entry(item.clan_id, 'announcement', item.id, item.author, item.title, item.created_at))
+    now = timezone.now()
+    for item in ClanEvent.objects.filter(clan_id__in=clan_ids).select_related('creator'):
+        # 일정은 생성 시각이 없으므로 일정 날짜 기준 (미래 일정은 지금 시각으로)
+        created_at = min(timezone.make_aware(datetime.combine(item.date, datetime.min.time())), now)
+        entries.append(_entry(item.clan_id, 'event', item.id, item.creator, item.title, created_at))
+    for item in ClanBoard.objects.filter(clan_id__in=clan_ids).select_related('author'):
+        entries.append(_entry(item.clan_id, 'board', item.id, item.author, item.title, item.created_at))
+    for item in Room.objects.filter(clan_id__in=clan_ids):
+        entries.append(_entry(item.clan_id, 'room', item.id, None, item.title, item.created_at))
+        entries[-1].actor_nickname = item.manager_nickname
+    for item in ClanJoinRequest.objects.filter(clan_id__in=clan_ids, status='approved').select_related('user'):
+        entries.append(_entry(
+            item.clan_id, 'member', item.user_id, item.user,
+            f"{item.user.nickname}님이 가입했습니다.", item.requested_at,
+        ))
+
+    entries.sort(key=lambda entry: entry.created_at)
+    ClanTimelineEntry.objects.bulk_create(entries, batch_size=1000)
+    return len(entries)
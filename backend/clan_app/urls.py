@@ -24,6 +24,9 @@ urlpatterns = [
     # Removed duplicate path
 
 
+    # (POST) /api/v1/clans/<int:clan_id>/membership/  - 승인/거절/강퇴/임명/해제 일괄 처리
+    path('<int:clan_id>/membership/', views.ClanMembershipBulkView.as_view(), name='clan-membership-bulk'),
+
     # (DELETE) /api/v1/clans/<int:clan_id>/members/<str:nickname>/
     path('<int:clan_id>/members/<str:nickname>/', views.ClanKickMemberView.as_view(), name='clan-kick-member'),
     
@@ -46,14 +49,29 @@ urlpatterns = [
     path('<int:pk>/dashboard/', views.ClanRoomDashboardView.as_view(), name='clan-room-dashboard'),
     # ▲▲▲ [신규] ▲▲▲
     
+    # (GET) /api/v1/clans/<int:pk>/availability/best/
+    path('<int:pk>/availability/best/', views.ClanBestTimeView.as_view(), name='clan-availability-best'),
+
     # (GET) /api/v1/clans/<int:pk>/activity/
     path('<int:pk>/activity/', views.ClanMemberActivityAPIView.as_view(), name='clan-activity'),
 
+    # (GET) /api/v1/clans/<int:pk>/feed/?before=<id>
+    path('<int:pk>/feed/', views.ClanTimelineView.as_view(), name='clan-feed'),
+
+    # (GET) /api/v1/clans/<int:pk>/stats/?period=day
+    path('<int:pk>/stats/', views.ClanStatsView.as_view(), name='clan-stats'),
+
     # (GET, POST) /api/v1/clans/<int:clan_id>/announcements/
     path('<int:clan_id>/announcements/', views.ClanAnnouncementListCreateView.as_view(), name='clan-announcements'),
     
     # (GET, POST) /api/v1/clans/<int:clan_id>/events/
     path('<int:clan_id>/events/', views.ClanEventListCreateView.as_view(), name='clan-events'),
+
+    # (GET) /api/v1/clans/calendar/  - 내 캘린더 (모든 클랜 일정 + 확정 합주방)
+    path('calendar/', views.UserCalendarView.as_view(), name='clan-calendar'),
+
+    # (GET) /api/v1/clans/calendar/feed.ics?token=...  - iCal 구독 피드
+    path('calendar/feed.ics', views.UserCalendarFeedView.as_view(), name='clan-calendar-feed'),
     
     # (GET, POST) /api/v1/clans/<int:clan_id>/boards/
     # (GET, POST) /api/v1/clans/<int:clan_id>/boards/
@@ -3,6 +3,10 @@
 from django.shortcuts import get_object_or_404
 from django.utils import timezone
 from django.db import transaction
+from django.db.models import Prefetch
+from django.http import HttpResponseForbidden, HttpResponseNotModified, StreamingHttpResponse
+from django.urls import reverse
+from django.views import View
 
 from rest_framework import generics, permissions, viewsets, status
 from rest_framework.views import APIView
@@ -13,6 +17,7 @@ from rest_framework.response import Response
 
 from user_app.models import Alert
 from user_app.models import User
+from user_app.serializers import UserBaseSerializer
 from .models import (
     Clan, ClanJoinRequest, ClanChat, 
     ClanBoard, ClanAnnouncement, ClanEvent
@@ -23,12 +28,19 @@ from .serializers import (
     ClanSerializer, ClanDetailSerializer, ClanJoinRequestSerializer, 
     ClanChatSerializer, ClanBoardSerializer, ClanAnnouncementSerializer, 
     ClanEventSerializer, ClanMemberSerializer,
-    MemberActivitySerializer, RoomLatestActivitySerializer # <-- 이 2줄
+    MemberActivitySerializer, RoomLatestActivitySerializer, # <-- 이 2줄
+    ClanTimelineEntrySerializer
 )
 from room_app.models import Room, Session
+from room_app.scheduling import parse_solver_params, solve_rooms
+from room_app.versioning import bump_room_version
+from . import activity, calendar_feed, membership, stats, timeline
+from .chat_buffer import clan_chat_history
+from config.chat_history import parse_history_params
 # [오류 수정] room_app.serializers에서는 RoomInfoForActivitySerializer만 가져옴
 from room_app.serializers import (RoomInfoForActivitySerializer, RoomListSerializer) 
 from .permission import IsClanOwner, IsClanOwnerOrReadOnly, IsClanMember, IsClanOwnerOrAdmin
+from .roles import annotate_clan_list, get_clan_role
 
 # 1. Clan
 # -----------------------------------------------------------------
@@ -45,19 +57,21 @@ class ClanListCreateAPIView(generics.ListCreateAPIView):
     def get_queryset(self):
         from django.db.models import Q
         user = self.request.user
+        # [수정] 멤버 수 / 내 가입 여부는 서브쿼리로 함께 조회
+        queryset = annotate_clan_list(Clan.objects.select_related('owner'), user)
         
         # 1. 비로그인 유저: 활성 클랜만
         if not user.is_authenticated:
-            return Clan.objects.filter(status='active').order_by('-created_at')
+            return queryset.filter(status='active').order_by('-created_at')
             
         # 2. 운영자: 모든 클랜 (대기 포함)
         if hasattr(user, 'role') and user.role == 'OPERATOR':
-            return Clan.objects.all().order_by('-created_at')
+            return queryset.order_by('-created_at')
             
         # 3. 일반 유저: 활성 클랜 + 내가 만든 클랜(대기중 포함)
-        return Clan.objects.filter(
+        return queryset.filter(
             Q(status='active') | Q(owner=user)
-        ).distinct().order_by('-created_at')
+        ).order_by('-created_at')
 
     def perform_create(self, serializer):
         # 1. 클랜 생성 (status='pending'은 모델 디폴트)
@@ -83,11 +97,115 @@ class ClanDetailAPIView(generics.RetrieveUpdateDestroyAPIView):
     """
     (GET) /api/v1/clans/<int:pk>/
     (PATCH, DELETE) /api/v1/clans/<int:pk>/
+
+    [추가] 필요한 섹션만 조회 (파라미터가 없으면 기존과 동일한 전체 응답)
+    - ?fields=id,name,members : 나열한 필드만
+    - ?expand=members,events  : 기본 정보 + 나열한 섹션
+    - 이 모드에서 members는 페이지 단위 (?members_page=1&members_page_size=100)
+      + members_page: {count, page, page_size, has_next}
     """
     queryset = Clan.objects.all()
     serializer_class = ClanDetailSerializer
     permission_classes = [IsClanOwnerOrReadOnly] # GET은 누구나, 수정/삭제는 방장만
 
+    BASE_FIELDS = ('id', 'name', 'description', 'created_at', 'image', 'status')
+    MEMBERS_PAGE_SIZE = 100
+    MAX_MEMBERS_PAGE_SIZE = 500
+
+    def _param_list(self, name):
+        value = self.request.query_params.get(name)
+        if value is None:
+            return None
+        return {item.strip() for item in value.split(',') if item.strip()}
+
+    def get_requested_fields(self):
+        """
+        return: None (기존 전체 응답) 또는 응답할 필드 집합
+        """
+        if self.request.method != 'GET':
+            return None
+        fields = self._param_list('fields')
+        expand = self._param_list('expand')
+        if fields is None and expand is None:
+            return None
+
+        requested = set(fields) if fields is not None else set(self.BASE_FIELDS)
+        requested |= expand or set()
+        requested.add('id')
+        return requested
+
+    def get_queryset(self):
+        queryset = Clan.objects.all()
+        if self.request.method != 'GET':
+            return queryset
+
+        requested = self.get_requested_fields()
+        sections = set(ClanDetailSerializer.SECTIONS) if requested is None else requested
+
+        # 요청된 섹션만 한 번에 미리 조회
+        if 'owner' in sections:
+            queryset = queryset.select_related('owner')
+        if 'admins' in sections:
+            queryset = queryset.prefetch_related('admins')
+        if 'members' in sections and requested is None:
+            queryset = queryset.prefetch_related('members')
+        if 'announcements' in sections:
+            queryset = queryset.prefetch_related(Prefetch(
+                'announcements',
+                queryset=ClanAnnouncement.objects.select_related('author').order_by('-created_at')[:5],
+                to_attr='latest_announcements',
+            ))
+        if 'events' in sections:
+            queryset = queryset.prefetch_related(Prefetch(
+                'events',
+                queryset=ClanEvent.objects.select_related('creator').order_by('date')[:5],
+                to_attr='upcoming_events',
+            ))
+        if 'boards' in sections:
+            queryset = queryset.prefetch_related(Prefetch(
+                'boards',
+                queryset=ClanBoard.objects.select_related('author'),
+                to_attr='all_boards',
+            ))
+        if 'join_requests' in sections:
+            queryset = queryset.prefetch_related(Prefetch(
+                'join_requests',
+                queryset=ClanJoinRequest.objects.filter(status='pending').select_related('user'),
+                to_attr='pending_join_requests',
+            ))
+        return queryset
+
+    def retrieve(self, request, *args, **kwargs):
+        requested = self.get_requested_fields()
+        if requested is None:
+            return super().retrieve(request, *args, **kwargs)
+
+        instance = self.get_object()
+        serializer = self.get_serializer(instance, fields=requested - {'members'})
+        data = serializer.data
+        if 'members' in requested:
+            try:
+                page = max(int(request.query_params.get('members_page', 1)), 1)
+                page_size = int(request.query_params.get('members_page_size', self.MEMBERS_PAGE_SIZE))
+            except ValueError:
+                return Response({"detail": "members_page, members_page_size는 정수여야 합니다."},
+                                status=status.HTTP_400_BAD_REQUEST)
+            page_size = max(1, min(page_size, self.MAX_MEMBERS_PAGE_SIZE))
+
+            members = instance.members.order_by('nickname')
+            count = members.count()
+            offset = (page - 1) * page_size
+            data['members'] = UserBaseSerializer(
+                members[offset:offset + page_size], many=True, context=self.get_serializer_context()
+            ).data
+            data['members_page'] = {
+                "count": count,
+                "page": page,
+                "page_size": page_size,
+                "has_next": offset + page_size < count,
+            }
+        return Response(data)
+
 # 1.5. Clan Management (Operator Only)
 # -----------------------------------------------------------------
 class ClanManagementView(APIView):
@@ -110,8 +228,10 @@ class ClanManagementView(APIView):
         if request.user.role != 'OPERATOR':
             return Response({"detail": "권한이 없습니다."}, status=status.HTTP_403_FORBIDDEN)
             
-        pending_clans = Clan.objects.filter(status='pending').order_by('created_at')
-        serializer = ClanSerializer(pending_clans, many=True)
+        pending_clans = annotate_clan_list(
+            Clan.objects.filter(status='pending').select_related('owner'), request.user
+        ).order_by('created_at')
+        serializer = ClanSerializer(pending_clans, many=True, context={'request': request})
         return Response(serializer.data)
 
 class ClanApproveView(APIView):
@@ -129,6 +249,7 @@ class ClanApproveView(APIView):
         # 승인 시, 만드는 사람(owner)을 멤버로 추가
         clan.members.add(clan.owner)
         clan.save()
+        stats.record_members(clan.id, joined=1)
         
         # 알림 전송
         try:
@@ -179,13 +300,14 @@ class ClanJoinRequestCreateView(APIView):
         clan = get_object_or_404(Clan, pk=pk)
         user = request.user
 
-        if clan.members.filter(id=user.id).exists():
+        if get_clan_role(request, clan).is_member:
             return Response({"detail": "이미 클랜 멤버입니다."}, status=status.HTTP_400_BAD_REQUEST)
         
         if ClanJoinRequest.objects.filter(clan=clan, user=user, status="pending").exists():
             return Response({"detail": "이미 가입 신청 대기 중입니다."}, status=status.HTTP_400_BAD_REQUEST)
 
         ClanJoinRequest.objects.create(clan=clan, user=user)
+        stats.record(clan.id, join_requests=1)
         # ▼▼▼ [수정] TODO를 알림 생성 코드로 변경 ▼▼▼
         try:
             Alert.objects.create(
@@ -221,6 +343,9 @@ class ClanJoinRequestActionView(APIView):
         if action == "approve":
             req.status = "approved"
             clan.members.add(req.user)
+            activity.invalidate(clan.id)
+            stats.record_members(clan.id, joined=1)
+            timeline.add_members(clan.id, [req.user])
             # ▼▼▼ [수정] 'TODO'를 'Alert' 생성 코드로 변경 ▼▼▼
             try:
                 Alert.objects.create(
@@ -265,13 +390,16 @@ class ClanKickMemberView(APIView):
         
         user_to_kick = get_object_or_404(User, nickname=nickname)
 
-        if clan.owner == user_to_kick:
+        target_role = get_clan_role(request, clan, user=user_to_kick)
+        if target_role.is_owner:
             return Response({"detail": "클랜장은 강퇴할 수 없습니다."}, status=status.HTTP_400_BAD_REQUEST)
             
-        if not clan.members.filter(id=user_to_kick.id).exists():
+        if not target_role.is_member:
             return Response({"detail": "클랜 멤버가 아닙니다."}, status=status.HTTP_400_BAD_REQUEST)
 
         clan.members.remove(user_to_kick)
+        activity.invalidate(clan.id)
+        stats.record_members(clan.id, left=1)
                 # ▼▼▼ [추가] 강퇴 알림 ▼▼▼
         try:
             Alert.objects.create(
@@ -296,10 +424,11 @@ class ClanPromoteMemberView(APIView):
         
         user = get_object_or_404(User, pk=user_id)
         
-        if not clan.members.filter(id=user.id).exists():
+        target_role = get_clan_role(request, clan, user=user)
+        if not target_role.is_member:
             return Response({"detail": "클랜 멤버가 아닙니다."}, status=status.HTTP_400_BAD_REQUEST)
             
-        if clan.admins.filter(id=user.id).exists():
+        if target_role.is_admin:
              return Response({"detail": "이미 간부(운영진)입니다."}, status=status.HTTP_400_BAD_REQUEST)
              
         clan.admins.add(user)
@@ -318,7 +447,7 @@ class ClanDemoteMemberView(APIView):
         
         user = get_object_or_404(User, pk=user_id)
         
-        if not clan.admins.filter(id=user.id).exists():
+        if not get_clan_role(request, clan, user=user).is_admin:
              return Response({"detail": "운영진이 아닙니다."}, status=status.HTTP_400_BAD_REQUEST)
              
         clan.admins.remove(user)
@@ -329,47 +458,42 @@ class ClanApproveAllView(APIView):
     """
     (POST) /api/v1/clans/<int:pk>/approve-all/
     클랜 가입 일괄 승인
+    [수정] 신청마다 반복하지 않고 membership.apply_membership_actions로 한 번에 처리
     """
     permission_classes = [IsClanOwner] # 클랜장만 가능
 
-    @transaction.atomic
     def post(self, request, pk):
         clan = get_object_or_404(Clan, pk=pk)
         self.check_object_permissions(request, clan) # 클랜장인지 확인
-        
-        pending_requests = ClanJoinRequest.objects.filter(clan=clan, status="pending")
-        
-        if not pending_requests.exists():
+
+        applied, _ = membership.apply_membership_actions(clan, {'approve': 'all'})
+        if not applied['approve']:
             return Response({"detail": "새로운 가입 신청이 없습니다."}, status=status.HTTP_400_BAD_REQUEST)
-            
-        users_to_add = []
-        alerts_to_create = [] # [추가] 알림 목록 준비
 
-        for req in pending_requests:
-            req.status = "approved"
-            users_to_add.append(req.user)
-             # ▼▼▼ [수정] 'TODO'를 'Alert' 생성 코드로 변경 (bulk create 준비) ▼▼▼
-            alerts_to_create.append(
-                Alert(
-                    user=req.user,
-                    message=f"'{clan.name}' 클랜 가입이 승인되었습니다!",
-                    link_url=f"/clans/{clan.id}/"
-                )
-            )
-            # ▲▲▲ [수정] ▲▲▲
+        return Response({"detail": f"{len(applied['approve'])}명의 가입을 일괄 승인했습니다."}, status=status.HTTP_200_OK)
+
+
+class ClanMembershipBulkView(APIView):
+    """
+    (POST) /api/v1/clans/<int:clan_id>/membership/
+    가입 승인/거절, 강퇴, 운영진 임명/해제를 여러 명에게 한 번에 적용 (한 트랜잭션)
+    body: {"approve": [user_id, ...] 또는 "all", "reject": [...], "kick": [...],
+           "promote": [...], "demote": [...]}
+    response: {"applied": {action: [user_id]}, "skipped": {action: [user_id]}}
+    """
+    permission_classes = [IsClanOwner] # 클랜장만 가능
+
+    def post(self, request, clan_id):
+        clan = get_object_or_404(Clan, pk=clan_id)
+        self.check_object_permissions(request, clan) # 클랜장인지 확인
 
-        # 1. 멤버 일괄 추가
-        clan.members.add(*users_to_add)
-        # 2. 신청서 일괄 업데이트
-        ClanJoinRequest.objects.bulk_update(pending_requests, ['status'])
-         # ▼▼▼ [추가] 알림 일괄 생성 (DB 효율성) ▼▼▼
         try:
-            Alert.objects.bulk_create(alerts_to_create)
-        except Exception as e:
-            print(f"Error bulk creating alerts: {e}")
-        # ▲▲▲ [추가] ▲▲▲
+            actions = membership.parse_membership_actions(request.data)
+        except ValueError as e:
+            return Response({"detail": str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
-        return Response({"detail": f"{len(users_to_add)}명의 가입을 일괄 승인했습니다."}, status=status.HTTP_200_OK)
+        applied, skipped = membership.apply_membership_actions(clan, actions)
+        return Response({"applied": applied, "skipped": skipped}, status=status.HTTP_200_OK)
 
 
 # 3. Clan Management (3순위)
@@ -385,15 +509,16 @@ class ClanAnnouncementListCreateView(generics.ListCreateAPIView):
 
     def get_queryset(self):
         clan = get_object_or_404(Clan, pk=self.kwargs['clan_id'])
-        if clan.owner != self.request.user and not clan.members.filter(id=self.request.user.id).exists():
+        if not get_clan_role(self.request, clan).has_access:
              raise PermissionDenied("클랜 멤버만 조회할 수 있습니다.")
         return ClanAnnouncement.objects.filter(clan=clan).order_by('-created_at')
 
     def perform_create(self, serializer):
         clan = get_object_or_404(Clan, pk=self.kwargs['clan_id'])
-        if clan.owner != self.request.user:
+        if not get_clan_role(self.request, clan).is_owner:
             raise PermissionDenied("공지사항은 클랜장만 작성할 수 있습니다.")
-        serializer.save(clan=clan, author=self.request.user)
+        announcement = serializer.save(clan=clan, author=self.request.user)
+        timeline.add(clan.id, 'announcement', announcement.id, self.request.user, announcement.title)
         # ▼▼▼ [수정] TODO를 '새 공지' 알림 코드로 변경 ▼▼▼
         try:
             clan_members = clan.members.exclude(id=self.request.user.id) # 작성자 제외
@@ -415,38 +540,85 @@ class ClanAnnouncementListCreateView(generics.ListCreateAPIView):
 class ClanEventListCreateView(generics.ListCreateAPIView):
     """
     (GET, POST) /api/v1/clans/<int:clan_id>/events/
+    (GET) /api/v1/clans/<int:clan_id>/events/?start=2025-11-01&end=2025-11-30
+    (GET) /api/v1/clans/<int:clan_id>/events/?year=2025&month=11
     클랜 캘린더 이벤트
+    [수정] date__year/date__month 대신 날짜 범위로 조회 (기간 최대 366일)
     """
     serializer_class = ClanEventSerializer
     permission_classes = [permissions.IsAuthenticated] # 멤버만 조회/생성 가능
 
     def get_queryset(self):
         clan = get_object_or_404(Clan, pk=self.kwargs['clan_id'])
-        if clan.owner != self.request.user and not clan.members.filter(id=self.request.user.id).exists():
+        if not get_clan_role(self.request, clan).has_access:
              raise PermissionDenied("클랜 멤버만 조회할 수 있습니다.")
-        
-        # 쿼리 파라미터로 월별 필터링 (예: ?year=2025&month=11)
-        year = self.request.query_params.get('year')
-        month = self.request.query_params.get('month')
-        
-        queryset = ClanEvent.objects.filter(clan=clan)
-        
-        if year and month:
-            try:
-                queryset = queryset.filter(
-                    date__year=int(year),
-                    date__month=int(month)
-                )
-            except ValueError:
-                pass # 잘못된 값이면 무시
-                
-        return queryset.order_by('date', 'time')
+
+        start, end = self.date_range
+        return calendar_feed.clan_events([clan.id], start, end).select_related('creator')
+
+    def list(self, request, *args, **kwargs):
+        try:
+            self.date_range = calendar_feed.parse_date_range(request.query_params)
+        except ValueError as e:
+            return Response({"detail": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        return super().list(request, *args, **kwargs)
 
     def perform_create(self, serializer):
         clan = get_object_or_404(Clan, pk=self.kwargs['clan_id'])
-        if clan.owner != self.request.user and not clan.members.filter(id=self.request.user.id).exists():
+        if not get_clan_role(self.request, clan).has_access:
             raise PermissionDenied("클랜 멤버만 이벤트를 생성할 수 있습니다.")
-        serializer.save(clan=clan, creator=self.request.user)
+        event = serializer.save(clan=clan, creator=self.request.user)
+        timeline.add(clan.id, 'event', event.id, self.request.user, event.title)
+
+
+class UserCalendarView(APIView):
+    """
+    (GET) /api/v1/clans/calendar/?start=2025-11-01&end=2025-11-30
+    내 캘린더: 가입한 모든 클랜의 일정 + 참여한 확정 합주방
+    feed_url: 캘린더 앱 구독용 iCal 주소
+    """
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request):
+        try:
+            start, end = calendar_feed.parse_date_range(request.query_params)
+        except ValueError as e:
+            return Response({"detail": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        feed_url = request.build_absolute_uri(reverse('clan-calendar-feed'))
+        return Response({
+            "start": start,
+            "end": end,
+            "entries": calendar_feed.user_calendar(request.user, start, end),
+            "feed_url": f"{feed_url}?token={calendar_feed.make_feed_token(request.user)}",
+        })
+
+
+class UserCalendarFeedView(View):
+    """
+    (GET) /api/v1/clans/calendar/feed.ics?token=<feed token>
+    내 캘린더 iCalendar 피드 (ETag / If-None-Match 지원)
+    캘린더 앱은 JWT를 보내지 않으므로 DRF 인증 대신 서명된 토큰을 사용합니다.
+    """
+    def get(self, request):
+        user_id = calendar_feed.read_feed_token(request.GET.get('token', ''))
+        user = User.objects.filter(pk=user_id, is_active=True).first() if user_id else None
+        if user is None:
+            return HttpResponseForbidden("유효하지 않은 캘린더 토큰입니다.")
+
+        start, end = calendar_feed.feed_range()
+        etag = calendar_feed.feed_etag(user, start, end)
+        if etag in request.headers.get('If-None-Match', ''):
+            response = HttpResponseNotModified()
+        else:
+            response = StreamingHttpResponse(
+                calendar_feed.iter_ical(user, start, end),
+                content_type='text/calendar; charset=utf-8',
+            )
+            response['Content-Disposition'] = 'inline; filename="bandicon.ics"'
+        response['ETag'] = etag
+        response['Cache-Control'] = 'private, no-cache'
+        return response
 
 
 class ClanBoardListCreateView(generics.ListCreateAPIView):
@@ -459,15 +631,17 @@ class ClanBoardListCreateView(generics.ListCreateAPIView):
 
     def get_queryset(self):
         clan = get_object_or_404(Clan, pk=self.kwargs['clan_id'])
-        if clan.owner != self.request.user and not clan.members.filter(id=self.request.user.id).exists():
+        if not get_clan_role(self.request, clan).has_access:
              raise PermissionDenied("클랜 멤버만 조회할 수 있습니다.")
         return ClanBoard.objects.filter(clan=clan).order_by('-created_at')
 
     def perform_create(self, serializer):
         clan = get_object_or_404(Clan, pk=self.kwargs['clan_id'])
-        if clan.owner != self.request.user and not clan.members.filter(id=self.request.user.id).exists():
+        if not get_clan_role(self.request, clan).has_access:
             raise PermissionDenied("클랜 멤버만 게시글을 작성할 수 있습니다.")
-        serializer.save(clan=clan, author=self.request.user)
+        board = serializer.save(clan=clan, author=self.request.user)
+        stats.record(clan.id, board_posts=1)
+        timeline.add(clan.id, 'board', board.id, self.request.user, board.title)
 
 # 4. Clan Activity
 # -----------------------------------------------------------------
@@ -475,22 +649,41 @@ class ClanBoardListCreateView(generics.ListCreateAPIView):
 class ClanChatListView(generics.ListCreateAPIView):
     """
     (GET, POST) /api/v1/clans/<int:clan_id>/chat/
-    클랜 채팅
+    (GET) /api/v1/clans/<int:clan_id>/chat/?before=<timestamp>&limit=50
+    클랜 채팅 (최신순, 최근 메시지는 링 버퍼에서 응답)
     """
     serializer_class = ClanChatSerializer
     permission_classes = [permissions.IsAuthenticated]
+    MAX_LIMIT = 100
 
     def get_queryset(self):
         clan = get_object_or_404(Clan, pk=self.kwargs['clan_id'])
-        if not clan.members.filter(id=self.request.user.id).exists():
+        if not get_clan_role(self.request, clan).is_member:
              raise PermissionDenied("클랜 멤버만 조회할 수 있습니다.")
         return ClanChat.objects.filter(clan=clan).order_by('-timestamp')[:50] # 최신 50개
 
+    def list(self, request, *args, **kwargs):
+        role = get_clan_role(request, self.kwargs['clan_id'])
+        if not role.exists:
+            return Response({"detail": "클랜을 찾을 수 없습니다."}, status=status.HTTP_404_NOT_FOUND)
+        if not role.is_member:
+             raise PermissionDenied("클랜 멤버만 조회할 수 있습니다.")
+
+        try:
+            before, limit = parse_history_params(request.query_params, max_limit=self.MAX_LIMIT)
+        except ValueError as e:
+            return Response({"detail": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        messages = clan_chat_history.recent(role.clan_id, limit, before=before)
+        return Response(self.get_serializer(messages, many=True).data)
+
     def perform_create(self, serializer):
         clan = get_object_or_404(Clan, pk=self.kwargs['clan_id'])
-        if not clan.members.filter(id=self.request.user.id).exists():
+        if not get_clan_role(self.request, clan).is_member:
             raise PermissionDenied("클랜 멤버만 채팅을 보낼 수 있습니다.")
-        serializer.save(clan=clan, sender=self.request.user)
+        chat = serializer.save(clan=clan, sender=self.request.user)
+        stats.record(clan.id, at=chat.timestamp, chat_messages=1)
+        transaction.on_commit(lambda: clan_chat_history.append(clan.id, chat))
         # TODO: (WebSocket/FCM) 클랜 멤버에게 실시간 전송
 
 
@@ -537,7 +730,7 @@ class ClanRoomListAPIView(generics.ListCreateAPIView): # [수정] ListCreateAPIV
         clan = get_object_or_404(Clan, pk=self.kwargs['pk'])
         
         # 멤버 확인
-        if not clan.members.filter(id=request.user.id).exists():
+        if not get_clan_role(request, clan).is_member:
             raise PermissionDenied("클랜 멤버만 방을 생성할 수 있습니다.")
 
         sessions_data = request.data.get("sessions", [])
@@ -558,6 +751,8 @@ class ClanRoomListAPIView(generics.ListCreateAPIView): # [수정] ListCreateAPIV
             manager_nickname=request.user.nickname,
             clan=clan  # <-- 이 부분이 있어야 클랜 방이 됩니다!
         )
+        stats.record(clan.id, rooms_created=1)
+        timeline.add(clan.id, 'room', db_room.id, request.user, db_room.title)
 
         # 세션 생성
         session_instances = []
@@ -573,6 +768,7 @@ class ClanRoomListAPIView(generics.ListCreateAPIView): # [수정] ListCreateAPIV
                 manager_session.save()
         except Session.DoesNotExist:
             pass
+        bump_room_version(db_room.id)
 
         response_serializer = self.get_serializer(db_room)
         headers = self.get_success_headers(response_serializer.data)
@@ -589,7 +785,7 @@ class ClanRoomDashboardView(APIView):
         clan = get_object_or_404(Clan, pk=pk)
         
         # 멤버 확인
-        if not clan.members.filter(id=request.user.id).exists():
+        if not get_clan_role(request, clan).is_member:
              return Response({"detail": "클랜 멤버만 접근할 수 있습니다."}, status=status.HTTP_403_FORBIDDEN)
              
         rooms = Room.objects.filter(clan=clan, ended=False).order_by('-created_at')
@@ -601,6 +797,79 @@ class ClanRoomDashboardView(APIView):
             "rooms": serializer.data
         })
 
+class ClanTimelineView(APIView):
+    """
+    (GET) /api/v1/clans/<int:pk>/feed/?before=<id>&limit=20
+    클랜 새 소식 (공지, 일정, 게시글, 클랜 방, 새 멤버) - 최신순
+    다음 페이지는 응답의 next_before 값을 before로 전달
+    """
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request, pk):
+        role = get_clan_role(request, pk)
+        if not role.exists:
+            return Response({"detail": "클랜을 찾을 수 없습니다."}, status=status.HTTP_404_NOT_FOUND)
+        if not role.has_access:
+            return Response({"detail": "클랜 멤버만 조회할 수 있습니다."}, status=status.HTTP_403_FORBIDDEN)
+
+        try:
+            before, limit = timeline.parse_feed_params(request.query_params)
+        except ValueError as e:
+            return Response({"detail": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        entries, next_before = timeline.feed_page(role.clan_id, before, limit)
+        return Response({
+            "results": ClanTimelineEntrySerializer(entries, many=True).data,
+            "next_before": next_before,
+        })
+
+
+class ClanStatsView(APIView):
+    """
+    (GET) /api/v1/clans/<int:pk>/stats/?period=day&start=2025-11-01&end=2025-11-30
+    클랜 통계 (멤버 수 추이, 방 생성/확정/종료, 채팅, 게시글, 가입 신청)
+    롤업 테이블(ClanStatRollup)만 조회합니다. 클랜장/운영진/운영자만 조회 가능
+    """
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request, pk):
+        role = get_clan_role(request, pk)
+        if not role.exists:
+            return Response({"detail": "클랜을 찾을 수 없습니다."}, status=status.HTTP_404_NOT_FOUND)
+        if not (role.is_owner_or_admin or request.user.role == 'OPERATOR'):
+            return Response({"detail": "권한이 없습니다."}, status=status.HTTP_403_FORBIDDEN)
+
+        try:
+            period, start, end = stats.parse_stats_params(request.query_params)
+        except ValueError as e:
+            return Response({"detail": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        return Response(stats.stats_series(role.clan_id, period, start, end))
+
+
+class ClanBestTimeView(APIView):
+    """
+    (GET) /api/v1/clans/<int:pk>/availability/best/?duration=120&step=60&k=5
+    클랜의 진행 중인 합주방 전체에 대한 일정 조율 (방별 top-k + 클랜 전체 top-k)
+    """
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request, pk):
+        clan = get_object_or_404(Clan, pk=pk)
+
+        # 멤버 확인
+        if not get_clan_role(request, clan).is_member:
+             return Response({"detail": "클랜 멤버만 접근할 수 있습니다."}, status=status.HTTP_403_FORBIDDEN)
+
+        rooms = list(Room.objects.filter(clan=clan, ended=False).order_by('-created_at'))
+        try:
+            step, length, k = parse_solver_params(request.query_params)
+            result = solve_rooms(rooms, step, length, k)
+        except ValueError as e:
+            return Response({"detail": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        return Response(result)
+
 class ClanJoinRequestListView(generics.ListAPIView):
     serializer_class = ClanJoinRequestSerializer
     permission_classes = [permissions.IsAuthenticated, IsClanOwnerOrAdmin]
@@ -622,12 +891,21 @@ class ClanMemberActivityAPIView(generics.ListAPIView):
         clan = get_object_or_404(Clan, pk=self.kwargs['pk'])
         
         # 멤버인지 확인
-        if not clan.members.filter(id=self.request.user.id).exists():
+        if not get_clan_role(self.request, clan).is_member:
              raise PermissionDenied("클랜 멤버만 조회할 수 있습니다.")
              
         # 닉네임 순으로 정렬하여 반환
         return clan.members.all().order_by('nickname')
 
+    def list(self, request, *args, **kwargs):
+        # [수정] 멤버별 쿼리 대신 클랜 전체 2번 조회 + 캐시 (clan_app/activity.py)
+        clan = get_object_or_404(Clan, pk=self.kwargs['pk'])
+        if not get_clan_role(request, clan).is_member:
+             raise PermissionDenied("클랜 멤버만 조회할 수 있습니다.")
+
+        report = activity.get_activity_report(clan, self.get_serializer_context())
+        return Response(report)
+
 class ClanAnnouncementDestroyView(generics.DestroyAPIView):
     """
     (DELETE) /api/v1/clans/announcements/<int:pk>/
@@ -640,12 +918,14 @@ class ClanAnnouncementDestroyView(generics.DestroyAPIView):
     def perform_destroy(self, instance):
         # 작성자 본인 또는 클랜장만 삭제 가능
         # instance.clan.owner check
-        is_owner = instance.clan.owner == self.request.user
-        is_admin = instance.clan.admins.filter(id=self.request.user.id).exists()
+        role = get_clan_role(self.request, instance.clan_id)
+        is_owner = role.is_owner
+        is_admin = role.is_admin
         is_author = instance.author == self.request.user
         
         if not (is_owner or is_admin or is_author):
              raise PermissionDenied("공지 삭제 권한이 없습니다.")
+        timeline.remove(instance.clan_id, 'announcement', instance.id)
         instance.delete()
 
 class ClanEventDestroyView(generics.DestroyAPIView):
@@ -659,12 +939,14 @@ class ClanEventDestroyView(generics.DestroyAPIView):
 
     def perform_destroy(self, instance):
         # 작성자 본인 또는 클랜장만 삭제 가능
-        is_owner = instance.clan.owner == self.request.user
-        is_admin = instance.clan.admins.filter(id=self.request.user.id).exists()
+        role = get_clan_role(self.request, instance.clan_id)
+        is_owner = role.is_owner
+        is_admin = role.is_admin
         is_creator = instance.creator == self.request.user
         
         if not (is_owner or is_admin or is_creator):
              raise PermissionDenied("일정 삭제 권한이 없습니다.")
+        timeline.remove(instance.clan_id, 'event', instance.id)
         instance.delete()
 
 class ClanBoardDestroyView(generics.DestroyAPIView):
@@ -677,10 +959,12 @@ class ClanBoardDestroyView(generics.DestroyAPIView):
     permission_classes = [permissions.IsAuthenticated]
 
     def perform_destroy(self, instance):
-        is_owner = instance.clan.owner == self.request.user
-        is_admin = instance.clan.admins.filter(id=self.request.user.id).exists()
+        role = get_clan_role(self.request, instance.clan_id)
+        is_owner = role.is_owner
+        is_admin = role.is_admin
         is_author = instance.author == self.request.user 
         
         if not (is_owner or is_admin or is_author):
              raise PermissionDenied("게시판 삭제 권한이 없습니다.")
+        timeline.remove(instance.clan_id, 'board', instance.id)
         instance.delete()
\ No newline at end of file
@@ -10,6 +10,8 @@ from django.core.asgi import get_asgi_application
 from channels.routing import ProtocolTypeRouter, URLRouter
 from channels.auth import AuthMiddlewareStack
 import clan_app.routing  # 우리가 만든 라우팅 파일
+import room_app.routing  # 합주방 로비 스트림
+from user_app.authentication import JWTAuthMiddleware  # ?token= JWT 인증
 
 # 3. HTTP 핸들러 미리 가져오기
 django_asgi_app = get_asgi_application()
@@ -21,8 +23,11 @@ application = ProtocolTypeRouter({
 
     # websocket 요청 -> Channels가 처리
     "websocket": AuthMiddlewareStack(
-        URLRouter(
-            clan_app.routing.websocket_urlpatterns
+        JWTAuthMiddleware(
+            URLRouter(
+                clan_app.routing.websocket_urlpatterns
+                + room_app.routing.websocket_urlpatterns
+            )
         )
     ),
 })
\ No newline at end of file
@@ -0,0 +1,41 @@
+# config/cache_versions.py
+"""
+캐시 무효화용 버전 카운터
+
+캐시 키에 버전을 붙여두고, 데이터가 바뀌면 버전만 올려서
+이전 키들을 한 번에 무효화합니다. (CACHES가 Redis면 워커 간 공유)
+"""
+from django.core.cache import cache
+
+
+def _key(name):
+    return f"version:{name}"
+
+
+def get_version(name):
+    return cache.get_or_set(_key(name), 1, timeout=None)
+
+
+def get_versions(names):
+    """
+    여러 버전을 한 번에 조회 -> {name: version}
+    """
+    keys = {_key(name): name for name in names}
+    found = cache.get_many(list(keys))
+    missing = {key: 1 for key in keys if key not in found}
+    if missing:
+        cache.set_many(missing, timeout=None)
+        found.update(missing)
+    return {keys[key]: value for key, value in found.items()}
+
+
+def bump_version(name):
+    """
+    버전을 1 올리고 새 버전을 반환합니다.
+    """
+    key = _key(name)
+    try:
+        return cache.incr(key)
+    except ValueError:
+        cache.add(key, 1, timeout=None)
+        return cache.incr(key)
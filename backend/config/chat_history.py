@@ -0,0 +1,111 @@
+# config/chat_history.py
+"""
+채팅방별 최근 메시지 링 버퍼 (프로세스 메모리)
+
+- 채팅방마다 최근 capacity개 메시지를 deque(maxlen)로 보관
+- 새 메시지는 append()로 버퍼에 바로 추가
+- 최근 메시지 / 스크롤(before) 요청은 버퍼에서 먼저 처리하고,
+  버퍼보다 오래된 메시지를 요청할 때만 DB를 조회
+
+다른 워커가 메시지를 쓰면 공유 캐시의 버전이 올라가므로,
+버전이 어긋난 버퍼는 다음 조회 때 DB에서 다시 채웁니다.
+(config.cache_versions, room_app.leaderboard와 같은 방식)
+"""
+import threading
+from collections import deque
+
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from config.cache_versions import bump_version, get_version
+
+
+class RecentChatHistory:
+    """
+    load(chat_id, before, limit) -> 최신순 메시지 목록 (before 이전, 최대 limit개)
+    메시지 객체는 .timestamp 속성을 가져야 합니다.
+    """
+    def __init__(self, name, load, capacity=100):
+        self.name = name
+        self.capacity = capacity
+        self._load = load
+        # chat_id -> (version, complete, deque)
+        #   complete: 버퍼가 채팅방의 전체 기록을 담고 있음 (DB 조회 불필요)
+        self._rings = {}
+        self._lock = threading.Lock()
+
+    def _version_name(self, chat_id):
+        return f"chat:{self.name}:{chat_id}"
+
+    def _ring(self, chat_id):
+        version = get_version(self._version_name(chat_id))
+        with self._lock:
+            entry = self._rings.get(chat_id)
+        if entry is not None and entry[0] == version:
+            return entry
+
+        rows = self._load(chat_id, None, self.capacity)
+        entry = (version, len(rows) < self.capacity, deque(reversed(rows), maxlen=self.capacity))
+        with self._lock:
+            self._rings[chat_id] = entry
+        return entry
+
+    def append(self, chat_id, message):
+        """
+        새 메시지 추가 (DB 커밋 후 호출)
+        """
+        self.append_many(chat_id, [message])
+
+    def append_many(self, chat_id, messages):
+        """
+        저장된 메시지 여러 개를 시간순으로 추가 (DB 커밋 후 호출, 버전은 1번만 올림)
+        """
+        if not messages:
+            return
+        new_version = bump_version(self._version_name(chat_id))
+        with self._lock:
+            entry = self._rings.get(chat_id)
+            if entry is None:
+                return
+            version, complete, ring = entry
+            if version != new_version - 1:
+                # 그 사이 다른 워커가 쓴 메시지가 있음 -> 다음 조회 때 다시 로드
+                del self._rings[chat_id]
+                return
+            complete = complete and len(ring) + len(messages) <= self.capacity
+            ring.extend(messages)
+            self._rings[chat_id] = (new_version, complete, ring)
+
+    def recent(self, chat_id, limit, before=None):
+        """
+        return: 최신순 메시지 목록 (before 이전, 최대 limit개)
+        """
+        _, complete, ring = self._ring(chat_id)
+        with self._lock:
+            items = list(ring)
+        if before is not None:
+            items = [message for message in items if message.timestamp < before]
+        items.reverse()
+
+        if len(items) >= limit or complete:
+            return items[:limit]
+        # 버퍼보다 오래된 구간 -> DB
+        return self._load(chat_id, before, limit)
+
+
+def parse_history_params(query_params, default_limit=50, max_limit=100):
+    """
+    ?before=<ISO 시각>&limit=50 -> (before, limit)
+    (잘못된 값이면 ValueError)
+    """
+    before = query_params.get('before')
+    if before is not None:
+        parsed = parse_datetime(before)
+        if parsed is None:
+            raise ValueError("before는 ISO 형식의 시각이어야 합니다.")
+        before = timezone.make_aware(parsed) if timezone.is_naive(parsed) else parsed
+    try:
+        limit = int(query_params.get('limit', default_limit))
+    except (TypeError, ValueError):
+        raise ValueError("limit은 정수여야 합니다.")
+    return before, max(1, min(limit, max_limit))
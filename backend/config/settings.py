@@ -229,15 +229,61 @@ else:
             "BACKEND": "channels.layers.InMemoryChannelLayer"
         }
     }
+
+# [추가] 캐시 설정 (Redis가 있으면 워커 간 공유, 없으면 프로세스 메모리)
+if 'REDIS_URL' in os.environ:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": os.environ.get('REDIS_URL'),
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        }
+    }
+
+# [추가] 이메일 인증번호 저장소 (user_app/verification.py)
+# 'cache': TTL 캐시에만 저장 (워커 간 공유되는 Redis일 때), 'db': VerificationCode 테이블
+VERIFICATION_CODE_BACKEND = os.environ.get(
+    'VERIFICATION_CODE_BACKEND', 'cache' if 'REDIS_URL' in os.environ else 'db'
+)
+
+# [추가] 알림 보관 (user_app/alerts.py)
+# 읽은 지 ALERT_ARCHIVE_DAYS일 지난 알림, 유저별 최신 ALERT_INBOX_LIMIT개를 넘는 알림은 AlertArchive로 이동
+ALERT_ARCHIVE_DAYS = int(os.environ.get('ALERT_ARCHIVE_DAYS', 30))
+ALERT_INBOX_LIMIT = int(os.environ.get('ALERT_INBOX_LIMIT', 200))
+
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
         # React가 'Bearer <token>' 헤더를 보내면 이 클래스가 인증을 처리
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        # [수정] 유저 행을 요청마다 조회하지 않도록 캐시된 스냅샷 사용 (user_app/authentication.py)
+        'user_app.authentication.CachedJWTAuthentication',
     ),
     'DEFAULT_PERMISSION_CLASSES': (
         # 기본적으로는 인증된 사용자만 접근 허용
         'rest_framework.permissions.IsAuthenticated',
     ),
+    # [추가] 토큰 버킷 요청 제한 (config/throttling.py)
+    # user/anon: 모든 API, 나머지: view.throttle_scope가 있는 API (로그인은 IP별 + (IP, 아이디)별)
+    'DEFAULT_THROTTLE_CLASSES': (
+        'config.throttling.TokenBucketThrottle',
+        'config.throttling.ScopedTokenBucketThrottle',
+    ),
+    # [추가] IP 버킷(anon, verification, login)의 클라이언트 IP 기준
+    # X-Forwarded-For는 클라이언트가 임의로 넣을 수 있으므로 앞단 프록시 수만큼 뒤에서 읽음
+    # (Render: 로드밸런서 1단, 로컬: 프록시 없음 -> REMOTE_ADDR)
+    'NUM_PROXIES': int(os.environ.get('NUM_PROXIES', 1 if 'RENDER' in os.environ else 0)),
+    'DEFAULT_THROTTLE_RATES': {
+        'user': os.environ.get('THROTTLE_USER_RATE', '300/min'),
+        'anon': os.environ.get('THROTTLE_ANON_RATE', '60/min'),
+        'login': '10/min',
+        'login_user': '5/min',
+        'verification': '5/min',
+        'dm': '60/min',
+    },
 }
 
 # simple-jwt가 username 필드 (즉, FastAPI의 'id')를 사용하도록 설정
@@ -294,8 +340,12 @@ CORS_ALLOW_HEADERS = [
     'user-agent',
     'x-csrftoken',
     'x-requested-with',
+    'if-none-match',  # [추가] 조건부 요청 (304)
 ]
 
+# [추가] 프론트에서 ETag 헤더를 읽을 수 있도록 노출
+CORS_EXPOSE_HEADERS = ['etag']
+
 
 DEBUG = True
 
@@ -0,0 +1,163 @@
+# config/throttling.py
+"""
+토큰 버킷 요청 제한 (REST_FRAMEWORK['DEFAULT_THROTTLE_CLASSES'])
+
+버킷마다 최대 capacity개의 토큰이 있고 초당 rate개씩 다시 채워지며, 요청 1번에 1개를 씁니다.
+(SimpleRateThrottle처럼 요청 시각 목록을 저장하지 않으므로 버킷당 값 2개, 확인 1번에 캐시 왕복 1번)
+비율 표기는 DRF와 같습니다: '300/min' -> capacity 300, 1분에 300개 충전
+
+- TokenBucketThrottle: 로그인 유저는 user id('user'), 비로그인은 IP('anon')별 버킷
+- ScopedTokenBucketThrottle: view.throttle_scope가 있으면 (scope, user 또는 IP)별 버킷
+  throttle_scope = {'POST': 'dm'}처럼 메서드별로 지정할 수 있음
+- consume(): DRF 밖(비동기 LoginView 등)에서 직접 확인
+
+저장소
+- RedisCache(REDIS_URL): Lua 스크립트 1번으로 원자적으로 계산 (모든 워커가 버킷 공유, 시각은 Redis TIME)
+- 그 외(LocMemCache): 프로세스 안에서 lock으로 계산 (워커 간 공유되지 않음)
+캐시 오류 시에는 요청을 막지 않습니다.
+
+클라이언트 IP
+X-Forwarded-For 전체를 그대로 쓰면 헤더를 바꿀 때마다 새 버킷이 생기므로
+REST_FRAMEWORK['NUM_PROXIES'](환경변수 NUM_PROXIES, Render 기본 1)만큼 뒤에서 센 주소
+(신뢰하는 프록시가 붙인 값)를 씁니다. 0이면 REMOTE_ADDR만 사용합니다.
+"""
+import math
+import threading
+import time
+
+from django.core.cache import cache, caches
+from rest_framework.settings import api_settings
+from rest_framework.throttling import BaseThrottle
+
+_PERIODS = {'s': 1, 'm': 60, 'h': 60 * 60, 'd': 60 * 60 * 24}
+
+_TOKEN_BUCKET_LUA = """
+local now = redis.call('TIME')
+now = tonumber(now[1]) + tonumber(now[2]) / 1000000
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local state = redis.call('HMGET', KEYS[1], 't', 'ts')
+local tokens = tonumber(state[1]) or capacity
+local ts = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+local allowed = 0
+if tokens >= 1 then
+  tokens = tokens - 1
+  allowed = 1
+end
+redis.call('HSET', KEYS[1], 't', tostring(tokens), 'ts', tostring(now))
+redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) + 1)
+return {allowed, tostring(tokens)}
+"""
+
+# 캐시 오류 로그는 이 간격(초)에 1번만 (Redis 장애 시 요청마다 찍히지 않게)
+ERROR_LOG_INTERVAL = 60
+
+_local_lock = threading.Lock()
+# Lua 스크립트는 프로세스에서 1번만 등록 (get_client()는 호출마다 새 클라이언트를 만듦)
+_redis_script = None
+_last_error_log = 0.0
+
+
+def parse_rate(rate):
+    """
+    '300/min' -> (capacity, 초당 충전량) (None이면 None)
+    """
+    if rate is None:
+        return None
+    num, period = rate.split('/')
+    capacity = int(num)
+    return capacity, capacity / _PERIODS[period[0]]
+
+
+def _redis_consume(backend, key, capacity, rate):
+    global _redis_script
+    client = backend._cache.get_client(key, write=True)
+    if _redis_script is None:
+        _redis_script = client.register_script(_TOKEN_BUCKET_LUA)
+    allowed, tokens = _redis_script(keys=[key], args=[capacity, rate], client=client)
+    return bool(int(allowed)), float(tokens)
+
+
+def _local_consume(key, capacity, rate):
+    with _local_lock:
+        now = time.monotonic()
+        tokens, ts = cache.get(key) or (capacity, now)
+        tokens = min(capacity, tokens + max(0.0, now - ts) * rate)
+        allowed = tokens >= 1
+        if allowed:
+            tokens -= 1
+        cache.set(key, (tokens, now), math.ceil(capacity / rate) + 1)
+    return allowed, tokens
+
+
+def _log_error(scope, error):
+    global _last_error_log
+    now = time.monotonic()
+    if now - _last_error_log >= ERROR_LOG_INTERVAL:
+        _last_error_log = now
+        print(f"[throttle] 버킷 확인 실패 ({scope}), 제한 없이 통과: {error}")
+
+
+def consume(scope, ident, rate):
+    """
+    버킷에서 토큰 1개 사용
+    return: (허용 여부, 다음 토큰까지 기다릴 초)
+    """
+    parsed = parse_rate(rate)
+    if parsed is None:
+        return True, 0
+    capacity, refill = parsed
+    key = f"throttle:{scope}:{ident}"
+    try:
+        backend = caches['default']
+        if backend.__class__.__name__ == 'RedisCache':
+            allowed, tokens = _redis_consume(backend, backend.make_and_validate_key(key), capacity, refill)
+        else:
+            allowed, tokens = _local_consume(key, capacity, refill)
+    except Exception as e:
+        _log_error(scope, e)
+        return True, 0
+    return allowed, 0 if allowed else (1 - tokens) / refill
+
+
+def client_ident(request):
+    """
+    IP 식별자 (X-Forwarded-For에서 NUM_PROXIES번째 뒤 주소, 처리는 DRF와 동일)
+    """
+    return BaseThrottle().get_ident(request)
+
+
+class TokenBucketThrottle(BaseThrottle):
+    """
+    로그인 유저: 'user' 비율로 user id별, 비로그인: 'anon' 비율로 IP별
+    """
+    def allow_request(self, request, view):
+        user = getattr(request, 'user', None)
+        if user is not None and user.is_authenticated:
+            scope, ident = 'user', user.pk
+        else:
+            scope, ident = 'anon', self.get_ident(request)
+        return self.consume(scope, ident)
+
+    def consume(self, scope, ident):
+        allowed, self._wait = consume(scope, ident, api_settings.DEFAULT_THROTTLE_RATES.get(scope))
+        return allowed
+
+    def wait(self):
+        return getattr(self, '_wait', None)
+
+
+class ScopedTokenBucketThrottle(TokenBucketThrottle):
+    """
+    view.throttle_scope('login', 'dm' 등)가 있는 view만 (scope, user 또는 IP)별로 제한
+    """
+    def allow_request(self, request, view):
+        scope = getattr(view, 'throttle_scope', None)
+        if isinstance(scope, dict):
+            scope = scope.get(request.method)
+        if not scope:
+            return True
+        user = getattr(request, 'user', None)
+        ident = f"u{user.pk}" if user is not None and user.is_authenticated else self.get_ident(request)
+        return self.consume(scope, ident)
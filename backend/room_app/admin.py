@@ -1,7 +1,7 @@
 # room_app/admin.py
 from django.contrib import admin
 # --- 👇 [수정] RoomAvailability -> RoomAvailabilitySlot ---
-from .models import Room, Session, SessionReservation, Evaluation, GroupChat, RoomAvailabilitySlot
+from .models import Room, Session, SessionReservation, Evaluation, GroupChat, RoomAvailabilitySlot, MannerStat, LeaderboardEntry
 
 admin.site.register(Room)
 admin.site.register(Session)
@@ -9,4 +9,6 @@ admin.site.register(SessionReservation)
 admin.site.register(Evaluation)
 admin.site.register(GroupChat)
 # --- 👇 [수정] RoomAvailability -> RoomAvailabilitySlot ---
-admin.site.register(RoomAvailabilitySlot)
\ No newline at end of file
+admin.site.register(RoomAvailabilitySlot)
+admin.site.register(MannerStat)
+admin.site.register(LeaderboardEntry)
\ No newline at end of file
@@ -0,0 +1,26 @@
+import json
+from channels.generic.websocket import AsyncWebsocketConsumer
+from channels.db import database_sync_to_async
+
+from . import lobby
+
+
+class RoomLobbyConsumer(AsyncWebsocketConsumer):
+    """
+    ws/rooms/lobby/
+    스냅샷 1회 + 이후 변경 이벤트만 전송 (읽기 전용)
+    """
+    async def connect(self):
+        # 스냅샷보다 먼저 그룹에 참여해야 그 사이 이벤트를 놓치지 않습니다.
+        await self.channel_layer.group_add(lobby.LOBBY_GROUP, self.channel_name)
+        await self.accept()
+
+        snapshot = await database_sync_to_async(lobby.get_snapshot)()
+        await self.send(text_data=json.dumps(snapshot, default=str))
+
+    async def disconnect(self, close_code):
+        await self.channel_layer.group_discard(lobby.LOBBY_GROUP, self.channel_name)
+
+    # 그룹에서 이벤트 받기 (백엔드 -> 프론트)
+    async def lobby_event(self, event):
+        await self.send(text_data=json.dumps(event['event'], default=str))
@@ -0,0 +1,237 @@
+# room_app/leaderboard.py
+"""
+리더보드 (매너 점수 / 분위기 메이커 / 완료한 합주 수)
+
+- 값은 LeaderboardEntry 테이블에 저장 (Evaluation, 합주 종료 시 증분 갱신)
+- 조회는 프로세스 메모리의 정렬된 랭크 테이블(RankTable)에서 bisect로 처리
+  -> "상위 N명"은 슬라이스, "X의 순위"는 O(log n) 이진 탐색
+- 다른 워커가 값을 바꾸면 공유 캐시의 버전이 올라가므로, 버전이 어긋난
+  랭크 테이블은 다음 조회 때 DB에서 다시 읽습니다.
+- 전체 재계산: `python manage.py rebuild_leaderboards` (주기 실행)
+"""
+import threading
+import time
+from bisect import bisect_left, insort
+from functools import partial
+
+from django.db import transaction
+from django.db.models import Count, F
+
+from clan_app.models import Clan
+from config.cache_versions import bump_version, get_version
+from user_app.models import User
+from .models import LeaderboardEntry, MannerStat, Session
+
+BOARDS = [choice[0] for choice in LeaderboardEntry.BOARD_CHOICES]
+# 매너 점수 리더보드에 오르기 위한 최소 평가 수
+MIN_EVALUATIONS_FOR_MANNER = 3
+# 클랜 랭크 테이블 유지 시간 (멤버 변경 반영)
+CLAN_TABLE_TTL = 60
+
+_NEG_INF = float('-inf')
+
+
+class RankTable:
+    """
+    (-value, user_id) 순으로 정렬된 리스트 + user_id -> value
+    (값이 같으면 같은 순위, 다음 순위는 건너뜀)
+    """
+    def __init__(self, rows, member_ids=None):
+        self.values = dict(rows)
+        self.keys = sorted((-value, user_id) for user_id, value in self.values.items())
+        self.member_ids = member_ids
+
+    def update(self, user_id, value):
+        if self.member_ids is not None and user_id not in self.member_ids:
+            return
+        old = self.values.get(user_id)
+        if old is not None:
+            idx = bisect_left(self.keys, (-old, user_id))
+            del self.keys[idx]
+        self.values[user_id] = value
+        insort(self.keys, (-value, user_id))
+
+    def remove(self, user_id):
+        old = self.values.pop(user_id, None)
+        if old is not None:
+            del self.keys[bisect_left(self.keys, (-old, user_id))]
+
+    def top(self, n):
+        return [(user_id, -neg_value) for neg_value, user_id in self.keys[:n]]
+
+    def rank(self, user_id):
+        value = self.values.get(user_id)
+        if value is None:
+            return None
+        return bisect_left(self.keys, (-value, _NEG_INF)) + 1
+
+    def __len__(self):
+        return len(self.keys)
+
+
+# (board, clan_id) -> (version, loaded_at, RankTable)
+_tables = {}
+_lock = threading.Lock()
+
+
+def _version_name(board):
+    return f"leaderboard:{board}"
+
+
+def _load_table(board, clan_id):
+    entries = LeaderboardEntry.objects.filter(board=board)
+    member_ids = None
+    if clan_id is not None:
+        member_ids = set(Clan.objects.get(pk=clan_id).members.values_list('id', flat=True))
+        entries = entries.filter(user_id__in=member_ids)
+    return RankTable(entries.values_list('user_id', 'value'), member_ids)
+
+
+def get_table(board, clan_id=None):
+    """
+    버전이 맞는 랭크 테이블을 반환 (없거나 오래되었으면 DB에서 다시 읽음)
+    """
+    version = get_version(_version_name(board))
+    key = (board, clan_id)
+    cached = _tables.get(key)
+    if cached:
+        cached_version, loaded_at, table = cached
+        fresh = clan_id is None or time.monotonic() - loaded_at < CLAN_TABLE_TTL
+        if cached_version == version and fresh:
+            return table
+
+    table = _load_table(board, clan_id)
+    with _lock:
+        _tables[key] = (version, time.monotonic(), table)
+    return table
+
+
+def _apply_local(board, values, removed=()):
+    """
+    버전을 올리고 이 프로세스의 랭크 테이블에 변경분을 반영합니다.
+    (직전 버전이 아니었던 테이블은 다른 워커의 변경을 놓친 것이므로 버림)
+    """
+    new_version = bump_version(_version_name(board))
+    with _lock:
+        for key in [key for key in _tables if key[0] == board]:
+            version, loaded_at, table = _tables[key]
+            if version != new_version - 1:
+                del _tables[key]
+                continue
+            for user_id, value in values.items():
+                table.update(user_id, value)
+            for user_id in removed:
+                table.remove(user_id)
+            _tables[key] = (new_version, loaded_at, table)
+
+
+def _publish(board, values, removed=()):
+    # 커밋 전에 버전을 올리면 다른 워커가 이전 값을 새 버전으로 읽어갈 수 있음
+    transaction.on_commit(partial(_apply_local, board, values, removed))
+
+
+def set_values(board, values, removed=()):
+    """
+    values: {user_id: value} 를 저장 (upsert)하고 랭크 테이블에 반영
+    removed: 리더보드에서 빠질 user_id 목록
+    """
+    if not values and not removed:
+        return
+    with transaction.atomic():
+        if values:
+            LeaderboardEntry.objects.bulk_create(
+                [LeaderboardEntry(board=board, user_id=user_id, value=value) for user_id, value in values.items()],
+                update_conflicts=True,
+                unique_fields=['board', 'user'],
+                update_fields=['value', 'updated_at'],
+            )
+        if removed:
+            LeaderboardEntry.objects.filter(board=board, user_id__in=removed).delete()
+        _publish(board, values, removed)
+
+
+def _manner_values(stats):
+    """
+    MannerStat 행들 -> (매너 점수 값, 매너 점수 미달 유저, 분위기 메이커 값)
+    """
+    manner, below_min, mood_maker = {}, [], {}
+    for user_id, score_sum, count, mood_count in stats:
+        if count >= MIN_EVALUATIONS_FOR_MANNER:
+            manner[user_id] = score_sum / count
+        else:
+            below_min.append(user_id)
+        if mood_count:
+            mood_maker[user_id] = mood_count
+    return manner, below_min, mood_maker
+
+
+def record_manner_stats(user_ids):
+    """
+    MannerStat이 바뀐 유저들의 매너 점수 / 분위기 메이커 값을 갱신
+    (room_app.manner.apply_evaluations에서 호출)
+    """
+    stats = MannerStat.objects.filter(user_id__in=user_ids).values_list(
+        'user_id', 'score_sum', 'evaluation_count', 'mood_maker_count'
+    )
+    manner, removed, mood_maker = _manner_values(stats)
+    set_values('manner', manner, removed)
+    set_values('mood_maker', mood_maker)
+
+
+def record_room_ended(room):
+    """
+    합주 종료 시 세션 참여자들의 '완료한 합주 수'를 1씩 올림
+    (RoomEndView의 트랜잭션 안에서 호출, 랭크 테이블은 커밋 후에만 갱신)
+    """
+    nicknames = room.sessions.filter(
+        participant_nickname__isnull=False
+    ).exclude(participant_nickname='').values_list('participant_nickname', flat=True)
+    user_ids = list(User.objects.filter(nickname__in=set(nicknames)).values_list('id', flat=True))
+    if not user_ids:
+        return
+
+    with transaction.atomic():
+        LeaderboardEntry.objects.bulk_create(
+            [LeaderboardEntry(board='rehearsals', user_id=user_id, value=0) for user_id in user_ids],
+            ignore_conflicts=True
+        )
+        LeaderboardEntry.objects.filter(board='rehearsals', user_id__in=user_ids).update(value=F('value') + 1)
+        values = dict(
+            LeaderboardEntry.objects.filter(board='rehearsals', user_id__in=user_ids).values_list('user_id', 'value')
+        )
+        _publish('rehearsals', values)
+
+
+def rebuild_leaderboards():
+    """
+    MannerStat / 종료된 합주방 세션으로부터 모든 리더보드를 다시 계산합니다.
+    return: {board: 유저 수}
+    """
+    stats = MannerStat.objects.values_list('user_id', 'score_sum', 'evaluation_count', 'mood_maker_count')
+    manner, _, mood_maker = _manner_values(stats)
+
+    rehearsal_counts = Session.objects.filter(
+        room__ended=True, participant_nickname__isnull=False
+    ).exclude(participant_nickname='').values('participant_nickname').annotate(
+        rooms=Count('room', distinct=True)
+    )
+    nickname_counts = {row['participant_nickname']: row['rooms'] for row in rehearsal_counts}
+    rehearsals = {
+        user_id: nickname_counts[nickname]
+        for user_id, nickname in User.objects.filter(nickname__in=nickname_counts).values_list('id', 'nickname')
+    }
+
+    result = {}
+    with transaction.atomic():
+        for board, values in (('manner', manner), ('mood_maker', mood_maker), ('rehearsals', rehearsals)):
+            LeaderboardEntry.objects.filter(board=board).delete()
+            LeaderboardEntry.objects.bulk_create(
+                [LeaderboardEntry(board=board, user_id=user_id, value=value) for user_id, value in values.items()],
+                batch_size=500
+            )
+            result[board] = len(values)
+
+    # 모든 워커의 랭크 테이블을 무효화
+    for board in result:
+        bump_version(_version_name(board))
+    return result
@@ -0,0 +1,94 @@
+# room_app/lobby.py
+"""
+합주방 로비 실시간 스트림
+
+- 접속 시: 스냅샷(진행 중인 일반 방 목록) 1회 전송
+- 이후: 바뀐 부분만 이벤트로 전송
+    room_created      {room}
+    room_updated      {room}            (방 정보 수정, 나가기/강퇴)
+    session_updated   {session}         (세션 참여/취소, 예약/예약 취소)
+    room_confirmed    {}
+    room_removed      {}                (종료/삭제)
+  모든 이벤트에는 room_id, version(Room.version)이 들어 있으며
+  클라이언트는 가지고 있는 방 버전보다 큰 이벤트만 적용하면 됩니다.
+
+스냅샷은 공유 캐시에 버전별로 저장하므로, 이벤트가 없는 동안
+접속자가 늘어도 DB를 다시 읽지 않습니다.
+(클랜 방은 로비에 노출되지 않으므로 이벤트도 보내지 않음)
+"""
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from django.core.cache import cache
+from django.db import transaction
+
+from config.cache_versions import bump_version, get_version
+from .models import Room
+from .serializers import RoomListSerializer, SessionSerializer
+
+LOBBY_GROUP = "room_lobby"
+SNAPSHOT_TIMEOUT = 60 * 5
+
+
+def _snapshot_key(version):
+    return f"room_lobby:snapshot:{version}"
+
+
+def lobby_rooms():
+    return Room.objects.filter(
+        ended=False, clan__isnull=True
+    ).prefetch_related('sessions__reservations__user').order_by('-created_at')
+
+
+def get_snapshot():
+    """
+    return: {"type": "snapshot", "rooms": [...]}
+    """
+    key = _snapshot_key(get_version(LOBBY_GROUP))
+    snapshot = cache.get(key)
+    if snapshot is None:
+        rooms = list(RoomListSerializer(lobby_rooms(), many=True).data)
+        snapshot = {"type": "snapshot", "rooms": rooms}
+        cache.set(key, snapshot, SNAPSHOT_TIMEOUT)
+    return snapshot
+
+
+def _send(event):
+    bump_version(LOBBY_GROUP)
+    channel_layer = get_channel_layer()
+    if channel_layer is None:
+        return
+    try:
+        async_to_sync(channel_layer.group_send)(
+            LOBBY_GROUP, {"type": "lobby.event", "event": event}
+        )
+    except Exception as e:
+        # 실시간 전송 실패가 요청 자체를 실패시키지 않도록
+        print(f"로비 이벤트 전송 실패: {e}")
+
+
+def publish(event_type, target_room, version, **data):
+    """
+    커밋 후 로비 구독자에게 이벤트를 보냅니다.
+    """
+    if target_room.clan_id is not None:
+        return
+    event = {"type": event_type, "room_id": target_room.id, "version": version, **data}
+    transaction.on_commit(lambda: _send(event))
+
+
+def publish_room(event_type, room, version):
+    """
+    방 전체를 다시 보내는 이벤트 (room_created, room_updated)
+    """
+    if room.clan_id is not None:
+        return
+    room = Room.objects.prefetch_related('sessions__reservations__user').get(pk=room.pk)
+    publish(event_type, room, version, room=RoomListSerializer(room).data)
+
+
+def publish_session(session, version):
+    room = session.room
+    if room.clan_id is not None:
+        return
+    session = room.sessions.prefetch_related('reservations__user').get(pk=session.pk)
+    publish("session_updated", room, version, session=SessionSerializer(session).data)
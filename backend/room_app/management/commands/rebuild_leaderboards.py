@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from room_app.leaderboard import rebuild_leaderboards
+
+
+class Command(BaseCommand):
+    help = "매너 점수 / 분위기 메이커 / 완료한 합주 리더보드를 전체 재계산합니다. (주기 실행용)"
+
+    def handle(self, *args, **options):
+        result = rebuild_leaderboards()
+        for board, count in result.items():
+            self.stdout.write(f"{board}: {count}명")
+        self.stdout.write(self.style.SUCCESS("리더보드를 다시 계산했습니다."))
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from room_app.manner import rebuild_manner_stats
+
+
+class Command(BaseCommand):
+    help = "Evaluation 전체로부터 유저별 매너 점수 누적 합계(MannerStat)를 다시 계산합니다."
+
+    def handle(self, *args, **options):
+        count = rebuild_manner_stats()
+        self.stdout.write(self.style.SUCCESS(f"{count}명의 매너 점수를 다시 집계했습니다."))
@@ -0,0 +1,95 @@
+# room_app/manner.py
+"""
+매너 점수 증분 집계
+
+MannerEvaluationAPIView에서 Evaluation이 생성될 때마다 대상 유저의
+누적 합계(MannerStat)를 F() 업데이트로 갱신하고, User.score를 평균값으로 맞춥니다.
+"""
+from collections import defaultdict
+
+from django.db import transaction
+from django.db.models import Count, F, Q, Sum
+from django.utils import timezone
+
+from user_app.authentication import invalidate_user_snapshot
+from user_app.models import User
+from .models import Evaluation, MannerStat
+from .leaderboard import record_manner_stats
+
+
+def sync_user_scores(user_ids):
+    """
+    MannerStat 평균값을 User.score에 반영 (평가가 없는 유저는 그대로 둠)
+    """
+    stats = MannerStat.objects.filter(
+        user_id__in=user_ids, evaluation_count__gt=0
+    ).values_list('user_id', 'score_sum', 'evaluation_count')
+
+    users = [User(id=user_id, score=round(score_sum / count)) for user_id, score_sum, count in stats]
+    if users:
+        User.objects.bulk_update(users, ['score'])
+        # bulk_update는 post_save를 보내지 않으므로 인증 캐시 스냅샷을 직접 무효화
+        for user in users:
+            invalidate_user_snapshot(user.id)
+
+
+def apply_evaluations(evaluations):
+    """
+    새로 생성된 Evaluation 목록을 대상 유저별 누적 합계에 더합니다.
+    (대상 유저 수만큼의 UPDATE, 전체 테이블 재집계 없음)
+    """
+    deltas = defaultdict(lambda: [0, 0, 0])  # [score_sum, count, mood_maker]
+    for evaluation in evaluations:
+        if evaluation.target_id is None:
+            continue
+        delta = deltas[evaluation.target_id]
+        delta[0] += int(evaluation.score)  # 프론트에서 문자열로 올 수 있음
+        delta[1] += 1
+        delta[2] += 1 if evaluation.is_mood_maker else 0
+
+    if not deltas:
+        return
+
+    with transaction.atomic():
+        MannerStat.objects.bulk_create(
+            [MannerStat(user_id=user_id) for user_id in deltas],
+            ignore_conflicts=True
+        )
+        now = timezone.now()
+        for user_id, (score_sum, count, mood_maker) in deltas.items():
+            MannerStat.objects.filter(user_id=user_id).update(
+                score_sum=F('score_sum') + score_sum,
+                evaluation_count=F('evaluation_count') + count,
+                mood_maker_count=F('mood_maker_count') + mood_maker,
+                updated_at=now,
+            )
+        sync_user_scores(list(deltas))
+        record_manner_stats(list(deltas))
+
+
+@transaction.atomic
+def rebuild_manner_stats():
+    """
+    Evaluation 테이블 전체로부터 MannerStat을 다시 만듭니다.
+    return: 집계된 유저 수
+    """
+    totals = Evaluation.objects.filter(target__isnull=False).values('target_id').annotate(
+        score_sum=Sum('score'),
+        evaluation_count=Count('id'),
+        mood_maker_count=Count('id', filter=Q(is_mood_maker=True)),
+    )
+
+    MannerStat.objects.all().delete()
+    MannerStat.objects.bulk_create([
+        MannerStat(
+            user_id=row['target_id'],
+            score_sum=row['score_sum'] or 0,
+            evaluation_count=row['evaluation_count'],
+            mood_maker_count=row['mood_maker_count'],
+        )
+        for row in totals
+    ], batch_size=500)
+
+    user_ids = list(MannerStat.objects.values_list('user_id', flat=True))
+    sync_user_scores(user_ids)
+    return len(user_ids)
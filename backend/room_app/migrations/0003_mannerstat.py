@@ -0,0 +1,27 @@
+# Generated by Django 5.2.7 on 2026-10-19 13:30
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('room_app', '0002_alter_sessionreservation_options_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MannerStat',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('score_sum', models.BigIntegerField(default=0)),
+                ('evaluation_count', models.IntegerField(default=0)),
+                ('mood_maker_count', models.IntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='manner_stat', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.7 on 2026-10-19 13:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('room_app', '0005_room_version'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='groupchat',
+            index=models.Index(fields=['room', 'timestamp'], name='groupchat_room_ts_idx'),
+        ),
+    ]
@@ -23,6 +23,8 @@ class Room(models.Model):
     # --- 👆 [최종 수정] ---
     confirmed_at = models.DateTimeField(null=True, blank=True)
     ended_at = models.DateTimeField(null=True, blank=True)
+    # [추가] 방 상태 버전 (세션/예약/확정/종료 변경 시 전역 시퀀스 값으로 갱신)
+    version = models.PositiveBigIntegerField(default=0, db_index=True)
     
     clan = models.ForeignKey(
         Clan,
@@ -96,6 +98,12 @@ class GroupChat(models.Model):
     timestamp = models.DateTimeField(default=timezone.now)
     image_url = models.CharField(max_length=512, blank=True, null=True)
 
+    class Meta:
+        indexes = [
+            # 방별 최근 메시지 / before 스크롤 조회
+            models.Index(fields=['room', 'timestamp'], name='groupchat_room_ts_idx'),
+        ]
+
     def __str__(self):
         return f"[{self.room.title}] {self.sender}"
 
@@ -112,4 +120,72 @@ class RoomAvailabilitySlot(models.Model):
     
     class Meta:
         unique_together = ('room', 'time') 
-        ordering = ['time']
\ No newline at end of file
+        ordering = ['time']
+
+# 7. MannerStat (매너 평가 누적 집계)
+# -----------------------------------------------------------------
+class MannerStat(models.Model):
+    """
+    유저별 매너 평가 누적 합계 (Evaluation이 생성될 때마다 증분 반영)
+    전체 재계산은 `python manage.py rebuild_manner_stats`
+    """
+    user = models.OneToOneField(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="manner_stat"
+    )
+    score_sum = models.BigIntegerField(default=0)
+    evaluation_count = models.IntegerField(default=0)
+    mood_maker_count = models.IntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    @property
+    def average_score(self):
+        if not self.evaluation_count:
+            return None
+        return self.score_sum / self.evaluation_count
+
+    def __str__(self):
+        return f"{self.user} ({self.evaluation_count}건)"
+
+
+# 8. LeaderboardEntry (리더보드 값 테이블)
+# -----------------------------------------------------------------
+class LeaderboardEntry(models.Model):
+    """
+    리더보드별 유저 값 (매너 점수 평균, 분위기 메이커 득표 수, 완료한 합주 수)
+    room_app.leaderboard가 증분 갱신하고, 주기적으로 전체 재계산합니다.
+    """
+    BOARD_CHOICES = [
+        ('manner', '매너 점수'),
+        ('mood_maker', '분위기 메이커'),
+        ('rehearsals', '완료한 합주'),
+    ]
+    board = models.CharField(max_length=20, choices=BOARD_CHOICES)
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="leaderboard_entries"
+    )
+    value = models.FloatField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ('board', 'user')
+        indexes = [
+            models.Index(fields=['board', '-value'], name='leaderboard_board_value_idx'),
+        ]
+
+    def __str__(self):
+        return f"[{self.board}] {self.user} = {self.value}"
+
+
+
+# 9. RoomVersionSequence (방 상태 버전 전역 시퀀스)
+# -----------------------------------------------------------------
+class RoomVersionSequence(models.Model):
+    """
+    Room.version에 쓰는 단조 증가 시퀀스 (행 1개)
+    room_app.versioning.bump_room_version에서만 사용합니다.
+    """
+    value = models.PositiveBigIntegerField(default=0)
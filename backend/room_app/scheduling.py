@@ -0,0 +1,244 @@
+# room_app/scheduling.py
+"""
+합주 일정 조율 솔버
+
+RoomAvailabilitySlot 투표를 "슬롯 그리드" 위의 비트셋(파이썬 int)으로 변환한 뒤,
+세션 참여자가 가장 많이 모이는 연속 시간대(top-k)를 계산합니다.
+
+- 그리드: 가장 이른 투표 시각(step 단위로 내림)부터 step 분 간격의 칸
+- 참여자 비트셋: i번째 비트 = i번째 칸에 투표함
+- 연속 시간대: 시작 칸 i부터 length 칸 동안 모두 가능한지 = (b >> 0) & (b >> 1) & ...
+- 세션 수 합산: 칸마다 루프를 돌지 않고 비트 평면(bit-sliced) 가산기로 한 번에 더함
+"""
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from .models import Session, RoomAvailabilitySlot
+
+# 허용하는 그리드 간격 (분)
+ALLOWED_STEP_MINUTES = (15, 30, 60, 120)
+DEFAULT_STEP_MINUTES = 60
+# 최대 k (응답 크기 제한)
+MAX_TOP_K = 20
+DEFAULT_TOP_K = 5
+# 그리드 최대 길이: 15분 단위로 약 두 달
+MAX_GRID_SLOTS = 62 * 24 * 4
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=dt_timezone.utc)
+
+
+class AvailabilityGrid:
+    """
+    origin부터 step 간격으로 n_slots 칸을 가지는 시간 그리드
+    """
+    def __init__(self, origin, step_minutes, n_slots):
+        self.origin = origin
+        self.step = timedelta(minutes=step_minutes)
+        self.n_slots = n_slots
+
+    @classmethod
+    def from_times(cls, times, step_minutes):
+        step_seconds = step_minutes * 60
+        stamps = [int(t.timestamp()) for t in times]
+        if not stamps:
+            return cls(None, step_minutes, 0)
+
+        first = min(stamps)
+        origin_ts = first - first % step_seconds
+        n_slots = (max(stamps) - origin_ts) // step_seconds + 1
+        if n_slots > MAX_GRID_SLOTS:
+            raise ValueError("조율 기간이 너무 깁니다. 그리드 간격(step)을 늘려주세요.")
+        return cls(_EPOCH + timedelta(seconds=origin_ts), step_minutes, n_slots)
+
+    def index(self, t):
+        return int((t - self.origin) // self.step)
+
+    def slot_time(self, i):
+        return self.origin + self.step * i
+
+    def bitset(self, times):
+        bits = 0
+        for t in times:
+            bits |= 1 << self.index(t)
+        return bits
+
+
+def _window_mask(bits, length):
+    """
+    i번째 비트 = i ~ i+length-1 칸이 모두 가능
+    """
+    mask = bits
+    for shift in range(1, length):
+        mask &= bits >> shift
+    return mask
+
+
+def _add_to_planes(planes, mask):
+    """
+    비트 평면 가산기: planes[j]의 i번째 비트 = i번째 칸 합계의 j번째 자리
+    (모든 칸에 대해 동시에 +1 을 수행)
+    """
+    carry = mask
+    j = 0
+    while carry:
+        if j == len(planes):
+            planes.append(0)
+        planes[j], carry = planes[j] ^ carry, planes[j] & carry
+        j += 1
+
+
+def _equal_mask(planes, count, valid):
+    """
+    합계가 정확히 count 인 칸들의 비트마스크
+    """
+    if count >> len(planes):
+        return 0
+    mask = valid
+    for j, plane in enumerate(planes):
+        mask &= plane if (count >> j) & 1 else ~plane
+    return mask
+
+
+def solve_windows(grid, session_masks, length, k):
+    """
+    session_masks: [비트셋, ...] (세션 참여자의 투표 비트셋, 참여자 없으면 0)
+    return: [(시작 칸, [해당 시간대에 가능한 세션 index, ...]), ...]
+      - 커버 세션 수 내림차순, 같은 수면 이른 시간 순
+      - 서로 겹치지 않는 시간대만 선택
+    """
+    n_starts = grid.n_slots - length + 1
+    if n_starts <= 0 or not session_masks:
+        return []
+
+    valid = (1 << n_starts) - 1
+    windows = [_window_mask(bits, length) & valid for bits in session_masks]
+
+    planes = []
+    for mask in windows:
+        _add_to_planes(planes, mask)
+
+    span = (1 << length) - 1
+    occupied = 0
+    results = []
+    for count in range(len(session_masks), 0, -1):
+        candidates = _equal_mask(planes, count, valid)
+        while candidates and len(results) < k:
+            lowest = candidates & -candidates
+            start = lowest.bit_length() - 1
+            candidates ^= lowest
+            if (occupied >> start) & span:
+                continue
+            occupied |= span << start
+            covered = [idx for idx, mask in enumerate(windows) if (mask >> start) & 1]
+            results.append((start, covered))
+        if len(results) >= k:
+            break
+    return results
+
+
+def load_room_votes(room_ids):
+    """
+    여러 방의 투표 / 세션 정보를 2번의 쿼리로 가져옵니다.
+    return: (votes, sessions)
+      votes = {room_id: {nickname: [time, ...]}}
+      sessions = {room_id: [(session_name, participant_nickname), ...]}
+    """
+    through = RoomAvailabilitySlot.voters.through
+    rows = through.objects.filter(
+        roomavailabilityslot__room_id__in=room_ids
+    ).values_list(
+        'roomavailabilityslot__room_id', 'roomavailabilityslot__time', 'user__nickname'
+    )
+
+    votes = defaultdict(lambda: defaultdict(list))
+    for room_id, time, nickname in rows:
+        votes[room_id][nickname].append(time)
+
+    sessions = defaultdict(list)
+    session_rows = Session.objects.filter(room_id__in=room_ids).order_by('id').values_list(
+        'room_id', 'session_name', 'participant_nickname'
+    )
+    for room_id, session_name, nickname in session_rows:
+        sessions[room_id].append((session_name, nickname or None))
+
+    return votes, sessions
+
+
+def parse_solver_params(query_params):
+    """
+    ?step=60&duration=120&k=5 -> (step, length, k)
+    (잘못된 값이면 ValueError)
+    """
+    try:
+        step = int(query_params.get('step', DEFAULT_STEP_MINUTES))
+        duration = int(query_params.get('duration', step))
+        k = int(query_params.get('k', DEFAULT_TOP_K))
+    except (TypeError, ValueError):
+        raise ValueError("step, duration, k는 정수여야 합니다.")
+
+    if step not in ALLOWED_STEP_MINUTES:
+        raise ValueError(f"step은 {ALLOWED_STEP_MINUTES} 중 하나여야 합니다.")
+    if duration <= 0:
+        raise ValueError("duration은 0보다 커야 합니다.")
+
+    length = -(-duration // step)  # 올림
+    k = max(1, min(k, MAX_TOP_K))
+    return step, length, k
+
+
+def _serialize_windows(grid, length, picked, labels):
+    data = []
+    for start, covered in picked:
+        covered_set = set(covered)
+        data.append({
+            "start": grid.slot_time(start),
+            "end": grid.slot_time(start + length),
+            "covered_count": len(covered),
+            "total_sessions": len(labels),
+            "covered_sessions": [labels[i] for i in covered],
+            "missing_sessions": [label for i, label in enumerate(labels) if i not in covered_set],
+        })
+    return data
+
+
+def solve_rooms(rooms, step, length, k):
+    """
+    방 목록(rooms)에 대해 같은 그리드 위에서 top-k 시간대를 계산합니다.
+    - rooms: 방마다의 결과
+    - combined: 모든 방의 세션을 합쳐서 본 결과 (클랜 전체 합주 날짜 잡기용)
+    """
+    room_ids = [room.id for room in rooms]
+    votes, sessions = load_room_votes(room_ids)
+
+    all_times = [t for per_room in votes.values() for times in per_room.values() for t in times]
+    grid = AvailabilityGrid.from_times(all_times, step)
+
+    room_results = []
+    combined_masks, combined_labels = [], []
+    for room in rooms:
+        room_votes = votes.get(room.id, {})
+        masks, labels = [], []
+        for session_name, nickname in sessions.get(room.id, []):
+            bits = grid.bitset(room_votes[nickname]) if nickname in room_votes else 0
+            masks.append(bits)
+            labels.append({"session_name": session_name, "participant_nickname": nickname})
+
+        picked = solve_windows(grid, masks, length, k) if grid.n_slots else []
+        room_results.append({
+            "room_id": room.id,
+            "title": room.title,
+            "windows": _serialize_windows(grid, length, picked, labels),
+        })
+
+        combined_masks.extend(masks)
+        combined_labels.extend({"room_id": room.id, **label} for label in labels)
+
+    combined_picked = solve_windows(grid, combined_masks, length, k) if grid.n_slots else []
+    return {
+        "step": step,
+        "duration": length * step,
+        "grid_start": grid.origin,
+        "grid_slots": grid.n_slots,
+        "rooms": room_results,
+        "combined": _serialize_windows(grid, length, combined_picked, combined_labels),
+    }
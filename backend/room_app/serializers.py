@@ -6,6 +6,7 @@ from .models import (
 )
 from user_app.models import User
 from user_app.serializers import UserBaseSerializer
+from clan_app.roles import get_clan_role
 
 class SessionReservationSerializer(serializers.ModelSerializer):
     """
@@ -72,14 +73,16 @@ class RoomListSerializer(serializers.ModelSerializer):
         fields = [
             'id', 'title', 'song', 'artist', 'manager_nickname', 
             'sessions', 'session_count', 'participant_count', 
-            'created_at', 'clan', 'confirmed', 'is_private', 'ended'
+            'created_at', 'clan', 'confirmed', 'is_private', 'ended',
+            'version'  # [추가] 방 상태 버전 (실시간/증분 갱신 비교용)
         ]
 
     def get_session_count(self, obj):
         return obj.sessions.count()
 
     def get_participant_count(self, obj):
-        return obj.sessions.filter(participant_nickname__isnull=False).count()
+        # [수정] prefetch된 세션을 재사용 (방마다 COUNT 쿼리를 날리지 않음)
+        return sum(1 for s in obj.sessions.all() if s.participant_nickname is not None)
 
 
 class RoomDetailSerializer(serializers.ModelSerializer):
@@ -115,16 +118,11 @@ class RoomDetailSerializer(serializers.ModelSerializer):
         if not request or not request.user.is_authenticated:
             return False
             
-        if not obj.clan:
+        if not obj.clan_id:
             return False
             
         # 클랜장 또는 운영진인지 확인
-        try:
-             is_owner = obj.clan.owner == request.user
-             is_admin = obj.clan.admins.filter(id=request.user.id).exists()
-             return is_owner or is_admin
-        except Exception:
-            return False
+        return get_clan_role(request, obj.clan_id).is_owner_or_admin
 
 
 class MyRoomListSerializer(RoomListSerializer):
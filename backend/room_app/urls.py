@@ -9,6 +9,9 @@ urlpatterns = [
     # '내 방 목록'
     path('my/', views.MyRoomListView.as_view(), name='my-room-list'), 
     
+    # 리더보드 (manner / mood_maker / rehearsals)
+    path('leaderboards/<str:board>/', views.LeaderboardView.as_view(), name='leaderboard'),
+
     # [추가] 특정 유저의 방 목록 (예: /api/v1/rooms/my/cho)
     path('my/<str:nickname>/', views.UserRoomListView.as_view(), name='user-room-list'),
 
@@ -28,4 +31,5 @@ urlpatterns = [
     path('sessions/<int:session_id>/reserve/', views.ReserveSessionView.as_view(), name='reserve-session'),
     path('sessions/<int:session_id>/cancel-reserve/', views.CancelReservationView.as_view(), name='cancel-reservation'),
     path('<int:room_id>/availability/', views.RoomAvailabilityView.as_view(), name='room-availability'),
+    path('<int:room_id>/availability/best/', views.RoomBestTimeView.as_view(), name='room-availability-best'),
 ]
\ No newline at end of file
@@ -0,0 +1,49 @@
+# room_app/versioning.py
+"""
+방 상태 버전
+
+세션 참여/취소, 예약, 확정, 종료 등 방 상태가 바뀌면 전역 시퀀스에서
+다음 값을 받아 Room.version에 기록합니다.
+클라이언트는 마지막으로 받은 버전(since)보다 큰 방만 다시 받으면 됩니다.
+
+시퀀스 행은 UPDATE로 잠기므로, 먼저 버전을 받은 트랜잭션이 먼저 커밋됩니다.
+(나중 버전이 먼저 보이고 이전 버전이 늦게 커밋되는 일이 없음)
+"""
+import hashlib
+
+from django.db import transaction
+from django.db.models import F
+
+from clan_app import activity
+from .models import Room, RoomVersionSequence
+
+
+def next_room_version():
+    with transaction.atomic():
+        if not RoomVersionSequence.objects.filter(pk=1).update(value=F('value') + 1):
+            RoomVersionSequence.objects.get_or_create(pk=1)
+            RoomVersionSequence.objects.filter(pk=1).update(value=F('value') + 1)
+        return RoomVersionSequence.objects.values_list('value', flat=True).get(pk=1)
+
+
+def bump_room_version(*room_ids):
+    """
+    방 상태가 바뀐 뒤 호출합니다. return: 새 버전
+    """
+    with transaction.atomic():
+        version = next_room_version()
+        Room.objects.filter(pk__in=room_ids).update(version=version)
+        # 클랜 방이면 클랜 활동 현황 캐시도 무효화
+        activity.invalidate_rooms(room_ids)
+    return version
+
+
+def room_state_etag(id_versions):
+    """
+    [(room_id, version), ...] -> ETag
+    (방 목록 구성이 바뀌거나, 어느 방이든 버전이 오르면 달라짐)
+    """
+    ids = ",".join(str(room_id) for room_id, _ in sorted(id_versions))
+    max_version = max((version for _, version in id_versions), default=0)
+    digest = hashlib.md5(ids.encode()).hexdigest()[:12]
+    return f'W/"rooms-{max_version}-{digest}"'
@@ -24,6 +24,15 @@ from .serializers import (
     MyRoomListSerializer 
 )
 from clan_app.models import Clan 
+from clan_app import activity as clan_activity
+from clan_app import stats as clan_stats
+from clan_app import timeline as clan_timeline
+from clan_app.roles import get_clan_role
+from .scheduling import parse_solver_params, solve_rooms
+from .manner import apply_evaluations
+from . import leaderboard, lobby
+from .versioning import bump_room_version, next_room_version, room_state_etag
+from config.chat_history import RecentChatHistory, parse_history_params
 
 # 1. Room
 # -----------------------------------------------------------------
@@ -80,6 +89,8 @@ class RoomListCreateAPIView(generics.ListCreateAPIView):
 
         # ✅ save()에서 manager_nickname 제거 (이미 포함됨)
         db_room = room_serializer.save()
+        clan_stats.record_room(db_room, rooms_created=1)
+        clan_timeline.add(db_room.clan_id, 'room', db_room.id, user, db_room.title)
 
         # 2. 세션 생성
         session_instances = []
@@ -95,6 +106,8 @@ class RoomListCreateAPIView(generics.ListCreateAPIView):
                 manager_session.save()
         except Session.DoesNotExist:
             pass
+        version = bump_room_version(db_room.id)
+        lobby.publish_room('room_created', db_room, version)
 
         # 응답 데이터 생성
         response_serializer = self.get_serializer(db_room)
@@ -104,6 +117,12 @@ class RoomListCreateAPIView(generics.ListCreateAPIView):
 class MyRoomListView(generics.ListAPIView):
     """
     (GET) /api/v1/rooms/my/
+    (GET) /api/v1/rooms/my/?since=<version>
+
+    - since 없음: 기존과 동일한 방 목록 (+ ETag 헤더)
+    - since 있음: {version, room_ids, rooms} 형태로 since 이후 바뀐 방만 반환
+      (room_ids는 현재 내 방 전체 id 목록 - 목록에서 빠진 방 정리용)
+    - If-None-Match가 현재 ETag와 같으면 304
     """
     serializer_class = MyRoomListSerializer
     permission_classes = [permissions.IsAuthenticated]
@@ -112,11 +131,43 @@ class MyRoomListView(generics.ListAPIView):
         user = self.request.user
         
         # 내가 매니저이거나, 내가 세션에 참여 중인 방
-        # 내가 매니저이거나, 내가 세션에 참여 중인 방
+        # [수정] OR 조인 + distinct() 대신 서브쿼리 사용 (중복 행이 생기지 않음)
+        joined_room_ids = Session.objects.filter(
+            participant_nickname=user.nickname
+        ).values('room_id')
         return Room.objects.filter(
             Q(manager_nickname=user.nickname) | 
-            Q(sessions__participant_nickname=user.nickname)
-        ).prefetch_related('sessions').distinct().order_by('-created_at')
+            Q(id__in=joined_room_ids)
+        ).prefetch_related('sessions__reservations__user').order_by('-created_at')
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.get_queryset()
+
+        # 1. 버전만 먼저 조회 (가벼운 쿼리)
+        id_versions = list(queryset.values_list('id', 'version'))
+        etag = room_state_etag(id_versions)
+        if request.headers.get('If-None-Match') == etag:
+            return Response(status=status.HTTP_304_NOT_MODIFIED, headers={'ETag': etag})
+
+        since = request.query_params.get('since')
+        if since is None:
+            response = super().list(request, *args, **kwargs)
+            response['ETag'] = etag
+            return response
+
+        try:
+            since = int(since)
+        except ValueError:
+            return Response({"detail": "since는 정수여야 합니다."}, status=status.HTTP_400_BAD_REQUEST)
+
+        # 2. 바뀐 방만 직렬화
+        changed = queryset.filter(version__gt=since)
+        serializer = self.get_serializer(changed, many=True)
+        return Response({
+            "version": max((version for _, version in id_versions), default=0),
+            "room_ids": [room_id for room_id, _ in id_versions],
+            "rooms": serializer.data,
+        }, headers={'ETag': etag})
 
 
 class RoomDetailAPIView(generics.RetrieveUpdateDestroyAPIView):
@@ -134,7 +185,10 @@ class RoomDetailAPIView(generics.RetrieveUpdateDestroyAPIView):
         room = self.get_object()
         if room.manager_nickname != request.user.nickname:
             raise PermissionDenied("방 정보는 방장만 수정할 수 있습니다.")
-        return super().update(request, *args, **kwargs)
+        response = super().update(request, *args, **kwargs)
+        version = bump_room_version(room.id)
+        lobby.publish_room('room_updated', room, version)
+        return response
 
     # (DELETE) 방장이 방 삭제
     def destroy(self, request, *args, **kwargs):
@@ -142,17 +196,18 @@ class RoomDetailAPIView(generics.RetrieveUpdateDestroyAPIView):
         
         is_manager = room.manager_nickname == request.user.nickname
         is_clan_admin = False
-        if room.clan:
+        if room.clan_id:
             # 클랜 방인 경우, 클랜장 또는 운영진도 삭제 가능
-            is_clan_admin = (
-                room.clan.owner == request.user or 
-                room.clan.admins.filter(id=request.user.id).exists()
-            )
+            is_clan_admin = get_clan_role(request, room.clan_id).is_owner_or_admin
 
         if not (is_manager or is_clan_admin):
             raise PermissionDenied("방 삭제 권한이 없습니다.")
-            
-        return super().destroy(request, *args, **kwargs)
+
+        with transaction.atomic():
+            lobby.publish('room_removed', room, next_room_version())
+            clan_activity.invalidate(room.clan_id)
+            clan_timeline.remove(room.clan_id, 'room', room.id)
+            return super().destroy(request, *args, **kwargs)
 
 # 2. Session
 # -----------------------------------------------------------------
@@ -175,6 +230,8 @@ class RoomSessionJoinView(APIView):
             if selected_session.participant_nickname == user.nickname:
                 selected_session.participant_nickname = None
                 selected_session.save()
+                version = bump_room_version(room_id)
+                lobby.publish_session(selected_session, version)
                 return Response({"detail": "세션 참여가 취소되었습니다."}, status=status.HTTP_200_OK)
 
             # Case 2: User clicked a session that is already full
@@ -187,6 +244,8 @@ class RoomSessionJoinView(APIView):
             # Now, join the new session
             selected_session.participant_nickname = user.nickname
             selected_session.save()
+            version = bump_room_version(room_id)
+            lobby.publish_session(selected_session, version)
             
             return Response({"detail": "세션에 참여했습니다."}, status=status.HTTP_200_OK)
 
@@ -211,10 +270,13 @@ class RoomLeaveView(APIView):
             return Response({"detail": "방장은 방을 나갈 수 없습니다."}, status=status.HTTP_400_BAD_REQUEST)
 
         # 이 방에서 사용자의 세션 참여를 취소
-        Session.objects.filter(
+        left_count = Session.objects.filter(
             room=room, 
             participant_nickname=user.nickname
         ).update(participant_nickname=None)
+        if left_count:
+            version = bump_room_version(room.id)
+            lobby.publish_room('room_updated', room, version)
         
         return Response({"detail": "방에서 나갔습니다."}, status=status.HTTP_200_OK)
 
@@ -232,10 +294,7 @@ class RoomKickView(APIView):
         is_manager = room.manager_nickname == request.user.nickname
         is_clan_admin = False
         if room.clan:
-             is_clan_admin = (
-                room.clan.owner == request.user or 
-                room.clan.admins.filter(id=request.user.id).exists()
-            )
+             is_clan_admin = get_clan_role(request, room.clan_id).is_owner_or_admin
         
         if not (is_manager or is_clan_admin):
             raise PermissionDenied("강퇴 권한이 없습니다.")
@@ -250,6 +309,8 @@ class RoomKickView(APIView):
         ).update(participant_nickname=None)
 
         if kicked_count > 0:
+            version = bump_room_version(room.id)
+            lobby.publish_room('room_updated', room, version)
             return Response({"detail": f"{target_nickname}님을 강퇴했습니다."}, status=status.HTTP_200_OK)
         else:
             return Response({"detail": "강퇴할 멤버가 방에 없습니다."}, status=status.HTTP_400_BAD_REQUEST)
@@ -280,6 +341,9 @@ class RoomConfirmView(APIView):
         room.confirmed = True
         room.confirmed_at = timezone.now()
         room.save()
+        clan_stats.record_room(room, rooms_confirmed=1)
+        version = bump_room_version(room.id)
+        lobby.publish('room_confirmed', room, version)
         
         # TODO: 참여자들에게 알림 생성
         
@@ -302,12 +366,20 @@ class RoomEndView(APIView):
         if not room.confirmed:
             return Response({"detail": "확정되지 않은 방은 종료할 수 없습니다."}, status=status.HTTP_400_BAD_REQUEST)
             
-        if room.ended:
-            return Response({"detail": "이미 종료된 방입니다."}, status=status.HTTP_400_BAD_REQUEST)
-
-        room.ended = True
-        room.ended_at = timezone.now()
-        room.save()
+        with transaction.atomic():
+            # [수정] 종료 상태 전환을 UPDATE 1번으로 선점 (동시 요청 중 하나만 통계/리더보드 반영)
+            ended_at = timezone.now()
+            if not Room.objects.filter(pk=room.pk, ended=False).update(ended=True, ended_at=ended_at):
+                return Response({"detail": "이미 종료된 방입니다."}, status=status.HTTP_400_BAD_REQUEST)
+            room.ended = True
+            room.ended_at = ended_at
+
+            clan_stats.record_room(room, rooms_ended=1)
+            version = bump_room_version(room.id)
+            lobby.publish('room_removed', room, version)
+
+            # 참여자들의 '완료한 합주 수' 리더보드 갱신 (랭크 테이블 반영은 커밋 후)
+            leaderboard.record_room_ended(room)
         
         # TODO: 평가 알림 생성
         
@@ -337,41 +409,116 @@ class MannerEvaluationAPIView(APIView):
         if Evaluation.objects.filter(room=room, evaluator=evaluator).exists():
             return Response({"detail": "이미 이 방의 평가를 제출했습니다."}, status=status.HTTP_400_BAD_REQUEST)
 
+        # 평가 대상 유저를 한 번의 쿼리로 조회
+        target_nicknames = [data.get("target_nickname") for data in evaluations_data]
+        targets = {
+            u.nickname: u for u in User.objects.filter(nickname__in=target_nicknames)
+        }
+
         evaluations_to_create = []
         for data in evaluations_data:
-            try:
-                target_user = User.objects.get(nickname=data.get("target_nickname"))
-                
-                # 자기 자신은 평가 X
-                if evaluator == target_user:
-                    continue 
-                    
-                evaluations_to_create.append(
-                    Evaluation(
-                        room=room,
-                        evaluator=evaluator,
-                        target=target_user,
-                        score=data.get("score", 50),
-                        comment=data.get("comment", ""),
-                        is_mood_maker=data.get("is_mood_maker", False)
-                    )
-                )
-            except User.DoesNotExist:
+            target_user = targets.get(data.get("target_nickname"))
+            if target_user is None:
                 continue # 없는 유저는 스킵
 
-        Evaluation.objects.bulk_create(evaluations_to_create)
+            # 자기 자신은 평가 X
+            if evaluator == target_user:
+                continue
+
+            evaluations_to_create.append(
+                Evaluation(
+                    room=room,
+                    evaluator=evaluator,
+                    target=target_user,
+                    score=data.get("score", 50),
+                    comment=data.get("comment", ""),
+                    is_mood_maker=data.get("is_mood_maker", False)
+                )
+            )
+
+        with transaction.atomic():
+            created = Evaluation.objects.bulk_create(evaluations_to_create)
+            # 대상 유저별 매너 점수 누적 합계 갱신
+            apply_evaluations(created)
         
         # TODO: 평가 완료 알림의 is_read = True 처리
         
         return Response({"detail": "평가가 제출되었습니다."}, status=status.HTTP_201_CREATED)
 
+class LeaderboardView(APIView):
+    """
+    (GET) /api/v1/rooms/leaderboards/<str:board>/?clan=<id>&limit=10&nickname=<nickname>
+    board: manner(매너 점수) / mood_maker(분위기 메이커) / rehearsals(완료한 합주)
+    상위 N명 + 내 순위 (nickname을 주면 해당 유저의 순위)
+    """
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request, board):
+        if board not in leaderboard.BOARDS:
+            return Response({"detail": "존재하지 않는 리더보드입니다."}, status=status.HTTP_404_NOT_FOUND)
+
+        clan_id = request.query_params.get('clan')
+        try:
+            limit = max(1, min(int(request.query_params.get('limit', 10)), 100))
+            clan_id = int(clan_id) if clan_id else None
+        except ValueError:
+            return Response({"detail": "잘못된 파라미터입니다."}, status=status.HTTP_400_BAD_REQUEST)
+
+        if clan_id is not None:
+            get_object_or_404(Clan, pk=clan_id)
+        table = leaderboard.get_table(board, clan_id)
+
+        top = table.top(limit)
+        users = {u.id: u for u in User.objects.filter(id__in=[user_id for user_id, _ in top])}
+        top_data = []
+        for user_id, value in top:
+            if user_id not in users:
+                continue
+            top_data.append({
+                "rank": table.rank(user_id),
+                "user": UserBaseSerializer(users[user_id]).data,
+                "value": value,
+            })
+
+        target = request.user
+        nickname = request.query_params.get('nickname')
+        if nickname:
+            target = get_object_or_404(User, nickname=nickname)
+        target_rank = table.rank(target.id)
+
+        return Response({
+            "board": board,
+            "clan": clan_id,
+            "total": len(table),
+            "top": top_data,
+            "user": {
+                "nickname": target.nickname,
+                "rank": target_rank,
+                "value": table.values.get(target.id),
+            },
+        })
+
 # 4. Chat
 # -----------------------------------------------------------------
 
+def _load_room_chats(room_id, before, limit):
+    queryset = GroupChat.objects.filter(room_id=room_id)
+    if before is not None:
+        queryset = queryset.filter(timestamp__lt=before)
+    return list(queryset.order_by('-timestamp', '-id')[:limit])
+
+
+# 합주방 채팅 최근 메시지 링 버퍼
+room_chat_history = RecentChatHistory('room', _load_room_chats)
+
+
 class GroupChatView(generics.ListCreateAPIView):
     """
     (GET) /api/v1/rooms/<int:room_id>/chat/
+    (GET) /api/v1/rooms/<int:room_id>/chat/?before=<timestamp>&limit=100
     (POST) /api/v1/rooms/<int:room_id>/chat/
+    [수정] 전체 기록 대신 최근 메시지(과거 -> 최신 순)만 반환,
+    더 오래된 메시지는 before로 요청
     """
     serializer_class = GroupChatSerializer
     permission_classes = [permissions.IsAuthenticated]
@@ -381,13 +528,25 @@ class GroupChatView(generics.ListCreateAPIView):
         # TODO: 사용자가 이 방에 참여했는지 확인
         return GroupChat.objects.filter(room_id=room_id).order_by('timestamp')
 
+    def list(self, request, *args, **kwargs):
+        room_id = self.kwargs.get('room_id')
+        # TODO: 사용자가 이 방에 참여했는지 확인
+        try:
+            before, limit = parse_history_params(request.query_params, default_limit=100)
+        except ValueError as e:
+            return Response({"detail": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        messages = room_chat_history.recent(room_id, limit, before=before)
+        return Response(self.get_serializer(messages[::-1], many=True).data)
+
     def perform_create(self, serializer):
         room_id = self.kwargs.get('room_id')
         room = get_object_or_404(Room, id=room_id)
         # TODO: 사용자가 이 방에 참여했는지 확인
         
         # [수정] sender를 request.user.nickname으로
-        serializer.save(room=room, sender=self.request.user.nickname) 
+        chat = serializer.save(room=room, sender=self.request.user.nickname) 
+        transaction.on_commit(lambda: room_chat_history.append(room.id, chat))
         
         # TODO: 채팅 알림 생성 (방에 있으면서, 내가 아닌 사람에게)
 
@@ -413,6 +572,8 @@ class ReserveSessionView(APIView):
             return Response({"detail": "이미 예약한 세션입니다."}, status=status.HTTP_400_BAD_REQUEST)
 
         SessionReservation.objects.create(session=session, user=user)
+        version = bump_room_version(session.room_id)
+        lobby.publish_session(session, version)
         return Response({"detail": "세션 예약이 완료되었습니다."}, status=status.HTTP_201_CREATED)
 
 class CancelReservationView(APIView):
@@ -428,6 +589,8 @@ class CancelReservationView(APIView):
 
         reservation = get_object_or_404(SessionReservation, session=session, user=user)
         reservation.delete()
+        version = bump_room_version(session.room_id)
+        lobby.publish_session(session, version)
         
         return Response({"detail": "세션 예약이 취소되었습니다."}, status=status.HTTP_200_OK)
 
@@ -496,6 +659,29 @@ class RoomAvailabilityView(APIView):
         # 4. 업데이트된 현황 반환
         return self.get(request, room_id)
     
+class RoomBestTimeView(APIView):
+    """
+    (GET) /api/v1/rooms/<int:room_id>/availability/best/?duration=120&step=60&k=5
+    투표 현황으로 세션이 가장 많이 모이는 연속 시간대 top-k 계산
+    """
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request, room_id):
+        room = get_object_or_404(Room, id=room_id)
+        try:
+            step, length, k = parse_solver_params(request.query_params)
+            result = solve_rooms([room], step, length, k)
+        except ValueError as e:
+            return Response({"detail": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        room_result = result["rooms"][0]
+        return Response({
+            "room_id": room.id,
+            "step": result["step"],
+            "duration": result["duration"],
+            "windows": room_result["windows"],
+        })
+
 # [추가] 특정 사용자의 방 목록 조회 (프로필용)
 class UserRoomListView(generics.ListAPIView):
     serializer_class = RoomListSerializer
@@ -524,7 +710,7 @@ class ClanRoomListAPIView(generics.ListCreateAPIView):
 
     def get_queryset(self):
         clan = get_object_or_404(Clan, pk=self.kwargs['pk'])
-        if not clan.members.filter(id=self.request.user.id).exists():
+        if not get_clan_role(self.request, clan).is_member:
              raise PermissionDenied("클랜 멤버만 조회할 수 있습니다.")
         
         sort_by = self.request.query_params.get('sort', 'latest')
@@ -540,7 +726,7 @@ class ClanRoomListAPIView(generics.ListCreateAPIView):
         clan = get_object_or_404(Clan, pk=self.kwargs['pk'])
         
         # 멤버 확인
-        if not clan.members.filter(id=request.user.id).exists():
+        if not get_clan_role(request, clan).is_member:
             raise PermissionDenied("클랜 멤버만 방을 생성할 수 있습니다.")
 
         sessions_data = request.data.get("sessions", [])
@@ -559,6 +745,8 @@ class ClanRoomListAPIView(generics.ListCreateAPIView):
             manager_nickname=request.user.nickname,
             clan=clan  # <-- 이 부분이 있어야 클랜 방이 됩니다!
         )
+        clan_stats.record(clan.id, rooms_created=1)
+        clan_timeline.add(clan.id, 'room', db_room.id, request.user, db_room.title)
 
         # 세션 생성 (일반 방 생성 로직과 동일)
         session_instances = []
@@ -574,6 +762,7 @@ class ClanRoomListAPIView(generics.ListCreateAPIView):
                 manager_session.save()
         except Session.DoesNotExist:
             pass
+        bump_room_version(db_room.id)
 
         response_serializer = self.get_serializer(db_room)
         headers = self.get_success_headers(response_serializer.data)
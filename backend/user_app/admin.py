@@ -6,7 +6,8 @@ from .models import (
     FriendRequest, 
     VerificationCode, 
     DirectChat,
-    Alert
+    Alert,
+    AlertArchive,
 )
 
 
@@ -33,4 +34,5 @@ admin.site.register(UserDevice)
 admin.site.register(FriendRequest)
 admin.site.register(VerificationCode)
 admin.site.register(DirectChat)
-admin.site.register(Alert)
\ No newline at end of file
+admin.site.register(Alert)
+admin.site.register(AlertArchive)
@@ -0,0 +1,155 @@
+# user_app/alerts.py
+"""
+알림 묶기 / 보관 (Alert -> AlertArchive)
+
+묶기 (notify)
+같은 (유저, 알림 종류, related_url)의 읽지 않은 알림이 COALESCE_WINDOW 안에 있으면
+새 행을 만들지 않고 그 알림의 count, 시각(created_at), 메시지만 갱신합니다.
+(DM 50개 연속 -> 알림 1행, count=50)
+같은 유저의 알림 생성은 유저 행 잠금(select_for_update)으로 순서대로 처리합니다.
+
+보관
+
+Alert 테이블은 알림함(최근 알림)만 들고 있도록 유지합니다.
+- 읽은 지 오래된 알림: created_at이 ALERT_ARCHIVE_DAYS일보다 오래된 읽은 알림은 보관 테이블로 이동
+- 알림함 한도: 유저별로 최신 ALERT_INBOX_LIMIT개만 남기고 나머지(오래된 순)는 보관 테이블로 이동
+알림함 조회(user, is_read, -created_at 인덱스)는 전체 기록 양과 관계없이 최대 한도만큼만 읽습니다.
+
+실행 시점
+- 알림이 저장되면(post_save) 커밋 후 해당 유저의 알림함 한도를 확인 (유저별 TRIM_INTERVAL에 1번)
+  그때 전체 보관 작업도 SWEEP_INTERVAL에 1번, 배치 1개(BATCH_SIZE행)만 실행
+- bulk_create는 시그널이 없으므로 `python manage.py archive_alerts`를 주기적으로 실행 (전체 처리)
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .models import Alert, AlertArchive, User
+
+COALESCE_WINDOW = 60 * 30  # 초
+BATCH_SIZE = 1000
+TRIM_INTERVAL = 60 * 10
+SWEEP_INTERVAL = 60 * 60
+
+_ARCHIVE_FIELDS = (
+    'id', 'user_id', 'alert_type', 'message', 'related_id', 'related_url', 'is_read', 'created_at', 'count',
+)
+
+
+def archive_days():
+    return getattr(settings, 'ALERT_ARCHIVE_DAYS', 30)
+
+
+def inbox_limit():
+    return getattr(settings, 'ALERT_INBOX_LIMIT', 200)
+
+
+def notify(user, message, alert_type='SYSTEM', related_url=None, related_id=None,
+           coalesced_message=None, window=COALESCE_WINDOW):
+    """
+    알림 생성 (묶을 수 있으면 기존 알림 갱신)
+    coalesced_message: 2번 이상 묶였을 때 쓸 메시지 (예: "{count}개의 메시지를 보냈습니다.")
+    return: (alert, created) - created가 False면 기존 알림에 묶인 것 (푸시 알림은 created일 때만)
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        # 묶을 알림이 아직 없을 때도 동시 요청이 둘 다 새 행을 만들지 않도록 유저 행으로 직렬화
+        list(User.objects.select_for_update().filter(pk=user.pk).values_list('pk', flat=True))
+        alert = Alert.objects.filter(
+            user=user, alert_type=alert_type, related_url=related_url,
+            is_read=False, created_at__gte=now - timedelta(seconds=window),
+        ).order_by('-created_at', '-id').first()
+        if alert is None:
+            alert = Alert.objects.create(
+                user=user, alert_type=alert_type, message=message,
+                related_url=related_url, related_id=related_id,
+            )
+            return alert, True
+
+        alert.count += 1
+        alert.created_at = now
+        alert.related_id = related_id
+        alert.message = coalesced_message.format(count=alert.count) if coalesced_message else message
+        alert.save(update_fields=['count', 'created_at', 'related_id', 'message'])
+        return alert, False
+
+
+@transaction.atomic
+def _move(alert_ids):
+    """
+    알림들을 보관 테이블로 옮김 -> 옮긴 개수
+    """
+    rows = Alert.objects.filter(id__in=alert_ids).select_for_update().values_list(*_ARCHIVE_FIELDS)
+    now = timezone.now()
+    archived = AlertArchive.objects.bulk_create([
+        AlertArchive(
+            original_id=alert_id, user_id=user_id, alert_type=alert_type, message=message,
+            related_id=related_id, related_url=related_url, is_read=is_read,
+            created_at=created_at, count=count, archived_at=now,
+        )
+        for alert_id, user_id, alert_type, message, related_id, related_url, is_read, created_at, count in rows
+    ])
+    Alert.objects.filter(id__in=[row.original_id for row in archived]).delete()
+    return len(archived)
+
+
+def archive_read_alerts(days=None, max_batches=None):
+    """
+    오래된 읽은 알림을 BATCH_SIZE개씩 보관 -> 옮긴 개수
+    """
+    cutoff = timezone.now() - timedelta(days=archive_days() if days is None else days)
+    queryset = Alert.objects.filter(is_read=True, created_at__lt=cutoff).order_by('id')
+    moved = 0
+    batches = 0
+    while max_batches is None or batches < max_batches:
+        alert_ids = list(queryset.values_list('id', flat=True)[:BATCH_SIZE])
+        if not alert_ids:
+            break
+        moved += _move(alert_ids)
+        batches += 1
+    return moved
+
+
+def trim_inbox(user_id, limit=None):
+    """
+    유저의 알림함에서 최신 limit개를 제외한 나머지를 보관 -> 옮긴 개수
+    """
+    limit = inbox_limit() if limit is None else limit
+    overflow = Alert.objects.filter(user_id=user_id).order_by('-created_at', '-id').values_list('id', flat=True)
+    moved = 0
+    while True:
+        alert_ids = list(overflow[limit:limit + BATCH_SIZE])
+        if not alert_ids:
+            return moved
+        moved += _move(alert_ids)
+
+
+def trim_all_inboxes(limit=None):
+    """
+    한도를 넘은 모든 유저의 알림함 정리 -> 옮긴 개수
+    """
+    limit = inbox_limit() if limit is None else limit
+    user_ids = Alert.objects.filter(user__isnull=False).values('user_id').annotate(
+        n=Count('id')
+    ).filter(n__gt=limit).values_list('user_id', flat=True)
+    return sum(trim_inbox(user_id, limit) for user_id in list(user_ids))
+
+
+def _maintain(user_id):
+    if user_id is not None and cache.add(f"alert_trim:{user_id}", 1, TRIM_INTERVAL):
+        trim_inbox(user_id)
+    if cache.add("alert_archive_sweep", 1, SWEEP_INTERVAL):
+        archive_read_alerts(max_batches=1)
+
+
+@receiver(post_save, sender=Alert)
+def _on_alert_created(sender, instance, created, **kwargs):
+    if created:
+        # 정리 작업이 실패해도 알림을 만든 요청은 실패시키지 않음
+        transaction.on_commit(lambda: _maintain(instance.user_id), robust=True)
@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class UserAppConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'user_app'
+
+    def ready(self):
+        # 유저 스냅샷 / 프로필 캐시 무효화, 친구 그래프 변경 로그, 알림함 정리 시그널 등록
+        from . import alerts, authentication, friend_graph, profiles  # noqa: F401
@@ -0,0 +1,126 @@
+# user_app/authentication.py
+"""
+JWT 인증
+
+1) CachedJWTAuthentication (DRF, settings.REST_FRAMEWORK에 등록)
+   simplejwt의 JWTAuthentication은 요청마다 User 행을 조회합니다.
+   프론트가 여러 API를 3~10초마다 폴링하므로, 유저 행(비밀번호 제외)을
+   user id별 버전 키로 짧게(SNAPSHOT_TIMEOUT) 캐시합니다.
+   User가 save/delete되면 (커밋 후) 버전을 올려 바로 무효화하므로
+   AdminSetRoleView / AdminApproveUserView의 역할/상태 변경은 즉시 반영됩니다.
+   (QuerySet.update()처럼 save를 거치지 않는 변경은 invalidate_user_snapshot 호출 필요)
+
+2) JWTAuthMiddleware (웹소켓, Channels)
+   브라우저 WebSocket은 Authorization 헤더를 보낼 수 없으므로
+   `ws://.../?token=<access token>` 쿼리 파라미터로 액세스 토큰을 받습니다.
+   토큰이 없거나 유효하지 않으면 기존 scope['user'] (세션 인증 / 익명)를 그대로 둡니다.
+"""
+from urllib.parse import parse_qs
+
+from channels.db import database_sync_to_async
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import router, transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken, TokenError
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import AccessToken
+
+from config.cache_versions import bump_version, get_version
+
+SNAPSHOT_TIMEOUT = 60  # 초
+
+
+def _version_name(user_id):
+    return f"user_snapshot:{user_id}"
+
+
+def _snapshot_fields(User):
+    # 비밀번호 해시는 캐시에 두지 않음 (필요하면 접근 시 DB에서 지연 로딩)
+    return [field.attname for field in User._meta.concrete_fields if field.attname != 'password']
+
+
+def get_cached_user(user_id):
+    """
+    캐시된 스냅샷으로 User 인스턴스를 만듭니다. (없으면 None)
+    스냅샷에 없는 password는 deferred 필드이므로 save()해도 덮어쓰지 않습니다.
+    """
+    User = get_user_model()
+    fields = _snapshot_fields(User)
+    key = f"user_snapshot:{user_id}:{get_version(_version_name(user_id))}"
+    values = cache.get(key)
+    if values is None:
+        values = User.objects.filter(
+            **{api_settings.USER_ID_FIELD: user_id}
+        ).values_list(*fields).first()
+        if values is None:
+            return None
+        cache.set(key, values, SNAPSHOT_TIMEOUT)
+    return User.from_db(router.db_for_read(User), fields, values)
+
+
+def invalidate_user_snapshot(user_id):
+    transaction.on_commit(lambda: bump_version(_version_name(user_id)))
+
+
+@receiver(post_save, sender='user_app.User')
+@receiver(post_delete, sender='user_app.User')
+def _invalidate_on_change(sender, instance, **kwargs):
+    invalidate_user_snapshot(instance.pk)
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    JWTAuthentication과 같지만 User 행 대신 캐시된 스냅샷을 사용
+    """
+    def get_user(self, validated_token):
+        if api_settings.CHECK_REVOKE_TOKEN:
+            # 비밀번호 해시 비교가 필요하므로 DB 조회
+            return super().get_user(validated_token)
+
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError as e:
+            raise InvalidToken(_("Token contained no recognizable user identification")) from e
+
+        user = get_cached_user(user_id)
+        if user is None:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found")
+        if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+        return user
+
+
+@database_sync_to_async
+def get_user_from_token(raw_token):
+    try:
+        token = AccessToken(raw_token)
+    except TokenError:
+        return None
+
+    user_id = token.get(api_settings.USER_ID_CLAIM)
+    if user_id is None:
+        return None
+    user = get_cached_user(user_id)
+    return user if user is not None and user.is_active else None
+
+
+class JWTAuthMiddleware:
+    """
+    ?token= 쿼리 파라미터의 JWT로 scope['user']를 설정
+    (asgi.py에서 AuthMiddlewareStack 안쪽에 둡니다)
+    """
+    def __init__(self, inner):
+        self.inner = inner
+
+    async def __call__(self, scope, receive, send):
+        query = parse_qs(scope.get('query_string', b'').decode())
+        raw_token = (query.get('token') or [None])[0]
+        if raw_token:
+            user = await get_user_from_token(raw_token)
+            if user is not None:
+                scope = dict(scope, user=user)
+        return await self.inner(scope, receive, send)
@@ -0,0 +1,257 @@
+# user_app/friend_graph.py
+"""
+친구 그래프 + 친구 추천
+
+User.friends(대칭 M2M)를 프로세스마다 CSR 형태(array 두 개)로 메모리에 들고 있고,
+추천은 DB를 다시 읽지 않고 2단계 이웃을 세어 계산합니다.
+  indptr[i]..indptr[i+1] 구간의 indices = i번째 유저의 친구 id (정렬됨)
+
+동기화 (증분)
+- 친구 추가/삭제(m2m_changed) 시 커밋 후 'friend_graph' 버전을 올리고
+  변경 내용을 friend_graph:log:<버전> 키에 남깁니다.
+- 각 프로세스는 그래프를 쓸 때 버전을 비교해 밀린 로그만 적용합니다.
+  (로그가 만료/유실되었거나 너무 많이 밀렸으면 DB에서 다시 만듦)
+- 적용된 변경은 CSR을 바로 고치지 않고 overlay(추가/삭제 집합)에 두었다가
+  COMPACT_AFTER개가 쌓이면 CSR을 다시 만듭니다.
+
+추천 점수 = 함께 아는 친구 * 3 + 같은 클랜 * 2 + 같은 합주방 참여 * 1
+(클랜/합주방 공통 수는 유저별로 AFFINITY_TIMEOUT 동안 캐시)
+"""
+import threading
+from array import array
+from collections import Counter, defaultdict
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, Q
+from django.db.models.signals import m2m_changed
+from django.dispatch import receiver
+
+from config.cache_versions import bump_version, get_version
+from room_app.models import Session
+from .models import FriendRequest, User
+
+VERSION_NAME = 'friend_graph'
+LOG_TIMEOUT = 60 * 60
+# 이보다 많이 밀렸으면 로그를 적용하지 않고 다시 만듦
+MAX_REPLAY = 500
+# overlay 변경이 이만큼 쌓이면 CSR 재구성
+COMPACT_AFTER = 1000
+AFFINITY_TIMEOUT = 60 * 10
+
+WEIGHTS = {'mutual_friends': 3, 'shared_clans': 2, 'shared_rooms': 1}
+DEFAULT_LIMIT = 20
+MAX_LIMIT = 50
+
+
+class FriendGraph:
+    """
+    CSR 인접 리스트 + 증분 변경 overlay
+    """
+
+    def __init__(self, adjacency, version):
+        self.version = version
+        self._build(adjacency)
+
+    def _build(self, adjacency):
+        self._index = {}
+        self._indptr = array('q', [0])
+        self._indices = array('q')
+        for user_id in sorted(adjacency):
+            self._index[user_id] = len(self._index)
+            self._indices.extend(sorted(adjacency[user_id]))
+            self._indptr.append(len(self._indices))
+        self._added = defaultdict(set)
+        self._removed = defaultdict(set)
+        self._changes = 0
+
+    @classmethod
+    def from_db(cls):
+        version = get_version(VERSION_NAME)  # DB보다 먼저 읽어야 이후 변경을 놓치지 않음
+        adjacency = defaultdict(set)
+        for from_id, to_id in User.friends.through.objects.values_list('from_user_id', 'to_user_id'):
+            adjacency[from_id].add(to_id)
+            adjacency[to_id].add(from_id)
+        return cls(adjacency, version)
+
+    def neighbors(self, user_id):
+        i = self._index.get(user_id)
+        base = self._indices[self._indptr[i]:self._indptr[i + 1]] if i is not None else ()
+        added = self._added.get(user_id)
+        removed = self._removed.get(user_id)
+        if not (added or removed):
+            return base
+        return (set(base) | (added or set())) - (removed or set())
+
+    def apply(self, op, pairs):
+        for a, b in pairs:
+            for x, y in ((a, b), (b, a)):
+                if op == 'add':
+                    self._removed[x].discard(y)
+                    self._added[x].add(y)
+                else:
+                    self._added[x].discard(y)
+                    self._removed[x].add(y)
+            self._changes += 1
+        if self._changes >= COMPACT_AFTER:
+            self._build({user_id: set(self.neighbors(user_id)) for user_id in self._all_ids()})
+
+    def _all_ids(self):
+        return set(self._index) | set(self._added)
+
+    def mutual_counts(self, user_id):
+        """
+        친구의 친구 -> 함께 아는 친구 수 (본인, 이미 친구인 유저 제외)
+        """
+        friends = self.neighbors(user_id)
+        counts = Counter()
+        for friend_id in friends:
+            counts.update(self.neighbors(friend_id))
+        counts.pop(user_id, None)
+        for friend_id in friends:
+            counts.pop(friend_id, None)
+        return counts
+
+
+_graph = None
+_lock = threading.Lock()
+
+
+def _log_key(version):
+    return f"friend_graph:log:{version}"
+
+
+def _sync():
+    """
+    이 프로세스의 그래프에 밀린 변경 로그를 적용 (_lock 안에서 호출)
+    """
+    global _graph
+    current = get_version(VERSION_NAME)
+    if _graph is not None and current > _graph.version:
+        versions = range(_graph.version + 1, current + 1)
+        logs = cache.get_many([_log_key(v) for v in versions]) if len(versions) <= MAX_REPLAY else {}
+        if len(logs) == len(versions):
+            for v in versions:
+                _graph.apply(*logs[_log_key(v)])
+            _graph.version = current
+        else:
+            _graph = None
+    if _graph is None:
+        _graph = FriendGraph.from_db()
+    return _graph
+
+
+def friend_ids(user_id):
+    with _lock:
+        return set(_sync().neighbors(user_id))
+
+
+def friend_counts(user_id):
+    """
+    return: (친구 id 집합, 친구의 친구 -> 함께 아는 친구 수)
+    """
+    with _lock:
+        graph = _sync()
+        return set(graph.neighbors(user_id)), graph.mutual_counts(user_id)
+
+
+def record_change(op, pairs):
+    """
+    op: 'add' | 'remove', pairs: [(user_id, user_id)] (커밋 후 로그 기록)
+    """
+    pairs = [(a, b) for a, b in pairs if a != b]
+
+    def publish():
+        version = bump_version(VERSION_NAME)
+        cache.set(_log_key(version), (op, pairs), LOG_TIMEOUT)
+
+    if pairs:
+        transaction.on_commit(publish)
+
+
+@receiver(m2m_changed, sender=User.friends.through)
+def _on_friends_changed(sender, instance, action, pk_set, **kwargs):
+    if action in ('post_add', 'post_remove'):
+        record_change('add' if action == 'post_add' else 'remove', [(instance.pk, pk) for pk in pk_set or ()])
+    elif action == 'pre_clear':
+        record_change('remove', [(instance.pk, pk) for pk in instance.friends.values_list('id', flat=True)])
+
+
+# 추천
+# -----------------------------------------------------------------
+
+def shared_clans(user):
+    """
+    같은 클랜에 속한 유저 -> 같은 클랜 수 (쿼리 1번, 캐시)
+    """
+    key = f"friend_shared_clans:{user.id}"
+    counts = cache.get(key)
+    if counts is None:
+        memberships = User.clans.through.objects
+        counts = dict(memberships.filter(
+            clan_id__in=memberships.filter(user_id=user.id).values('clan_id')
+        ).exclude(user_id=user.id).values('user_id').annotate(n=Count('clan_id')).values_list('user_id', 'n'))
+        cache.set(key, counts, AFFINITY_TIMEOUT)
+    return counts
+
+
+def shared_rooms(user):
+    """
+    같은 합주방 세션에 참여한 유저 -> 같은 방 수 (쿼리 2번, 캐시)
+    """
+    key = f"friend_shared_rooms:{user.id}:{user.nickname}"
+    counts = cache.get(key)
+    if counts is None:
+        by_nickname = dict(Session.objects.filter(
+            room_id__in=Session.objects.filter(participant_nickname=user.nickname).values('room_id')
+        ).exclude(participant_nickname=user.nickname).exclude(participant_nickname__isnull=True).values(
+            'participant_nickname'
+        ).annotate(n=Count('room_id', distinct=True)).values_list('participant_nickname', 'n'))
+        counts = {
+            user_id: by_nickname[nickname] for user_id, nickname in
+            User.objects.filter(nickname__in=by_nickname).values_list('id', 'nickname')
+        } if by_nickname else {}
+        cache.set(key, counts, AFFINITY_TIMEOUT)
+    return counts
+
+
+def clanmate_ids(user):
+    return set(shared_clans(user))
+
+
+def parse_limit(query_params):
+    try:
+        limit = int(query_params.get('limit', DEFAULT_LIMIT))
+    except ValueError:
+        raise ValueError("limit은 정수여야 합니다.")
+    return max(1, min(limit, MAX_LIMIT))
+
+
+def suggest_friends(user, limit=DEFAULT_LIMIT):
+    """
+    return: [(user_id, {"mutual_friends", "shared_clans", "shared_rooms", "score"})] 점수 순
+    (이미 친구, 대기 중인 친구 요청 상대, 비활성 유저 제외)
+    """
+    friends, mutual = friend_counts(user.id)
+    clans = shared_clans(user)
+    rooms = shared_rooms(user)
+
+    excluded = {user.id, *friends}
+    for from_id, to_id in FriendRequest.objects.filter(
+        Q(from_user=user) | Q(to_user=user), status='pending'
+    ).values_list('from_user_id', 'to_user_id'):
+        excluded.update((from_id, to_id))
+
+    scores = {}
+    for user_id in (mutual.keys() | clans.keys() | rooms.keys()) - excluded:
+        reasons = {
+            'mutual_friends': mutual.get(user_id, 0),
+            'shared_clans': clans.get(user_id, 0),
+            'shared_rooms': rooms.get(user_id, 0),
+        }
+        reasons['score'] = sum(WEIGHTS[name] * n for name, n in reasons.items())
+        scores[user_id] = reasons
+
+    ranked = sorted(scores, key=lambda user_id: (-scores[user_id]['score'], user_id))[:limit * 2]
+    active = set(User.objects.filter(id__in=ranked, is_active=True).values_list('id', flat=True))
+    return [(user_id, scores[user_id]) for user_id in ranked if user_id in active][:limit]
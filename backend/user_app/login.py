@@ -0,0 +1,119 @@
+# user_app/login.py
+"""
+비동기 로그인 (비밀번호 해시를 이벤트 루프 밖에서 계산)
+
+authenticate() / check_password()는 PBKDF2를 요청을 처리하는 워커에서 동기로 돌리므로
+Daphne에서 로그인이 몰리면 다른 요청까지 멈춥니다.
+(Django의 aauthenticate / acheck_password도 결국 단일 sync 스레드에서 순서대로 실행)
+
+- 해시 계산(hasher.verify / make_password)은 전용 스레드 풀(HASH_WORKERS개)에서 실행
+  (hashlib.pbkdf2_hmac은 계산 중 GIL을 놓으므로 병렬로 돌아감)
+- 대기 중인 해시 작업이 MAX_PENDING을 넘으면 바로 거절 (LoginBusy -> 503)
+- 로그인 성공 시 저장된 해시가 PASSWORD_HASHERS의 첫 번째(선호) 해셔가 아니거나
+  반복 횟수가 바뀌었으면 새 해시로 다시 저장 (Django check_password의 setter와 같은 동작)
+- 해시 계산 전에 토큰 버킷을 확인 (config/throttling.py)
+  'login': IP별, 'login_user': (IP, 아이디)별 (한 IP에서 한 계정을 노리는 시도를 더 좁게 제한,
+  다른 IP의 시도로 계정 주인의 로그인이 막히지 않음)
+
+벤치마크: backend/bench_login.py
+"""
+import asyncio
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import (
+    UNUSABLE_PASSWORD_PREFIX, get_hasher, identify_hasher, make_password,
+)
+from django.contrib.auth.models import update_last_login
+from rest_framework.settings import api_settings
+
+from config.throttling import client_ident, consume
+
+HASH_WORKERS = int(os.environ.get('LOGIN_HASH_WORKERS', min(4, os.cpu_count() or 1)))
+MAX_PENDING = int(os.environ.get('LOGIN_HASH_MAX_PENDING', HASH_WORKERS * 16))
+
+_executor = ThreadPoolExecutor(max_workers=HASH_WORKERS, thread_name_prefix='login-hash')
+_pending = 0
+_pending_lock = threading.Lock()
+
+
+class LoginBusy(Exception):
+    """
+    해시 작업 대기열이 가득 참 (잠시 후 재시도)
+    """
+
+
+def _login_wait(ident, username):
+    rates = api_settings.DEFAULT_THROTTLE_RATES
+    waits = [consume('login', ident, rates.get('login'))]
+    if username:
+        # 아이디만으로 키를 잡으면 다른 IP에서 틀린 비밀번호를 보내 계정 주인을 막을 수 있음
+        waits.append(consume('login_user', f"{ident}:{str(username).strip().lower()}", rates.get('login_user')))
+    return max((wait for allowed, wait in waits if not allowed), default=None)
+
+
+async def check_login_rate(request, username):
+    """
+    return: 제한에 걸렸으면 기다릴 초, 아니면 None
+    """
+    return await sync_to_async(_login_wait, thread_sensitive=False)(client_ident(request), username)
+
+
+async def _run_hash(func, *args):
+    global _pending
+    with _pending_lock:
+        if _pending >= MAX_PENDING:
+            raise LoginBusy()
+        _pending += 1
+    try:
+        return await asyncio.get_running_loop().run_in_executor(_executor, func, *args)
+    finally:
+        with _pending_lock:
+            _pending -= 1
+
+
+def _verify(password, encoded):
+    """
+    return: (일치 여부, 다시 해시해야 하는지)
+    """
+    try:
+        hasher = identify_hasher(encoded)
+    except ValueError:
+        return False, False
+    if not hasher.verify(password, encoded):
+        return False, False
+    preferred = get_hasher('default')
+    must_update = hasher.algorithm != preferred.algorithm or preferred.must_update(encoded)
+    return True, must_update
+
+
+async def authenticate_async(username, password):
+    """
+    ModelBackend.authenticate와 같은 규칙으로 로그인 확인 -> User 또는 None
+    (없는 유저도 해시 1번을 계산해 응답 시간으로 존재 여부가 드러나지 않게 함)
+    """
+    User = get_user_model()
+    if username is None or password is None:
+        return None
+
+    user = await User.objects.filter(**{User.USERNAME_FIELD: username}).afirst()
+    encoded = user.password if user is not None else None
+    if user is None or not encoded or encoded.startswith(UNUSABLE_PASSWORD_PREFIX):
+        await _run_hash(make_password, password)
+        return None
+
+    is_correct, must_update = await _run_hash(_verify, password, encoded)
+    if not is_correct or not getattr(user, 'is_active', True):
+        return None
+
+    if must_update:
+        user.password = await _run_hash(make_password, password)
+        await user.asave(update_fields=['password'])
+    return user
+
+
+async def record_login(user):
+    await sync_to_async(update_last_login)(None, user)
@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from user_app.alerts import archive_read_alerts, trim_all_inboxes
+
+
+class Command(BaseCommand):
+    help = "오래된 읽은 알림과 유저별 알림함 한도를 넘은 알림을 보관 테이블(AlertArchive)로 옮깁니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=None,
+                            help="이 일수보다 오래된 읽은 알림 보관 (기본: settings.ALERT_ARCHIVE_DAYS)")
+        parser.add_argument('--inbox-limit', type=int, default=None,
+                            help="유저별로 남길 최신 알림 수 (기본: settings.ALERT_INBOX_LIMIT)")
+
+    def handle(self, *args, **options):
+        archived = archive_read_alerts(days=options['days'])
+        trimmed = trim_all_inboxes(limit=options['inbox_limit'])
+        self.stdout.write(self.style.SUCCESS(
+            f"읽은 알림 {archived}개, 알림함 한도 초과 알림 {trimmed}개를 보관했습니다."
+        ))
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from user_app.verification import purge_expired
+
+
+class Command(BaseCommand):
+    help = "만료된 이메일 인증번호(VerificationCode) 행을 삭제합니다. (DB 모드, cron 등으로 주기 실행)"
+
+    def handle(self, *args, **options):
+        count = purge_expired()
+        self.stdout.write(self.style.SUCCESS(f"만료된 인증번호 {count}개를 삭제했습니다."))
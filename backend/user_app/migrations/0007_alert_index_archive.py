@@ -0,0 +1,43 @@
+# Generated by Django 5.2.7 on 2026-10-19 14:13
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('user_app', '0006_verificationcode_attempts'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AlertArchive',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('original_id', models.BigIntegerField()),
+                ('alert_type', models.CharField(default='SYSTEM', max_length=50)),
+                ('message', models.CharField(default='', max_length=255)),
+                ('related_id', models.IntegerField(blank=True, null=True)),
+                ('related_url', models.CharField(blank=True, max_length=255, null=True)),
+                ('is_read', models.BooleanField(default=False)),
+                ('created_at', models.DateTimeField()),
+                ('archived_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='alert',
+            index=models.Index(fields=['user', 'is_read', '-created_at'], name='alert_user_read_created_idx'),
+        ),
+        migrations.AddField(
+            model_name='alertarchive',
+            name='user',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='archived_alerts', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddIndex(
+            model_name='alertarchive',
+            index=models.Index(fields=['user', '-created_at'], name='alertarchive_user_created_idx'),
+        ),
+    ]
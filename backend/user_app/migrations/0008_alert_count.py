@@ -0,0 +1,23 @@
+# Generated by Django 5.2.7 on 2026-10-19 14:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('user_app', '0007_alert_index_archive'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='alert',
+            name='count',
+            field=models.PositiveIntegerField(default=1),
+        ),
+        migrations.AddField(
+            model_name='alertarchive',
+            name='count',
+            field=models.PositiveIntegerField(default=1),
+        ),
+    ]
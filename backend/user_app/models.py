@@ -80,13 +80,16 @@ class DirectChat(models.Model):
 
 # --- (VerificationCode 모델: 이메일 인증 등) ---
 class VerificationCode(models.Model):
+    # [수정] 캐시 모드가 아닐 때만 사용 (user_app/verification.py)
+    TTL_SECONDS = 180  # 유효시간 3분
+
     email = models.EmailField(unique=True)
     code = models.CharField(max_length=6)
-    created_at = models.DateTimeField(auto_now_add=True)
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)  # 만료 행 정리용 인덱스
+    attempts = models.PositiveSmallIntegerField(default=0)  # 틀린 입력 횟수
 
     def is_expired(self):
-        # 유효시간 3분 (180초)
-        return (timezone.now() - self.created_at).total_seconds() > 180 
+        return (timezone.now() - self.created_at).total_seconds() > self.TTL_SECONDS
 
 
 # --- (Alert 모델: 알림 시스템) ---
@@ -109,8 +112,38 @@ class Alert(models.Model):
     related_id = models.IntegerField(null=True, blank=True) 
     related_url = models.CharField(max_length=255, null=True, blank=True) 
     is_read = models.BooleanField(default=False)
+    # [수정] 묶인 알림(user_app/alerts.py notify)은 마지막 이벤트 시각으로 갱신
     created_at = models.DateTimeField(auto_now_add=True)
+    count = models.PositiveIntegerField(default=1)  # [추가] 묶인 이벤트 수
+
+    class Meta:
+        # [추가] 알림함 조회 (user, is_read 필터 + 최신순) 인덱스
+        indexes = [
+            models.Index(fields=['user', 'is_read', '-created_at'], name='alert_user_read_created_idx'),
+        ]
 
     def __str__(self):
         user_str = self.user.nickname if self.user else "System"
-        return f"[{user_str}] {self.message} (Read: {self.is_read})"
\ No newline at end of file
+        return f"[{user_str}] {self.message} (Read: {self.is_read})"
+
+
+# [추가] 보관된 알림 (오래된 읽은 알림 / 알림함 한도를 넘은 알림, user_app/alerts.py)
+class AlertArchive(models.Model):
+    original_id = models.BigIntegerField()
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='archived_alerts', null=True, blank=True)
+    alert_type = models.CharField(max_length=50, default='SYSTEM')
+    message = models.CharField(max_length=255, default='')
+    related_id = models.IntegerField(null=True, blank=True)
+    related_url = models.CharField(max_length=255, null=True, blank=True)
+    is_read = models.BooleanField(default=False)
+    created_at = models.DateTimeField()
+    count = models.PositiveIntegerField(default=1)
+    archived_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['user', '-created_at'], name='alertarchive_user_created_idx'),
+        ]
+
+    def __str__(self):
+        return f"[archived] {self.message}"
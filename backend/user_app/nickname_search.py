@@ -0,0 +1,77 @@
+# user_app/nickname_search.py
+"""
+닉네임 자동완성 (접두사 검색)
+
+nickname은 unique라 B-tree 인덱스가 있으므로
+  nickname >= 'ab' AND nickname < 'ab' + U+FFFF
+범위 조건으로 인덱스 구간만 읽고 LIMIT에서 멈춥니다.
+(LIKE 'ab%'는 PostgreSQL의 기본(비 C) collation에서 인덱스를 타지 못함)
+닉네임 변경은 인덱스에 바로 반영되므로 별도 동기화가 필요 없습니다.
+
+정렬: 친구 -> 같은 클랜 멤버 -> 나머지, 같은 그룹 안에서는 짧은(정확히 일치하는) 닉네임 먼저
+친구 / 클랜 멤버 id는 친구 그래프(friend_graph)와 클랜 공통 수 캐시를 재사용합니다.
+"""
+from .friend_graph import clanmate_ids, friend_ids
+from .models import User
+
+DEFAULT_LIMIT = 10
+MAX_LIMIT = 30
+MAX_QUERY_LENGTH = 100
+# 친구 / 클랜 멤버가 이보다 많으면 id__in 대신 범위 조회 결과에서 고름
+MAX_RELATED = 1000
+
+RELATION_ORDER = {'friend': 0, 'clan': 1, None: 2}
+
+
+def parse_search_params(query_params):
+    """
+    ?q=<접두사>&limit=10 -> (prefix, limit) (잘못된 값이면 ValueError)
+    """
+    prefix = (query_params.get('q') or '').strip()
+    if not prefix:
+        raise ValueError("검색어(q)가 필요합니다.")
+    if len(prefix) > MAX_QUERY_LENGTH:
+        raise ValueError(f"검색어는 최대 {MAX_QUERY_LENGTH}자입니다.")
+    try:
+        limit = int(query_params.get('limit', DEFAULT_LIMIT))
+    except ValueError:
+        raise ValueError("limit은 정수여야 합니다.")
+    return prefix, max(1, min(limit, MAX_LIMIT))
+
+
+def _prefix_range(prefix):
+    # startswith는 collation에 따라 범위 밖 결과를 거르는 용도 (인덱스는 범위 조건이 사용)
+    return User.objects.filter(
+        nickname__gte=prefix, nickname__lt=prefix + '\uffff', nickname__startswith=prefix, is_active=True
+    )
+
+
+def search_nicknames(user, prefix, limit=DEFAULT_LIMIT):
+    """
+    return: [(user_id, nickname, relation)] relation: 'friend' | 'clan' | None
+    쿼리 최대 2번 (친구/클랜 멤버 중 일치, 전체 범위 LIMIT)
+    """
+    friends = friend_ids(user.id)
+    clanmates = clanmate_ids(user) - friends
+    related = (friends | clanmates) - {user.id}
+
+    matches = {}
+    if related and len(related) <= MAX_RELATED:
+        for user_id, nickname in _prefix_range(prefix).filter(id__in=related).values_list('id', 'nickname'):
+            matches[user_id] = nickname
+
+    if len(matches) < limit:
+        queryset = _prefix_range(prefix).exclude(id=user.id).order_by('nickname')
+        for user_id, nickname in queryset.values_list('id', 'nickname')[:limit + len(matches)]:
+            matches.setdefault(user_id, nickname)
+
+    def relation(user_id):
+        if user_id in friends:
+            return 'friend'
+        if user_id in clanmates:
+            return 'clan'
+        return None
+
+    results = [(user_id, nickname, relation(user_id)) for user_id, nickname in matches.items()]
+    results.sort(key=lambda row: (RELATION_ORDER[row[2]], len(row[1]), row[1]))
+    return results[:limit]
@@ -0,0 +1,245 @@
+# user_app/profiles.py
+"""
+유저 프로필 응답 (/me, /profile/<nickname>/, 닉네임 변경, 프로필 이미지 업로드)
+
+프론트가 화면을 옮길 때마다 /me를 호출하므로
+- 프로필 필드 + 가입/소유 클랜 목록을 UNION 쿼리 1번으로 조회하고
+- 결과를 user id별 버전 키로 캐시합니다.
+여러 유저(채팅 목록, 세션 목록, 클랜 멤버)는 get_profiles / get_profiles_by_nickname으로
+캐시 get_many + 캐시에 없는 유저만 쿼리 1번으로 조회합니다. (닉네임 -> id 매핑이 없으면 id 조회 1번 추가)
+캐시 버전은 DB 조회 전에 읽어, 조회 중 무효화된 프로필이 새 버전 키로 저장되지 않게 합니다.
+
+무효화 (커밋 후 버전 올림)
+- User save/delete (닉네임 변경, 소개/이미지 변경 등)
+- clan.members.add/remove/clear (m2m_changed)
+- Clan save/delete (클랜 이름 변경, 생성, 삭제)
+- 중간 테이블을 bulk로 바꾸는 곳(clan_app/membership.py)은 invalidate_profiles 직접 호출
+"""
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
+from django.dispatch import receiver
+
+from config.cache_versions import bump_version, get_version, get_versions
+from .models import User
+
+# 버전으로 추적하지 않는 변경(QuerySet.update 등)에 대비한 유지 시간
+PROFILE_TIMEOUT = 60 * 5
+
+# 일괄 조회 최대 개수 (닉네임 + id 합계)
+MAX_BATCH = 300
+# 일괄 조회 응답에 담는 필드
+COMPACT_FIELDS = ('id', 'nickname', 'role', 'profile_img')
+
+_FIELDS = ('id', 'username', 'nickname', 'role', 'profile_img', 'introduction')
+
+
+def _version_name(user_id):
+    return f"user_profile:{user_id}"
+
+
+def _cache_key(user_id):
+    return f"user_profile:{user_id}:{get_version(_version_name(user_id))}"
+
+
+def _image_url(name):
+    if not name:
+        return None
+    return User._meta.get_field('profile_img').storage.url(name)
+
+
+def _load_many(**lookup):
+    """
+    프로필 + 클랜 목록 (유저 수와 관계없이 쿼리 1번)
+    members(가입)와 owner(소유) 두 관계를 각각 LEFT JOIN한 결과를 UNION으로 합침
+    return: {user id: 응답 dict}
+    """
+    users = User.objects.filter(**lookup).order_by()
+    rows = users.values_list(*_FIELDS, 'clans__id', 'clans__name').union(
+        users.values_list(*_FIELDS, 'owned_clans__id', 'owned_clans__name')
+    )
+
+    profiles = {}
+    clans = {}
+    for user_id, username, nickname, role, profile_img, introduction, clan_id, clan_name in rows:
+        if user_id not in profiles:
+            profiles[user_id] = {
+                "id": username,
+                "nickname": nickname,
+                "role": role,
+                "clans": [],
+                "profile_img": _image_url(profile_img),
+                "introduction": introduction,
+            }
+            clans[user_id] = {}
+        if clan_id is not None:
+            clans[user_id][clan_id] = clan_name
+
+    for user_id, profile in profiles.items():
+        profile["clans"] = [{"id": clan_id, "name": name} for clan_id, name in sorted(clans[user_id].items())]
+    return profiles
+
+
+def _nickname_key(nickname):
+    return f"user_profile_nickname:{nickname}"
+
+
+def _versions(user_ids):
+    """
+    DB 조회 전에 읽어야 함 (조회 중 무효화되면 이전 값이 새 버전 키로 저장되지 않게)
+    """
+    return get_versions([_version_name(user_id) for user_id in user_ids])
+
+
+def _store(profiles, versions):
+    """
+    {user id: 응답 dict}를 프로필 캐시와 닉네임 -> id 매핑에 저장
+    versions: 조회 전에 읽은 _versions()
+    """
+    values = {}
+    for user_id, profile in profiles.items():
+        values[f"user_profile:{user_id}:{versions[_version_name(user_id)]}"] = profile
+        values[_nickname_key(profile["nickname"])] = user_id
+    cache.set_many(values, PROFILE_TIMEOUT)
+
+
+def _cached(user_ids, versions):
+    """
+    캐시에 있는 프로필만 -> {user id: 응답 dict}
+    """
+    keys = {f"user_profile:{user_id}:{versions[_version_name(user_id)]}": user_id for user_id in user_ids}
+    return {keys[key]: profile for key, profile in cache.get_many(list(keys)).items()}
+
+
+def get_user_profile(user_id):
+    """
+    user id로 프로필 응답 조회 (캐시 우선, 없으면 None)
+    """
+    key = _cache_key(user_id)
+    profile = cache.get(key)
+    if profile is None:
+        profile = _load_many(pk=user_id).get(user_id)
+        if profile is None:
+            return None
+        cache.set(key, profile, PROFILE_TIMEOUT)
+    return profile
+
+
+def get_user_profile_by_nickname(nickname):
+    """
+    닉네임으로 프로필 응답 조회 (없으면 None)
+    """
+    return get_profiles_by_nickname([nickname]).get(nickname)
+
+
+def get_profiles_by_nickname(nicknames):
+    """
+    닉네임 목록 -> {nickname: 응답 dict} (없는 닉네임은 빠짐)
+    닉네임 -> id 매핑도 캐시하고, 캐시된 프로필의 닉네임이 다르면 (닉네임 변경) 다시 조회
+    매핑이 없는 닉네임은 id를 먼저 찾은 뒤(쿼리 1번) get_profiles로 조회
+    """
+    nicknames = set(nicknames)
+    user_ids = cache.get_many([_nickname_key(nickname) for nickname in nicknames])
+    cached = get_profiles(set(user_ids.values())) if user_ids else {}
+
+    found = {}
+    for nickname in nicknames:
+        profile = cached.get(user_ids.get(_nickname_key(nickname)))
+        if profile is not None and profile["nickname"] == nickname:
+            found[nickname] = profile
+
+    missing = nicknames - found.keys()
+    if missing:
+        ids = dict(User.objects.filter(nickname__in=missing).values_list('id', 'nickname'))
+        mapping = {}
+        for user_id, profile in get_profiles(ids).items():
+            # 조회 사이에 닉네임이 바뀌었으면 요청한 닉네임으로 찾은 것이 아님
+            if profile["nickname"] == ids[user_id]:
+                found[profile["nickname"]] = profile
+                mapping[_nickname_key(profile["nickname"])] = user_id
+        if mapping:
+            cache.set_many(mapping, PROFILE_TIMEOUT)
+    return found
+
+
+def get_profiles(user_ids):
+    """
+    user id 목록 -> {user id: 응답 dict} (없는 유저는 빠짐)
+    """
+    user_ids = set(user_ids)
+    if not user_ids:
+        return {}
+    versions = _versions(user_ids)
+    found = _cached(user_ids, versions)
+    missing = user_ids - found.keys()
+    if missing:
+        loaded = _load_many(pk__in=missing)
+        _store(loaded, versions)
+        found.update(loaded)
+    return found
+
+
+def compact(profile):
+    return {field: profile[field] for field in COMPACT_FIELDS}
+
+
+def parse_batch_request(data):
+    """
+    {"nicknames": [...], "ids": [...]} -> (nicknames, ids) (잘못된 값이면 ValueError)
+    """
+    if not isinstance(data, dict):
+        raise ValueError("요청 본문은 JSON 객체여야 합니다.")
+    nicknames = data.get('nicknames') or []
+    ids = data.get('ids') or []
+    if not isinstance(nicknames, (list, tuple)) or not isinstance(ids, (list, tuple)):
+        raise ValueError("nicknames, ids는 목록이어야 합니다.")
+    if not (nicknames or ids):
+        raise ValueError("nicknames 또는 ids가 필요합니다.")
+    try:
+        ids = list(dict.fromkeys(int(user_id) for user_id in ids))
+    except (TypeError, ValueError):
+        raise ValueError("ids에 잘못된 유저 id가 있습니다.")
+    nicknames = list(dict.fromkeys(str(nickname) for nickname in nicknames))
+    if len(nicknames) + len(ids) > MAX_BATCH:
+        raise ValueError(f"한 번에 최대 {MAX_BATCH}명까지 조회할 수 있습니다.")
+    return nicknames, ids
+
+
+def invalidate_profiles(user_ids):
+    user_ids = {user_id for user_id in user_ids if user_id is not None}
+
+    def bump():
+        for user_id in user_ids:
+            bump_version(_version_name(user_id))
+
+    if user_ids:
+        transaction.on_commit(bump)
+
+
+def _clan_user_ids(clan):
+    return {clan.owner_id, *clan.members.values_list('id', flat=True)}
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def _invalidate_on_user_change(sender, instance, **kwargs):
+    invalidate_profiles([instance.pk])
+
+
+@receiver(m2m_changed, sender='clan_app.Clan_members')
+def _invalidate_on_membership_change(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ('post_add', 'post_remove', 'pre_clear'):
+        return
+    if reverse:
+        # user.clans.add(...) -> instance가 유저
+        invalidate_profiles([instance.pk])
+    elif action == 'pre_clear':
+        invalidate_profiles(instance.members.values_list('id', flat=True))
+    else:
+        invalidate_profiles(pk_set or ())
+
+
+@receiver(post_save, sender='clan_app.Clan')
+@receiver(pre_delete, sender='clan_app.Clan')
+def _invalidate_on_clan_change(sender, instance, **kwargs):
+    invalidate_profiles(_clan_user_ids(instance))
@@ -31,6 +31,8 @@ urlpatterns = [
     path('verify-email-code/', views.VerifySMSCodeView.as_view(), name='verify_email'),
 
     # 4. 프로필
+    path('profiles/batch/', views.UserProfileBatchView.as_view(), name='profile_batch'),
+    path('search/', views.NicknameSearchView.as_view(), name='nickname_search'),
     path('profile/<str:nickname>/', views.UserProfileAPIView.as_view(), name='profile_detail'),
     path('profile/update-nickname/', views.UpdateNicknameAPIView.as_view(), name='update_nickname'),
     path('profile/<str:nickname>/upload-image/', views.UploadProfileImageView.as_view(), name='upload_profile_image'),
@@ -41,6 +43,7 @@ urlpatterns = [
     path('friends/request/', views.SendFriendRequestView.as_view(), name='friend_request'),
     path('friends/accept/', views.AcceptFriendRequestView.as_view(), name='friend_accept'),
     path('friends/reject/', views.RejectFriendRequestView.as_view(), name='friend_reject'),
+    path('friends/suggestions/', views.FriendSuggestionView.as_view(), name='friend_suggestions'),
     path('friends/<str:nickname>/', views.FriendListView.as_view(), name='friend_list'),
     
     # ▼▼▼ [수정] 순서 변경: 구체적인 URL이 변수 URL보다 먼저 와야 함 ▼▼▼
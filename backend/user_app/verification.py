@@ -0,0 +1,134 @@
+# user_app/verification.py
+"""
+이메일 인증번호 (발송 / 확인)
+
+settings.VERIFICATION_CODE_BACKEND
+- 'cache' (REDIS_URL이 있을 때 기본값)
+  인증번호를 CODE_TTL 동안만 캐시에 두고, 만료되면 저절로 사라집니다.
+  가입이 몰려도 DB(VerificationCode 테이블)는 건드리지 않습니다.
+- 'db' (LocMemCache처럼 워커 간 캐시가 공유되지 않을 때)
+  기존처럼 VerificationCode 행에 저장하고, 만료된 행은
+  PURGE_INTERVAL마다 한 번씩(발송 시) 또는 `python manage.py purge_verification_codes`로 지웁니다.
+
+공통
+- 틀린 입력은 이메일별 원자적 카운터로 세고, MAX_ATTEMPTS번 틀리면 코드를 폐기
+- 이메일별 발송 제한: RESEND_INTERVAL 안에 재발송 불가, SEND_WINDOW 동안 최대 SEND_LIMIT번
+- 성공한 코드는 바로 삭제 (같은 코드로 두 번 인증되지 않음)
+"""
+import hmac
+import random
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import F
+from django.utils import timezone
+
+from .models import VerificationCode
+
+CODE_TTL = VerificationCode.TTL_SECONDS
+MAX_ATTEMPTS = 5
+RESEND_INTERVAL = 60
+SEND_WINDOW = 60 * 60
+SEND_LIMIT = 5
+PURGE_INTERVAL = 60 * 5
+
+
+class VerificationError(Exception):
+    """
+    status: 응답 HTTP 상태 코드
+    """
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.status = status
+
+
+def _backend():
+    return getattr(settings, 'VERIFICATION_CODE_BACKEND', 'db')
+
+
+def _normalize(email):
+    return (email or '').strip().lower()
+
+
+def _incr(key, timeout):
+    """
+    timeout 동안 유지되는 카운터를 1 올리고 새 값을 반환 (원자적)
+    """
+    cache.add(key, 0, timeout)
+    try:
+        return cache.incr(key)
+    except ValueError:
+        # add와 incr 사이에 만료된 경우
+        cache.set(key, 1, timeout)
+        return 1
+
+
+def _check_send_rate(email):
+    if not cache.add(f"verify_resend:{email}", 1, RESEND_INTERVAL):
+        raise VerificationError(f"인증번호는 {RESEND_INTERVAL}초 후에 다시 요청할 수 있습니다.", status=429)
+    if _incr(f"verify_sends:{email}", SEND_WINDOW) > SEND_LIMIT:
+        raise VerificationError("인증번호 요청 횟수를 초과했습니다. 잠시 후 다시 시도해주세요.", status=429)
+
+
+def purge_expired():
+    """
+    만료된 VerificationCode 행 삭제 -> 삭제한 행 수
+    """
+    cutoff = timezone.now() - timedelta(seconds=CODE_TTL)
+    deleted, _ = VerificationCode.objects.filter(created_at__lt=cutoff).delete()
+    return deleted
+
+
+def issue_code(email):
+    """
+    새 인증번호를 만들어 저장하고 반환 (이전 코드와 틀린 횟수는 초기화)
+    """
+    email = _normalize(email)
+    _check_send_rate(email)
+    code = f"{random.SystemRandom().randint(0, 999999):06d}"
+
+    if _backend() == 'cache':
+        cache.set_many({f"verify_code:{email}": code, f"verify_attempts:{email}": 0}, CODE_TTL)
+    else:
+        VerificationCode.objects.update_or_create(
+            email=email,
+            defaults={'code': code, 'attempts': 0, 'created_at': timezone.now()}
+        )
+        if cache.add("verify_purge", 1, PURGE_INTERVAL):
+            purge_expired()
+    return code
+
+
+def _verify_cache(email, code):
+    stored = cache.get(f"verify_code:{email}")
+    if stored is None:
+        return False
+    if _incr(f"verify_attempts:{email}", CODE_TTL) > MAX_ATTEMPTS:
+        cache.delete(f"verify_code:{email}")
+        return False
+    # delete가 True인 요청 하나만 성공 (동시에 같은 코드로 인증 시도)
+    return hmac.compare_digest(stored.encode(), code.encode()) and cache.delete(f"verify_code:{email}")
+
+
+def _verify_db(email, code):
+    cutoff = timezone.now() - timedelta(seconds=CODE_TTL)
+    codes = VerificationCode.objects.filter(email=email, created_at__gte=cutoff)
+    if not codes.filter(attempts__lt=MAX_ATTEMPTS).update(attempts=F('attempts') + 1):
+        return False
+    stored = codes.values_list('code', flat=True).first()
+    if stored is None or not hmac.compare_digest(stored.encode(), code.encode()):
+        return False
+    deleted, _ = codes.filter(code=stored).delete()
+    return deleted > 0
+
+
+def verify_code(email, code):
+    """
+    return: 인증 성공 여부 (성공하면 코드 삭제)
+    """
+    email = _normalize(email)
+    code = str(code or '').strip()
+    if _backend() == 'cache':
+        return _verify_cache(email, code)
+    return _verify_db(email, code)
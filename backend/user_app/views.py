@@ -4,7 +4,8 @@ from django.shortcuts import get_object_or_404
 from django.contrib.auth import get_user_model
 from django.utils import timezone # FriendRequest, VerificationCode
 import os # for SMS
-import random # for SMS
+import json
+import math
 import uuid # for UploadProfileImageView
 from django.db.models import Q
 from rest_framework import generics, status, views, parsers, permissions
@@ -13,8 +14,20 @@ from rest_framework.request import Request
 from rest_framework.views import APIView
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework_simplejwt.tokens import RefreshToken
-from rest_framework_simplejwt.views import TokenObtainPairView
-from django.contrib.auth import authenticate
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+from django.http import JsonResponse
+from django.utils.decorators import method_decorator
+from django.views import View
+from django.views.decorators.csrf import csrf_exempt
+from .alerts import notify as notify_alert
+from .friend_graph import parse_limit, suggest_friends
+from .login import LoginBusy, authenticate_async, check_login_rate, record_login
+from .nickname_search import parse_search_params, search_nicknames
+from .profiles import (
+    compact, get_profiles, get_profiles_by_nickname, get_user_profile, get_user_profile_by_nickname,
+    parse_batch_request,
+)
+from .verification import VerificationError, issue_code, verify_code
 from .serializers import (
     CustomTokenObtainPairSerializer, 
     UserCreateSerializer, 
@@ -28,7 +41,7 @@ from .serializers import (
     UserProfileSerializer
 )
 
-from .models import User, UserDevice, Alert, FriendRequest, VerificationCode, DirectChat
+from .models import User, UserDevice, Alert, FriendRequest, DirectChat
 
 # SMS (임시)
 # from sdk.api.message import Message
@@ -42,20 +55,9 @@ def get_user_profile_response(user):
     """
     FastAPI의 /login 또는 /profile/{nickname} 응답과
     동일한 JSON 구조를 반환합니다.
+    [수정] 프로필 + 클랜 목록을 쿼리 1번으로 조회하고 유저별로 캐시 (user_app/profiles.py)
     """
-    all_clans_query = user.clans.all() | user.owned_clans.all()
-    all_clans = all_clans_query.distinct()
-    
-    clans_info = [{"id": c.id, "name": c.name} for c in all_clans]
-
-    return {
-        "id": user.username,
-        "nickname": user.nickname,
-        "role": user.role,
-        "clans": clans_info,
-        "profile_img": user.profile_img.url if user.profile_img else None,
-        "introduction": user.introduction,
-    }
+    return get_user_profile(user.id)
 
 # --- (View 클래스들) ---
 # 1. 회원가입 뷰 (SignupView) - 이게 없어서 에러남!
@@ -65,24 +67,55 @@ class SignupView(generics.CreateAPIView):
     permission_classes = [permissions.AllowAny] # 누구나 가입 가능
 
 # 2. 로그인 뷰 (LoginView)
-class LoginView(APIView):
-    permission_classes = [permissions.AllowAny]
+def _throttled(wait):
+    response = JsonResponse({'detail': f'요청이 너무 많습니다. {math.ceil(wait)}초 후 다시 시도해주세요.'}, status=429)
+    response['Retry-After'] = str(math.ceil(wait))
+    return response
+
+
+def _read_credentials(request):
+    """
+    JSON / form 요청 본문에서 username, password 읽기
+    """
+    if request.content_type == 'application/json':
+        try:
+            data = json.loads(request.body or b'{}')
+        except ValueError:
+            data = {}
+        if not isinstance(data, dict):
+            data = {}
+    else:
+        data = request.POST
+    return data.get('username'), data.get('password')
+
+
+@method_decorator(csrf_exempt, name='dispatch')
+class LoginView(View):
+    """
+    (POST) /api/v1/users/login/
+    [수정] 비동기 뷰: 비밀번호 해시는 전용 스레드 풀에서 계산 (user_app/login.py)
+    [추가] IP별 / 아이디별 로그인 시도 제한 (429)
+    """
+    async def post(self, request):
+        username, password = _read_credentials(request)
+        wait = await check_login_rate(request, username)
+        if wait is not None:
+            return _throttled(wait)
+        try:
+            user = await authenticate_async(username, password)
+        except LoginBusy:
+            return JsonResponse({'detail': '로그인 요청이 많습니다. 잠시 후 다시 시도해주세요.'}, status=503)
 
-    def post(self, request):
-        username = request.data.get('username')
-        password = request.data.get('password')
-        user = authenticate(username=username, password=password)
-        
         if user:
             refresh = RefreshToken.for_user(user)
-            return Response({
+            return JsonResponse({
                 'refresh': str(refresh),
                 'access': str(refresh.access_token),
                 'nickname': user.nickname,
                 'username': user.username,
                 'role': user.role,
             })
-        return Response({'detail': '아이디 또는 비밀번호가 잘못되었습니다.'}, status=status.HTTP_401_UNAUTHORIZED)
+        return JsonResponse({'detail': '아이디 또는 비밀번호가 잘못되었습니다.'}, status=401)
 
 # 3. 로그아웃 뷰 (LogoutView)
 class LogoutView(APIView):
@@ -112,12 +145,36 @@ class ProfileView(generics.RetrieveAPIView):
     permission_classes = [permissions.IsAuthenticated]
     lookup_field = 'nickname' # 닉네임으로 조회
 
-class CustomTokenObtainPairView(TokenObtainPairView):
+@method_decorator(csrf_exempt, name='dispatch')
+class CustomTokenObtainPairView(View):
     """
     POST: /api/v1/users/token/
     커스텀 JWT 토큰 발급 뷰
-    """
-    serializer_class = CustomTokenObtainPairSerializer
+    [수정] TokenObtainPairView와 같은 응답을 비동기로 처리 (user_app/login.py)
+    """
+    async def post(self, request):
+        username, password = _read_credentials(request)
+        errors = {
+            field: ["This field is required."]
+            for field, value in (('username', username), ('password', password)) if not value
+        }
+        if errors:
+            return JsonResponse(errors, status=400)
+
+        wait = await check_login_rate(request, username)
+        if wait is not None:
+            return _throttled(wait)
+        try:
+            user = await authenticate_async(username, password)
+        except LoginBusy:
+            return JsonResponse({'detail': '로그인 요청이 많습니다. 잠시 후 다시 시도해주세요.'}, status=503)
+        if user is None:
+            return JsonResponse({'detail': 'No active account found with the given credentials'}, status=401)
+
+        refresh = CustomTokenObtainPairSerializer.get_token(user)
+        if jwt_settings.UPDATE_LAST_LOGIN:
+            await record_login(user)
+        return JsonResponse({'refresh': str(refresh), 'access': str(refresh.access_token)})
 
 class UserCreateAPIView(generics.CreateAPIView):
     queryset = User.objects.all()
@@ -165,6 +222,7 @@ class SendVerificationSMSView(views.APIView):
     POST: /api/v1/users/send-verification-email/
     """
     permission_classes = [AllowAny]
+    throttle_scope = 'verification'  # [추가] IP별 요청 제한 (이메일별 제한은 verification.py)
 
     def post(self, request: Request):
         email = request.data.get('email')
@@ -174,18 +232,15 @@ class SendVerificationSMSView(views.APIView):
         if User.objects.filter(email=email).exists():
             return Response({"detail": "이미 가입된 이메일입니다."}, status=status.HTTP_400_BAD_REQUEST)
         
-        code = str(random.randint(100000, 999999))
-        print(f"DEBUG: Email verification code for {email} is {code}")
-        
         try:
-            # (실제 이메일 전송 로직... )
-            
-            VerificationCode.objects.update_or_create(
-                email=email,
-                defaults={'code': code}
-            )
+            # [수정] 캐시 / DB 저장 + 이메일별 발송 제한 (user_app/verification.py)
+            code = issue_code(email)
+
+            # (실제 이메일 전송 로직... code를 메일로 전송, 로그에는 남기지 않음)
             return Response({"success": True, "message": "인증번호가 발송되었습니다."})
-            
+
+        except VerificationError as e:
+            return Response({"detail": str(e)}, status=e.status)
         except Exception as e:
             return Response({"detail": f"인증번호 발송 중 서버 오류 발생: {e}"}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
@@ -203,16 +258,10 @@ class VerifySMSCodeView(views.APIView):
         if not email or not code:
             return Response({"detail": "이메일과 코드가 필요합니다."}, status=status.HTTP_400_BAD_REQUEST)
 
-        try:
-            db_code = VerificationCode.objects.get(email=email)
-            
-            if db_code.is_expired() or db_code.code != code: 
-                raise VerificationCode.DoesNotExist
-            
-            db_code.delete()
+        # [수정] 틀린 횟수 제한 + 성공 시 코드 삭제 (user_app/verification.py)
+        if verify_code(email, code):
             return Response({"success": True, "message": "인증에 성공했습니다."})
-        except VerificationCode.DoesNotExist:
-            return Response({"detail": "인증번호가 올바르지 않거나 만료되었습니다."}, status=status.HTTP_400_BAD_REQUEST)
+        return Response({"detail": "인증번호가 올바르지 않거나 만료되었습니다."}, status=status.HTTP_400_BAD_REQUEST)
 
 
 class UserProfileAPIView(views.APIView):
@@ -222,8 +271,9 @@ class UserProfileAPIView(views.APIView):
     permission_classes = [IsAuthenticated]
 
     def get(self, request: Request, nickname: str):
-        user = get_object_or_404(User, nickname=nickname)
-        response_data = get_user_profile_response(user)
+        response_data = get_user_profile_by_nickname(nickname)
+        if response_data is None:
+            return Response({"detail": "해당 닉네임의 유저를 찾을 수 없습니다."}, status=status.HTTP_404_NOT_FOUND)
         return Response(response_data)
 
 
@@ -239,6 +289,34 @@ class MeAPIView(views.APIView):
         return Response(response_data)
 
 
+class UserProfileBatchView(views.APIView):
+    """
+    (POST) /api/v1/users/profiles/batch/
+    [추가] 닉네임 / id 목록으로 프로필 일괄 조회 (최대 300명)
+    body: {"nicknames": [...], "ids": [...]}
+    -> {"nicknames": {닉네임: 프로필}, "ids": {id: 프로필}, "missing": {"nicknames": [...], "ids": [...]}}
+    캐시에 있는 프로필은 그대로 쓰고, 없는 유저만 nickname__in / id__in 쿼리로 조회
+    """
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request: Request):
+        try:
+            nicknames, ids = parse_batch_request(request.data)
+        except ValueError as e:
+            return Response({"detail": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        by_nickname = get_profiles_by_nickname(nicknames) if nicknames else {}
+        by_id = get_profiles(ids) if ids else {}
+        return Response({
+            "nicknames": {nickname: compact(by_nickname[nickname]) for nickname in nicknames if nickname in by_nickname},
+            "ids": {user_id: compact(by_id[user_id]) for user_id in ids if user_id in by_id},
+            "missing": {
+                "nicknames": [nickname for nickname in nicknames if nickname not in by_nickname],
+                "ids": [user_id for user_id in ids if user_id not in by_id],
+            },
+        })
+
+
 class UpdateNicknameAPIView(views.APIView):
     """
     PUT: /api/v1/users/profile/update-nickname/
@@ -511,6 +589,51 @@ class RejectFriendRequestView(views.APIView):
         except FriendRequest.DoesNotExist:
              return Response({"detail": "존재하지 않는 요청입니다."}, status=status.HTTP_404_NOT_FOUND)
 
+class NicknameSearchView(views.APIView):
+    """
+    (GET) /api/v1/users/search/?q=<닉네임 접두사>&limit=10
+    [추가] 닉네임 자동완성 (친구 -> 같은 클랜 멤버 -> 나머지 순, user_app/nickname_search.py)
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request: Request):
+        try:
+            prefix, limit = parse_search_params(request.query_params)
+        except ValueError as e:
+            return Response({"detail": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        results = search_nicknames(request.user, prefix, limit)
+        return Response({
+            "results": [
+                {"user_id": user_id, "nickname": nickname, "relation": relation}
+                for user_id, nickname, relation in results
+            ]
+        })
+
+
+class FriendSuggestionView(views.APIView):
+    """
+    (GET) /api/v1/users/friends/suggestions/?limit=20
+    [추가] 친구 추천 (함께 아는 친구 / 같은 클랜 / 같은 합주방 참여, user_app/friend_graph.py)
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request: Request):
+        try:
+            limit = parse_limit(request.query_params)
+        except ValueError as e:
+            return Response({"detail": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        suggestions = suggest_friends(request.user, limit)
+        profiles = get_profiles([user_id for user_id, _ in suggestions])
+        return Response({
+            "suggestions": [
+                {**compact(profiles[user_id]), **reasons}
+                for user_id, reasons in suggestions if user_id in profiles
+            ]
+        })
+
+
 class FriendListView(views.APIView):
     """
     GET: /api/v1/users/friends/<nickname>/
@@ -783,6 +906,7 @@ class DirectChatView(APIView):
     POST /api/v1/users/chat/direct/
     """
     permission_classes = [permissions.IsAuthenticated]
+    throttle_scope = {'POST': 'dm'}  # [추가] 메시지 전송만 유저별 제한
 
     def get(self, request, nickname):
         """
@@ -820,12 +944,14 @@ class DirectChatView(APIView):
             if sender.nickname != receiver_nickname:
                 try:
                     receiver = User.objects.get(nickname=receiver_nickname)
-                    Alert.objects.create(
-                        user=receiver,
+                    # [수정] 같은 상대의 연속 메시지는 읽지 않은 알림 1개로 묶음 (user_app/alerts.py)
+                    notify_alert(
+                        receiver,
+                        f"{sender.nickname}님이 메시지를 보냈습니다.",
                         alert_type='SYSTEM', # 또는 CHAT_MESSAGE 타입 추가 고려
-                        message=f"{sender.nickname}님이 메시지를 보냈습니다.",
                         related_url=f"/chats/direct/{sender.nickname}",
-                        related_id=sender.id
+                        related_id=sender.id,
+                        coalesced_message=f"{sender.nickname}님이 메시지 {{count}}개를 보냈습니다.",
                     )
                 except User.DoesNotExist:
                     pass # 이미 serializer에서 검증되겠지만 안전장치
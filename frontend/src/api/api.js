@@ -126,6 +126,20 @@ export const apiGet = async (url) => {
     }
 };
 
+// [추가] 조건부 GET (ETag / 304 Not Modified)
+// return: { notModified, data, etag }
+export const apiGetConditional = async (url, etag) => {
+    const res = await api.get(url, {
+        headers: etag ? { 'If-None-Match': etag } : {},
+        validateStatus: (s) => (s >= 200 && s < 300) || s === 304,
+    });
+    return {
+        notModified: res.status === 304,
+        data: res.data,
+        etag: res.headers['etag'] || etag,
+    };
+};
+
 export const apiPost = async (url, body, config = {}) => {
     try {
         const res = await api.post(url, body, config);
@@ -17,12 +17,39 @@ const RoomChat = ({ roomId, roomInfo, user }) => {
       // 백엔드 room_app/urls.py에 정의된 주소로 맞춥니다.
       const data = await apiGet(`/rooms/${roomId}/chat/`);
       // 페이지네이션 대응 (data.results가 있으면 사용, 아니면 data 자체가 배열)
-      setMessages(Array.isArray(data) ? data : (data.results || []));
+      const latest = Array.isArray(data) ? data : (data.results || []);
+      // [수정] '이전 메시지'로 불러온 과거 메시지는 유지하고 최근 메시지만 교체
+      setMessages((prev) => {
+        if (latest.length === 0) return prev;
+        const older = prev.filter((msg) => msg.id < latest[0].id);
+        return [...older, ...latest];
+      });
     } catch (err) {
       if (err.response?.status !== 404) console.error("단체 채팅 불러오기 실패:", err);
     }
   }, [roomId]);
 
+  // [추가] 이전 메시지 더 불러오기 (?before=가장 오래된 메시지 시각)
+  const [hasOlder, setHasOlder] = useState(true);
+  const fetchOlderMessages = async () => {
+    if (messages.length === 0) return;
+    try {
+      const before = encodeURIComponent(messages[0].timestamp);
+      const data = await apiGet(`/rooms/${roomId}/chat/?before=${before}`);
+      const older = Array.isArray(data) ? data : (data.results || []);
+      if (older.length === 0) {
+        setHasOlder(false);
+        return;
+      }
+      setMessages((prev) => {
+        const ids = new Set(prev.map((msg) => msg.id));
+        return [...older.filter((msg) => !ids.has(msg.id)), ...prev];
+      });
+    } catch (err) {
+      console.error("이전 메시지 불러오기 실패:", err);
+    }
+  };
+
   useEffect(() => {
     fetchMessages();
     const interval = setInterval(fetchMessages, 3000);
@@ -155,6 +182,17 @@ const RoomChat = ({ roomId, roomInfo, user }) => {
       </div>
 
       <div ref={messageListRef} className="message-list">
+        {hasOlder && messages.length > 0 && (
+          <div style={{ textAlign: 'center', margin: '8px 0' }}>
+            <button
+              type="button"
+              onClick={fetchOlderMessages}
+              style={{ fontSize: '12px', color: '#666', background: 'none', border: 'none', cursor: 'pointer' }}
+            >
+              이전 메시지 더 보기
+            </button>
+          </div>
+        )}
         {messages.map((msg, index) => (
           <React.Fragment key={msg.id}>
             {shouldShowDateSeparator(msg, messages[index - 1]) && (
@@ -17,7 +17,8 @@ const ClanChat = ({ user }) => {
   // 웹소켓 객체를 저장할 Ref
   const socketRef = useRef(null);
 
-  // 1. 기존 메시지 불러오기 (처음 1회만 HTTP 요청)
+  // 1. 기존 메시지 불러오기
+  // [수정] 접속 시 소켓이 최근 메시지(history)를 보내주므로, 소켓 연결 실패 시에만 HTTP 요청
   const fetchMessages = React.useCallback(async () => {
     try {
       const data = await apiGet(`/clans/${clanId}/chat/`);
@@ -39,9 +40,6 @@ const ClanChat = ({ user }) => {
   useEffect(() => {
     if (!clanId) return;
 
-    // 처음 접속 시 기존 대화 내용 불러오기
-    fetchMessages();
-
     // 2. 웹소켓 연결 시작
     // API_BASE_SERVER (예: http://localhost:8000)에서 ws/wss 주소로 변환
     let wsBaseUrl = API_BASE_SERVER.replace(/^http:/, 'ws:').replace(/^https:/, 'wss:');
@@ -49,9 +47,11 @@ const ClanChat = ({ user }) => {
     if (wsBaseUrl.endsWith('/')) {
       wsBaseUrl = wsBaseUrl.slice(0, -1);
     }
-    const wsUrl = `${wsBaseUrl}/ws/clans/${clanId}/chat/`;
+    // [수정] 액세스 토큰으로 인증 (보낸 사람은 서버가 토큰으로 확인)
+    const token = localStorage.getItem('accessToken');
+    const wsUrl = `${wsBaseUrl}/ws/clans/${clanId}/chat/${token ? `?token=${encodeURIComponent(token)}` : ''}`;
 
-    console.log("Connecting to WebSocket:", wsUrl);
+    console.log("Connecting to WebSocket:", `${wsBaseUrl}/ws/clans/${clanId}/chat/`);
 
     const socket = new WebSocket(wsUrl);
     socketRef.current = socket;
@@ -62,6 +62,11 @@ const ClanChat = ({ user }) => {
 
     socket.onmessage = (e) => {
       const data = JSON.parse(e.data);
+      // [추가] 접속 직후 최근 메시지 목록 (과거 -> 최신 순)
+      if (data.type === 'history') {
+        setMessages(data.messages || []);
+        return;
+      }
       // 서버에서 온 메시지를 리스트에 추가
       setMessages((prev) => [...prev, {
         sender: data.sender,
@@ -76,6 +81,7 @@ const ClanChat = ({ user }) => {
 
     socket.onerror = (err) => {
       console.error('채팅 소켓 에러:', err);
+      fetchMessages();
     };
 
     // 컴포넌트 언마운트 시 소켓 연결 해제
@@ -103,8 +109,7 @@ const ClanChat = ({ user }) => {
     // 소켓이 연결된 상태일 때만 전송
     if (socketRef.current && socketRef.current.readyState === WebSocket.OPEN) {
       const messageData = {
-        message: newMessage,
-        sender: user.nickname // JWT 인증 대신 메시지에 포함해서 보냄 (간편 구현)
+        message: newMessage
       };
 
       socketRef.current.send(JSON.stringify(messageData));
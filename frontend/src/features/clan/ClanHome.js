@@ -112,12 +112,9 @@ const ClanHome = ({user}) => {
           // ▼▼▼ [추가] 멤버 여부 확인 로직 ▼▼▼
           // user.pk (로그인한 유저 ID)
           // clan.owner.id (클랜장 ID)
-          // clan.members (ClanSerializer가 'members'를 응답에 포함해야 함 - [주의] 비효율적)
-          
-          // [수정] ClanSerializer가 'members' 목록을 다시 보내도록 serializers.py를 재수정합니다.
-          // (가입 버튼 로직을 위해 'members' 배열이 필요합니다)
+          // [수정] 멤버 ID 목록 대신 서버가 계산한 clan.is_member 사용
           const isOwner = user && clan.owner?.id === user.pk;
-          const isMember = user && clan.members && clan.members.some(member => member.id === user.pk);
+          const isMember = user && clan.is_member;
           // ▲▲▲ [추가] ▲▲▲
 
           return (
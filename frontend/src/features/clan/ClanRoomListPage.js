@@ -18,7 +18,7 @@ const ClanRoomListPage = ({ user }) => {
         if (!clanName && clanId) {
             try {
                 // --- 👇 [수정] URL 슬래시 추가 ---
-                const clanData = await apiGet(`/clans/${clanId}/`);
+                const clanData = await apiGet(`/clans/${clanId}/?fields=id,name`); // 이름만 필요
                 setClanName(clanData.name);
             } catch (error) {
                 console.error("클랜 정보 불러오기 실패:", error);
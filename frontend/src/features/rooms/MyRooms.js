@@ -1,23 +1,44 @@
-import React, { useEffect, useState, useCallback } from "react"; // 👈 useCallback 임포트
+import React, { useEffect, useState, useCallback, useRef } from "react"; // 👈 useCallback 임포트
 import { useNavigate } from "react-router-dom";
-import { apiGet } from "../../api/api";
+import { apiGetConditional } from "../../api/api";
 
 function MyRooms({ user }) {
   const [rooms, setRooms] = useState([]);
   const navigate = useNavigate();
+  // [추가] 마지막으로 받은 방 버전 / ETag (바뀐 방만 받아오기)
+  const versionRef = useRef(null);
+  const etagRef = useRef(null);
 
   // --- 👇 [수정] useCallback으로 함수 감싸기 ---
   const fetchMyRooms = useCallback(async () => {
     if (!user?.nickname) return;
     try {
-      // --- 👇 [수정] URL에서 닉네임 제거 (백엔드가 request.user 사용) ---
-      const res = await apiGet(`/rooms/my/`);
-      setRooms(res);
+      // --- 👇 [수정] since 이후 바뀐 방만 요청, 변경 없으면 304 ---
+      const since = versionRef.current ?? -1;
+      const res = await apiGetConditional(`/rooms/my/?since=${since}`, etagRef.current);
+      if (res.notModified) return;
+
+      const { version, room_ids, rooms: changed } = res.data;
+      setRooms((prev) => {
+        const byId = new Map(prev.map((room) => [room.id, room]));
+        changed.forEach((room) => byId.set(room.id, room));
+        // room_ids 순서 = 최신순, 목록에서 빠진 방은 제거
+        return room_ids.map((id) => byId.get(id)).filter(Boolean);
+      });
+      versionRef.current = version;
+      etagRef.current = res.etag;
     } catch (err) {
       console.error("내 방 리스트 불러오기 실패", err);
     }
   }, [user]); // 👈 user가 변경될 때만 함수가 재생성되도록
   // --- 👆 [수정] ---
+
+  // [추가] 유저가 바뀌면 처음부터 다시 받기
+  useEffect(() => {
+    versionRef.current = null;
+    etagRef.current = null;
+    setRooms([]);
+  }, [user?.nickname]);
     
   useEffect(() => {
     fetchMyRooms();
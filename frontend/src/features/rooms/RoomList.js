@@ -1,7 +1,7 @@
 // frontend/src/features/rooms/RoomList.js
-import React, { useState, useEffect, useCallback } from 'react';
+import React, { useState, useEffect, useCallback, useMemo, useRef } from 'react';
 import { useNavigate, Link } from 'react-router-dom';
-import { apiGet, apiPost } from '../../api/api';
+import { apiGet, apiPost, API_BASE_SERVER } from '../../api/api';
 import { useAlert } from '../../context/AlertContext';
 
 const RoomList = ({ user }) => {
@@ -10,8 +10,12 @@ const RoomList = ({ user }) => {
     const [sortBy, setSortBy] = useState('latest');
     const navigate = useNavigate();
     const { showAlert } = useAlert();
+    // [추가] 로비 실시간 스트림 연결 여부 (연결 중이면 HTTP 목록 조회 생략)
+    const [live, setLive] = useState(false);
+    const liveRef = useRef(false);
 
     const fetchRooms = useCallback(async (currentSearch, currentSortBy) => {
+        if (liveRef.current) return; // 실시간 이벤트로 갱신됨
         try {
             const data = await apiGet(`/rooms/?search=${encodeURIComponent(currentSearch)}&sort=${currentSortBy}`);
             setRooms(data || []);
@@ -21,11 +25,89 @@ const RoomList = ({ user }) => {
     }, []);
 
     useEffect(() => {
+        if (live) return;
         const delayDebounceFn = setTimeout(() => {
             fetchRooms(searchTerm, sortBy);
         }, 300);
         return () => clearTimeout(delayDebounceFn);
-    }, [searchTerm, sortBy, fetchRooms]);
+    }, [searchTerm, sortBy, fetchRooms, live]);
+
+    // [추가] 로비 웹소켓: 스냅샷 1회 + 변경 이벤트만 수신
+    useEffect(() => {
+        let wsBaseUrl = API_BASE_SERVER.replace(/^http:/, 'ws:').replace(/^https:/, 'wss:');
+        if (wsBaseUrl.endsWith('/')) {
+            wsBaseUrl = wsBaseUrl.slice(0, -1);
+        }
+        const socket = new WebSocket(`${wsBaseUrl}/ws/rooms/lobby/`);
+
+        // 가지고 있는 방 버전보다 새로운 이벤트만 적용
+        const applyToRoom = (prev, roomId, version, update) => prev.map((room) =>
+            room.id === roomId && !(room.version >= version) ? { ...update(room), version } : room
+        );
+
+        socket.onmessage = (e) => {
+            const event = JSON.parse(e.data);
+            switch (event.type) {
+                case 'snapshot':
+                    liveRef.current = true;
+                    setLive(true);
+                    setRooms(event.rooms);
+                    break;
+                case 'room_created':
+                case 'room_updated':
+                    setRooms((prev) => {
+                        const current = prev.find((room) => room.id === event.room_id);
+                        if (!current) return [event.room, ...prev];
+                        return current.version >= event.version
+                            ? prev
+                            : prev.map((room) => room.id === event.room_id ? event.room : room);
+                    });
+                    break;
+                case 'session_updated':
+                    setRooms((prev) => applyToRoom(prev, event.room_id, event.version, (room) => ({
+                        ...room,
+                        sessions: room.sessions.map((s) => s.id === event.session.id ? event.session : s),
+                    })));
+                    break;
+                case 'room_confirmed':
+                    setRooms((prev) => applyToRoom(prev, event.room_id, event.version, (room) => ({ ...room, confirmed: true })));
+                    break;
+                case 'room_removed':
+                    setRooms((prev) => prev.filter((room) => room.id !== event.room_id));
+                    break;
+                default:
+                    break;
+            }
+        };
+
+        // 연결이 끊기면 기존 HTTP 조회 방식으로 돌아감
+        socket.onclose = () => {
+            liveRef.current = false;
+            setLive(false);
+        };
+
+        return () => socket.close();
+    }, []);
+
+    // [추가] 실시간 모드에서는 검색/정렬을 클라이언트에서 처리
+    const visibleRooms = useMemo(() => {
+        if (!live) return rooms;
+        const keyword = searchTerm.trim().toLowerCase();
+        const filtered = keyword
+            ? rooms.filter((room) => room.title.toLowerCase().includes(keyword))
+            : rooms;
+        const emptyCount = (room) => room.sessions.filter((s) => !s.participant_nickname).length;
+        const byLatest = (a, b) => new Date(b.created_at) - new Date(a.created_at);
+        const sorted = [...filtered];
+        if (sortBy === 'empty_desc') {
+            sorted.sort((a, b) => emptyCount(b) - emptyCount(a) || byLatest(a, b));
+        } else if (sortBy === 'empty_asc') {
+            sorted.sort((a, b) => emptyCount(a) - emptyCount(b) || byLatest(a, b));
+        } else {
+            sorted.sort(byLatest);
+        }
+        return sorted;
+    }, [rooms, live, searchTerm, sortBy]);
 
     const handleJoinSession = async (room, sessionName) => {
         // 비밀방인 경우 비밀번호 확인 (TODO: 백엔드에 비밀번호 검증 추가 필요)
@@ -159,12 +241,12 @@ const RoomList = ({ user }) => {
                 </button>
             </div>
 
-            {rooms.length === 0 ? (
+            {visibleRooms.length === 0 ? (
                 <div className="card" style={{ padding: '20px', textAlign: 'center' }}>
                     검색 결과가 없습니다.
                 </div>
             ) : (
-                rooms.map(room => (
+                visibleRooms.map(room => (
                     <div key={room.id} className="card" style={{ marginBottom: '15px' }}>
                         <h3 style={{ marginBottom: '10px', color: 'var(--primary-color)' }}>
                             <Link to={`/rooms/${room.id}`} style={{ textDecoration: 'none', color: 'inherit' }}>